@@ -0,0 +1 @@
+"""Бенчмарки task_manager. Запуск: python -m benchmarks.<имя_модуля>."""
@@ -0,0 +1,59 @@
+"""
+create_task поверх SQLite-файла: проверка проекта через хранилище
+против CachingProjectRepository.
+
+Запуск: python -m benchmarks.bench_caching --count 20000 --projects 50
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from task_manager.caching import CachingProjectRepository
+from task_manager.models import Project
+from task_manager.services import TaskService
+from task_manager.sqlite_repositories import (
+    SQLiteProjectRepository,
+    SQLiteTaskRepository,
+    connect,
+)
+
+
+def run(path: str, count: int, projects: int, cached: bool):
+    connection = connect(path)
+    project_repo = SQLiteProjectRepository(connection)
+    if cached:
+        project_repo = CachingProjectRepository(project_repo)
+    service = TaskService(SQLiteTaskRepository(connection), project_repo)
+    pids = [project_repo.add_project(Project(name=f"P{i}")) for i in range(projects)]
+    deadline = datetime.now() + timedelta(days=1)
+
+    start = time.perf_counter()
+    for i in range(count):
+        pid = pids[i % projects]
+        service.create_task(pid, f"Task {i}", deadline)
+        service.check_project_deadline(pid)
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return count / elapsed, getattr(project_repo, "stats", None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--projects", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'вариант':<22}{'задач/с':>12}{'попаданий':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for cached in (False, True):
+            path = os.path.join(tmp, f"cached-{cached}.db")
+            rate, stats = run(path, args.count, args.projects, cached)
+            ratio = f"{stats.hit_ratio:.1%}" if stats else "-"
+            name = "с кэшем" if cached else "без кэша"
+            print(f"{name:<22}{rate:>12,.0f}{ratio:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Стресс-тест track_time из нескольких потоков: пропускная способность
+в зависимости от числа потоков и проверка отсутствия потерянных обновлений.
+
+Запуск: python -m benchmarks.bench_concurrency --calls 200000 --threads 1 2 4 8
+"""
+import argparse
+import threading
+import time
+from datetime import datetime, timedelta
+
+from task_manager.models import Project
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+from task_manager.services import TaskService
+from task_manager.sqlite_repositories import SQLiteTaskRepository, connect
+
+BACKENDS = {
+    "inmemory": InMemoryTaskRepository,
+    "sqlite": lambda: SQLiteTaskRepository(connect()),
+}
+
+
+def run(make_repo, threads: int, calls: int, tasks: int):
+    project_repo = InMemoryProjectRepository()
+    service = TaskService(make_repo(), project_repo)
+    pid = project_repo.add_project(Project(name="Stress"))
+    deadline = datetime.now() + timedelta(days=1)
+    task_ids = service.create_tasks([(pid, f"T{i}", deadline) for i in range(tasks)]).ids
+    per_thread = calls // threads
+
+    def worker(offset: int):
+        for i in range(per_thread):
+            service.track_time(task_ids[(offset + i) % tasks], 1.0)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    total = sum(service.track_time(task_id, 1.0) - 1.0 for task_id in task_ids)
+    expected = per_thread * threads
+    return expected / elapsed, total == expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="inmemory")
+    args = parser.parse_args()
+
+    print(f"{'потоков':>8}{'вызовов/с':>14}  без потерь")
+    for threads in args.threads:
+        rate, consistent = run(BACKENDS[args.backend], threads, args.calls, args.tasks)
+        print(f"{threads:>8}{rate:>14,.0f}  {'да' if consistent else 'НЕТ'}")
+
+
+if __name__ == "__main__":
+    main()
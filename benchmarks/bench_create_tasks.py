@@ -0,0 +1,63 @@
+"""
+Сравнение пакетного TaskService.create_tasks с циклом по create_task.
+
+Запуск: python -m benchmarks.bench_create_tasks --count 200000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from task_manager.models import Project
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+from task_manager.services import TaskService
+
+
+def make_service(projects: int):
+    task_repo = InMemoryTaskRepository()
+    project_repo = InMemoryProjectRepository()
+    project_ids = [project_repo.add_project(Project(name=f"P{i}")) for i in range(projects)]
+    return TaskService(task_repo, project_repo), project_ids
+
+
+def make_rows(count: int, project_ids):
+    base = datetime.now() + timedelta(days=30)
+    return [
+        (project_ids[i % len(project_ids)], f"Task {i}", base + timedelta(minutes=i))
+        for i in range(count)
+    ]
+
+
+def bench_loop(count: int, projects: int) -> float:
+    service, project_ids = make_service(projects)
+    rows = make_rows(count, project_ids)
+    start = time.perf_counter()
+    for project_id, title, deadline in rows:
+        service.create_task(project_id, title, deadline)
+    return time.perf_counter() - start
+
+
+def bench_batch(count: int, projects: int) -> float:
+    service, project_ids = make_service(projects)
+    rows = make_rows(count, project_ids)
+    start = time.perf_counter()
+    result = service.create_tasks(rows)
+    elapsed = time.perf_counter() - start
+    assert not result.errors
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--projects", type=int, default=100)
+    args = parser.parse_args()
+
+    loop = bench_loop(args.count, args.projects)
+    batch = bench_batch(args.count, args.projects)
+    print(f"create_task (цикл):  {args.count / loop:12,.0f} задач/с  ({loop:.3f} с)")
+    print(f"create_tasks (пакет): {args.count / batch:12,.0f} задач/с  ({batch:.3f} с)")
+    print(f"Ускорение: x{loop / batch:.2f}")
+
+
+if __name__ == "__main__":
+    main()
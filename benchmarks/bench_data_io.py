@@ -0,0 +1,77 @@
+"""
+Потоковый импорт и экспорт задач: строк в секунду и пиковая память процесса.
+
+Файл генерируется построчно; для файла в несколько гигабайт задайте
+--rows 30000000 и выше. Задачи импортируются в ColumnarTaskRepository,
+поэтому рост памяти — это сами задачи, а не буферы чтения.
+
+Запуск: python -m benchmarks.bench_data_io --rows 1000000 --format csv
+"""
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from task_manager.columnar import ColumnarTaskRepository
+from task_manager.data_io import export_tasks, import_tasks
+from task_manager.models import Project
+from task_manager.repositories import InMemoryProjectRepository
+from task_manager.services import TaskService
+
+
+def write_source(path: str, fmt: str, rows: int, project_ids) -> None:
+    base = datetime.now() + timedelta(days=30)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            f.write("project_id,title,deadline\n")
+        for i in range(rows):
+            pid = project_ids[i % len(project_ids)]
+            deadline = (base + timedelta(seconds=i)).isoformat()
+            if fmt == "csv":
+                f.write(f"{pid},Task {i},{deadline}\n")
+            else:
+                f.write(json.dumps({"project_id": pid, "title": f"Task {i}",
+                                    "deadline": deadline}) + "\n")
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    project_repo = InMemoryProjectRepository()
+    project_ids = [project_repo.add_project(Project(name=f"P{i}")) for i in range(100)]
+    task_repo = ColumnarTaskRepository()
+    service = TaskService(task_repo, project_repo)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, f"tasks.{args.format}")
+        write_source(source, args.format, args.rows, project_ids)
+        size_mb = os.path.getsize(source) / 2 ** 20
+        print(f"файл: {size_mb:,.1f} МБ, строк: {args.rows:,}")
+        rss_before = peak_rss_mb()
+
+        start = time.perf_counter()
+        report = import_tasks(source, service, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"импорт:  {report.rows / elapsed:>12,.0f} строк/с  "
+              f"({report.created:,} создано, {report.failed:,} ошибок)")
+
+        start = time.perf_counter()
+        exported = export_tasks(task_repo, os.path.join(tmp, f"out.{args.format}"))
+        elapsed = time.perf_counter() - start
+        print(f"экспорт: {exported / elapsed:>12,.0f} строк/с")
+        print(f"пиковая память: {rss_before:,.0f} -> {peak_rss_mb():,.0f} МБ")
+
+
+if __name__ == "__main__":
+    main()
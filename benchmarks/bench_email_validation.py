@@ -0,0 +1,59 @@
+"""
+Проверка email: re.match с литералом против предкомпилированного
+выражения и кэша проверенных адресов (NotificationService.validate_emails).
+
+Корпус повторяет рассылку дайджестов: небольшое множество адресов,
+каждый встречается многократно, с долей некорректных.
+
+Запуск: python -m benchmarks.bench_email_validation --sends 500000
+"""
+import argparse
+import random
+import re
+import time
+
+from task_manager.notifications import NotificationService
+
+_DOMAINS = ["example.com", "mail.example.org", "corp.example.net", "пример.рф"]
+
+
+def make_corpus(distinct: int, sends: int, seed: int = 42):
+    rnd = random.Random(seed)
+    addresses = []
+    for i in range(distinct):
+        if i % 20 == 0:
+            addresses.append(f"broken.user{i}")  # без @ — некорректный
+        else:
+            addresses.append(f"user.{i}+tag@{rnd.choice(_DOMAINS)}")
+    return [rnd.choice(addresses) for _ in range(sends)]
+
+
+def bench(func, corpus) -> float:
+    start = time.perf_counter()
+    func(corpus)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--distinct", type=int, default=5000)
+    parser.add_argument("--sends", type=int, default=500_000)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.distinct, args.sends)
+    compiled = re.compile(r"[^@]+@[^@]+\.[^@]+")
+    service = NotificationService()
+
+    variants = {
+        "re.match (литерал)": lambda c: [e for e in c if re.match(r"[^@]+@[^@]+\.[^@]+", e)],
+        "предкомпилированное": lambda c: [e for e in c if compiled.match(e)],
+        "_is_valid_email": lambda c: [e for e in c if service._is_valid_email(e)],
+        "validate_emails": service.validate_emails,
+    }
+    print(f"{'вариант':<22}{'адресов/с':>14}")
+    for name, func in variants.items():
+        print(f"{name:<22}{bench(func, corpus):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
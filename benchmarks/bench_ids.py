@@ -0,0 +1,57 @@
+"""
+Сравнение генераторов ID: uuid4().int против SequentialIdAllocator,
+BlockIdAllocator и SnowflakeIdAllocator.
+
+Измеряются скорость вставки в словарь (как в InMemory-репозиториях)
+и память на запись: ключ словаря плюс доля самой хеш-таблицы.
+
+Запуск: python -m benchmarks.bench_ids --count 500000
+"""
+import argparse
+import time
+import tracemalloc
+import uuid
+
+from task_manager.ids import BlockIdAllocator, SequentialIdAllocator, SnowflakeIdAllocator
+
+
+def allocators():
+    return {
+        "uuid4().int": lambda: uuid.uuid4().int,
+        "sequential": SequentialIdAllocator().next_id,
+        "block(1024)": BlockIdAllocator(SequentialIdAllocator(), block_size=1024).next_id,
+        "snowflake": SnowflakeIdAllocator(shard_id=1).next_id,
+    }
+
+
+def bench_insert_rate(next_id, count: int) -> float:
+    store = {}
+    start = time.perf_counter()
+    for _ in range(count):
+        store[next_id()] = None
+    return count / (time.perf_counter() - start)
+
+
+def bench_bytes_per_entry(next_id, count: int) -> float:
+    tracemalloc.start()
+    store = {next_id(): None for _ in range(count)}
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(store) == count
+    return current / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=500_000)
+    args = parser.parse_args()
+
+    print(f"{'генератор':<14}{'вставок/с':>14}{'байт/запись':>14}")
+    for name, factory in allocators().items():
+        rate = bench_insert_rate(factory, args.count)
+        size = bench_bytes_per_entry(allocators()[name], args.count)
+        print(f"{name:<14}{rate:>14,.0f}{size:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Накладные расходы инструментации: track_time, check_project_deadline
+и calculate_invoice без инструментации и с task_manager.instrumentation.
+
+Запуск: python -m benchmarks.bench_instrumentation --count 200000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from task_manager import instrumentation
+from task_manager.models import Project
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+from task_manager.services import InvoiceService, TaskService
+
+
+def run(count: int):
+    projects = InMemoryProjectRepository()
+    pid = projects.add_project(Project(name="Bench"))
+    service = TaskService(InMemoryTaskRepository(), projects)
+    tid = service.create_task(pid, "Bench", datetime.now() + timedelta(days=1))
+    invoices = InvoiceService()
+
+    rates = {}
+    for name, call in (
+        ("track_time", lambda: service.track_time(tid, 0.5)),
+        ("check_project_deadline", lambda: service.check_project_deadline(pid)),
+        ("calculate_invoice", lambda: invoices.calculate_invoice(2.0, 10.0, "USD")),
+    ):
+        start = time.perf_counter()
+        for _ in range(count):
+            call()
+        rates[name] = count / (time.perf_counter() - start)
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    plain = run(args.count)
+    with instrumentation.instrumented(instrumentation.MetricsRegistry()):
+        instrumented = run(args.count)
+    disabled = run(args.count)
+
+    print(f"{'операция':<24}{'без, оп/с':>12}{'с, оп/с':>12}{'выключена':>12}{'цена':>10}")
+    for name, rate in plain.items():
+        cost = 1e6 / instrumented[name] - 1e6 / rate
+        print(f"{name:<24}{rate:>12,.0f}{instrumented[name]:>12,.0f}"
+              f"{disabled[name]:>12,.0f}{cost:>8.2f}мкс")
+
+
+if __name__ == "__main__":
+    main()
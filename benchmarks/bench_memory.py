@@ -0,0 +1,76 @@
+"""
+Память на задачу: прежний dataclass с __dict__, slotted Task в словаре,
+InMemoryTaskRepository (вместе со вторичными индексами)
+и ColumnarTaskRepository.
+
+Запуск: python -m benchmarks.bench_memory --count 200000
+"""
+import argparse
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+from task_manager.columnar import ColumnarTaskRepository
+from task_manager.models import Task
+from task_manager.repositories import InMemoryTaskRepository
+
+
+@dataclass
+class DictTask:
+    """Копия прежней модели Task (без __slots__) для сравнения."""
+    id: Optional[int] = field(init=False, default=None)
+    project_id: int = 0
+    title: str = ""
+    deadline: datetime = None
+    hours_spent: float = 0.0
+
+
+def iter_rows(count: int):
+    base = datetime(2030, 1, 1)
+    for i in range(count):
+        yield i % 500, f"Task {i % 1000}", base + timedelta(seconds=i), float(i % 8)
+
+
+def fill_plain_dict(model, count: int):
+    store = {}
+    for task_id, (project_id, title, deadline, hours) in enumerate(iter_rows(count), 1):
+        task = model(project_id=project_id, title=title, deadline=deadline, hours_spent=hours)
+        task.id = task_id
+        store[task_id] = task
+    return store
+
+
+def fill_repository(repo, count: int):
+    for project_id, title, deadline, hours in iter_rows(count):
+        repo.add_task(Task(project_id=project_id, title=title, deadline=deadline, hours_spent=hours))
+    return repo
+
+
+def bytes_per_task(fill, count: int) -> float:
+    tracemalloc.start()
+    kept = fill(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    variants = {
+        "dataclass + __dict__": lambda n: fill_plain_dict(DictTask, n),
+        "slotted Task": lambda n: fill_plain_dict(Task, n),
+        "InMemory (+ индексы)": lambda n: fill_repository(InMemoryTaskRepository(), n),
+        "ColumnarTaskRepository": lambda n: fill_repository(ColumnarTaskRepository(), n),
+    }
+    print(f"{'вариант':<26}{'байт/задача':>14}")
+    for name, fill in variants.items():
+        print(f"{name:<26}{bytes_per_task(fill, args.count):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Сборка писем: прежний f-string + encode на каждое письмо против
+MessageTemplates, и число писем при отправке по одному против дайджеста.
+
+SMTP заменён клиентом-заглушкой, поэтому измеряется только сборка писем.
+
+Запуск: python -m benchmarks.bench_message_build --recipients 5000 --tasks 20
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from task_manager.notifications import SENDER, NotificationService
+
+
+class NullSMTP:
+    """SMTP-клиент, который только считает письма и байты."""
+    messages = 0
+    size = 0
+
+    def __init__(self, host, port):
+        pass
+
+    def sendmail(self, sender, recipients, message):
+        type(self).messages += 1
+        type(self).size += len(message)
+        return {}
+
+    def __exit__(self, *exc):
+        pass
+
+
+def legacy_build(email: str, task_info: dict, now: datetime) -> bytes:
+    """Прежняя сборка письма целиком для каждого получателя."""
+    title = task_info.get("title", "")
+    body = f'Задача "{title}" {NotificationService._task_status(task_info, now)}.'
+    message = (
+        f"From: {SENDER}\r\n"
+        f"To: {email}\r\n"
+        f"Subject: Notification: Task Update\r\n\r\n"
+        f"{body}"
+    )
+    return message.encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipients", type=int, default=5000)
+    parser.add_argument("--tasks", type=int, default=20)
+    args = parser.parse_args()
+
+    now = datetime.now()
+    tasks = [{"title": f"Задача {i}", "deadline": now + timedelta(days=1)}
+             for i in range(args.tasks)]
+    updates = [(f"user{r}@example.com", task) for task in tasks for r in range(args.recipients)]
+    service = NotificationService(mailer=NullSMTP)
+
+    for name, build in (("f-string + encode", legacy_build),
+                        ("MessageTemplates", service._build_message)):
+        start = time.perf_counter()
+        for email, task_info in updates:
+            build(email, task_info, now)
+        rate = len(updates) / (time.perf_counter() - start)
+        print(f"{name:<22}{rate:>14,.0f} писем/с")
+
+    print(f"{'режим':<22}{'писем':>10}{'МБ':>10}{'секунд':>10}")
+    for name, send in (("по одному", service.send_task_notifications),
+                       ("дайджест", service.send_task_digest)):
+        NullSMTP.messages = NullSMTP.size = 0
+        start = time.perf_counter()
+        send(updates)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22}{NullSMTP.messages:>10,}{NullSMTP.size / 2 ** 20:>10.1f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
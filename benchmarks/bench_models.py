@@ -0,0 +1,70 @@
+"""
+Создание Task: конструктор dataclass с __post_init__ против
+Task.from_trusted, Task.from_rows и validate_task_columns + from_rows.
+
+Запуск: python -m benchmarks.bench_models --count 1000000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from task_manager.models import Task, validate_task_columns
+
+
+def make_columns(count: int):
+    base = datetime(2030, 1, 1)
+    project_ids = [i % 500 for i in range(count)]
+    titles = [f"Task {i % 1000}" for i in range(count)]
+    deadlines = [base + timedelta(seconds=i) for i in range(count)]
+    hours = [float(i % 8) for i in range(count)]
+    return project_ids, titles, deadlines, hours
+
+
+def via_constructor(project_ids, titles, deadlines, hours):
+    tasks = []
+    for task_id, row in enumerate(zip(project_ids, titles, deadlines, hours), 1):
+        task = Task(project_id=row[0], title=row[1], deadline=row[2], hours_spent=row[3])
+        task.id = task_id
+        tasks.append(task)
+    return tasks
+
+
+def via_from_trusted(project_ids, titles, deadlines, hours):
+    from_trusted = Task.from_trusted
+    return [from_trusted(task_id, *row)
+            for task_id, row in enumerate(zip(project_ids, titles, deadlines, hours), 1)]
+
+
+def via_from_rows(project_ids, titles, deadlines, hours):
+    return Task.from_rows(zip(range(1, len(titles) + 1), project_ids, titles, deadlines, hours))
+
+
+def via_validated_rows(project_ids, titles, deadlines, hours):
+    errors = validate_task_columns(project_ids, titles, deadlines, hours)
+    assert not errors
+    return via_from_rows(project_ids, titles, deadlines, hours)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    columns = make_columns(args.count)
+    print(f"{'вариант':<34}{'задач/с':>14}")
+    for name, build in (
+        ("Task(...) + __post_init__", via_constructor),
+        ("Task.from_trusted", via_from_trusted),
+        ("Task.from_rows", via_from_rows),
+        ("validate_task_columns + from_rows", via_validated_rows),
+    ):
+        start = time.perf_counter()
+        tasks = build(*columns)
+        elapsed = time.perf_counter() - start
+        assert len(tasks) == args.count
+        print(f"{name:<34}{args.count / elapsed:>14,.0f}")
+        del tasks
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Задержка для отправителя: send_task_notification (SMTP в том же потоке)
+против NotificationOutbox.enqueue, и скорость разбора очереди воркером.
+
+SMTP заменён клиентом с искусственными задержками подключения и отправки.
+
+Запуск: python -m benchmarks.bench_outbox --count 500 --send-ms 2 --connect-ms 20
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from task_manager.notifications import NotificationService
+from task_manager.outbox import NotificationOutbox
+
+
+def slow_smtp(connect_delay: float, send_delay: float):
+    class SlowSMTP:
+        def __init__(self, host, port):
+            time.sleep(connect_delay)
+
+        def sendmail(self, sender, recipients, message):
+            time.sleep(send_delay)
+            return {}
+
+        def __exit__(self, *exc):
+            pass
+
+    return SlowSMTP
+
+
+def latencies_ms(func, calls):
+    result = []
+    for args in calls:
+        start = time.perf_counter()
+        func(*args)
+        result.append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--send-ms", type=float, default=2.0)
+    parser.add_argument("--connect-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    mailer = slow_smtp(args.connect_ms / 1000, args.send_ms / 1000)
+    service = NotificationService(mailer=mailer)
+    task_info = {"title": "Bench", "deadline": datetime.now() + timedelta(days=1)}
+    calls = [(f"user{i}@example.com", task_info) for i in range(args.count)]
+
+    print(f"{'вариант':<32}{'p50, мс':>10}{'p99, мс':>10}")
+    inline = latencies_ms(service.send_task_notification, calls[: max(1, args.count // 10)])
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = NotificationOutbox(service, os.path.join(tmp, "outbox.db"))
+        queued = latencies_ms(outbox.enqueue, calls)
+        for name, values in (("send_task_notification", inline), ("outbox.enqueue", queued)):
+            values = sorted(values)
+            p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+            print(f"{name:<32}{statistics.median(values):>10.2f}{p99:>10.2f}")
+
+        start = time.perf_counter()
+        outbox.drain()
+        elapsed = time.perf_counter() - start
+        metrics = outbox.metrics()
+        print(f"воркер: {metrics.sent / elapsed:,.0f} писем/с, очередь: {metrics.depth}, "
+              f"задержка p95: {metrics.latency_p95:.2f} с")
+        outbox.close()
+
+
+if __name__ == "__main__":
+    main()
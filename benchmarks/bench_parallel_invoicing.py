@@ -0,0 +1,68 @@
+"""
+Масштабирование ParallelInvoiceEngine от 1 до N процессов
+в сравнении с последовательным calculate_invoice по каждой задаче.
+
+Запуск: python -m benchmarks.bench_parallel_invoicing --tasks 1000000 --projects 2000
+"""
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+from task_manager.columnar import ColumnarTaskRepository
+from task_manager.models import Task
+from task_manager.parallel_invoicing import ParallelInvoiceEngine
+from task_manager.services import InvoiceService
+
+CURRENCIES = ["USD", "EUR", "GBP", "RUB"]
+
+
+def make_repo(tasks: int, projects: int) -> ColumnarTaskRepository:
+    repo = ColumnarTaskRepository()
+    deadline = datetime(2030, 1, 1)
+    repo.add_tasks(
+        Task(project_id=i % projects, title="T", deadline=deadline + timedelta(seconds=i),
+             hours_spent=float(i % 9))
+        for i in range(tasks)
+    )
+    return repo
+
+
+def sequential(repo, billing):
+    service = InvoiceService()
+    totals = {}
+    for project_id, (rate, currency) in billing.items():
+        for task in repo.list_by_project(project_id):
+            amount = service.calculate_invoice(task.hours_spent, rate, currency)
+            totals[currency] = totals.get(currency, 0.0) + amount
+    return totals
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    repo = make_repo(args.tasks, args.projects)
+    billing = {pid: (10.0 + pid % 50, CURRENCIES[pid % 4]) for pid in range(args.projects)}
+
+    baseline = timed(lambda: sequential(repo, billing))
+    print(f"{'вариант':<24}{'время, с':>10}{'ускорение':>12}")
+    print(f"{'calculate_invoice цикл':<24}{baseline:>10.3f}{1.0:>12.2f}")
+    workers = 1
+    while workers <= args.max_workers:
+        elapsed = timed(lambda: ParallelInvoiceEngine(max_workers=workers).run(repo, billing))
+        print(f"{f'engine, {workers} проц.':<24}{elapsed:>10.3f}{baseline / elapsed:>12.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
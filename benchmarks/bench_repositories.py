@@ -0,0 +1,76 @@
+"""
+Сравнение InMemory- и SQLite-репозиториев: пакетная вставка,
+чтение по ID и выборки по проекту и дедлайну.
+
+Запуск: python -m benchmarks.bench_repositories --count 100000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from task_manager.models import Task
+from task_manager.repositories import InMemoryTaskRepository
+from task_manager.sqlite_repositories import SQLiteTaskRepository, connect
+
+
+def make_tasks(count: int, projects: int):
+    base = datetime(2030, 1, 1)
+    return [
+        Task(project_id=i % projects, title=f"Task {i}", deadline=base + timedelta(minutes=i))
+        for i in range(count)
+    ]
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def bench(repo, count: int, projects: int, lookups: int):
+    tasks = make_tasks(count, projects)
+    results = {"insert/s": count / timed(lambda: repo.add_tasks(tasks))}
+
+    ids = random.sample([task.id for task in tasks], min(lookups, count))
+    results["get/s"] = len(ids) / timed(lambda: [repo.get_task(task_id) for task_id in ids])
+
+    project_ids = [random.randrange(projects) for _ in range(1000)]
+    results["by_project/s"] = len(project_ids) / timed(
+        lambda: [repo.list_by_project(pid) for pid in project_ids]
+    )
+
+    base = datetime(2030, 1, 1)
+    moments = [base + timedelta(minutes=random.randrange(100)) for _ in range(1000)]
+    results["due_before/s"] = len(moments) / timed(
+        lambda: [repo.list_due_before(moment) for moment in moments]
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        variants = {
+            "InMemory": InMemoryTaskRepository(),
+            "SQLite :memory:": SQLiteTaskRepository(connect()),
+            "SQLite file/WAL": SQLiteTaskRepository(connect(os.path.join(tmp, "bench.db"))),
+        }
+        header = None
+        for name, repo in variants.items():
+            results = bench(repo, args.count, args.projects, args.lookups)
+            if header is None:
+                header = list(results)
+                print(f"{'хранилище':<18}" + "".join(f"{key:>16}" for key in header))
+            print(f"{name:<18}" + "".join(f"{results[key]:>16,.0f}" for key in header))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Снимок задач: время save_tasks / load_tasks и размер файла по сравнению
+с pickle списка Task и повторной вставкой через add_tasks.
+
+Запуск: python -m benchmarks.bench_snapshot --count 1000000
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from task_manager.columnar import ColumnarTaskRepository
+from task_manager.models import Task
+from task_manager.repositories import InMemoryTaskRepository
+from task_manager.snapshot import load_tasks, save_tasks
+
+
+def make_tasks(count: int):
+    base = datetime(2030, 1, 1)
+    return [
+        Task(project_id=i % 500, title=f"Task {i % 1000}",
+             deadline=base + timedelta(seconds=i), hours_spent=float(i % 8))
+        for i in range(count)
+    ]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    source = ColumnarTaskRepository()
+    source.add_tasks(make_tasks(args.count))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snap_path = os.path.join(tmp, "tasks.snap")
+        pickle_path = os.path.join(tmp, "tasks.pickle")
+
+        _, save_time = timed(lambda: save_tasks(source, snap_path))
+        _, columnar_time = timed(lambda: load_tasks(snap_path))
+        _, memory_time = timed(lambda: load_tasks(snap_path, InMemoryTaskRepository()))
+
+        tasks = [view.to_task() for view in source.iter_tasks()]
+        with open(pickle_path, "wb") as f:
+            _, pickle_save_time = timed(lambda: pickle.dump(tasks, f, pickle.HIGHEST_PROTOCOL))
+
+        def pickle_restore():
+            with open(pickle_path, "rb") as f:
+                InMemoryTaskRepository().restore_tasks(pickle.load(f))
+
+        _, pickle_load_time = timed(pickle_restore)
+        _, reinsert_time = timed(lambda: InMemoryTaskRepository().add_tasks(make_tasks(args.count)))
+
+        print(f"задач: {args.count:,}")
+        print(f"{'вариант':<32}{'секунд':>10}{'МБ':>10}")
+        snap_mb = os.path.getsize(snap_path) / 2 ** 20
+        pickle_mb = os.path.getsize(pickle_path) / 2 ** 20
+        print(f"{'save_tasks':<32}{save_time:>10.3f}{snap_mb:>10.1f}")
+        print(f"{'load_tasks -> Columnar':<32}{columnar_time:>10.3f}")
+        print(f"{'load_tasks -> InMemory':<32}{memory_time:>10.3f}")
+        print(f"{'pickle.dump':<32}{pickle_save_time:>10.3f}{pickle_mb:>10.1f}")
+        print(f"{'pickle.load -> InMemory':<32}{pickle_load_time:>10.3f}")
+        print(f"{'add_tasks (пересоздание)':<32}{reinsert_time:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
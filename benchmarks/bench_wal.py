@@ -0,0 +1,83 @@
+"""
+Стоимость надёжности: fsync на каждую запись против групповой фиксации
+WriteAheadLog (с ожиданием подтверждения и без него).
+
+Каждый поток вызывает TaskService.track_time через WALTaskRepository.
+
+Запуск: python -m benchmarks.bench_wal --ops 2000 --threads 8
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from task_manager.models import Project, Task
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+from task_manager.services import TaskService
+from task_manager.wal import WALTaskRepository, WriteAheadLog, _encode_task
+
+
+class FsyncEachTaskRepository(InMemoryTaskRepository):
+    """Наивный вариант: запись и fsync в каждом update_task."""
+
+    def __init__(self, path: str):
+        InMemoryTaskRepository.__init__(self)
+        self._file = open(path, "ab")
+        self._file_lock = threading.Lock()
+
+    def update_task(self, task: Task) -> None:
+        InMemoryTaskRepository.update_task(self, task)
+        with self._file_lock:
+            self._file.write(_encode_task(task))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+
+def run(task_repo, ops: int, threads: int) -> float:
+    project_repo = InMemoryProjectRepository()
+    pid = project_repo.add_project(Project(name="Bench"))
+    service = TaskService(task_repo, project_repo)
+    deadline = datetime.now() + timedelta(days=1)
+    task_ids = [service.create_task(pid, f"T{i}", deadline) for i in range(threads)]
+
+    def worker(task_id):
+        for _ in range(ops // threads):
+            service.track_time(task_id, 0.5)
+
+    workers = [threading.Thread(target=worker, args=(tid,)) for tid in task_ids]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return ops / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--interval", type=float, default=0.0,
+                        help="sync_interval журнала, секунды")
+    args = parser.parse_args()
+
+    print(f"{'вариант':<34}{'операций/с':>12}{'записей/fsync':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        naive = FsyncEachTaskRepository(os.path.join(tmp, "naive.log"))
+        rate = run(naive, args.ops, args.threads)
+        print(f"{'fsync на каждую запись':<34}{rate:>12,.0f}{1:>15.1f}")
+
+        for name, wait in (("WAL, ждать fsync", True), ("WAL, без ожидания", False)):
+            with WriteAheadLog(os.path.join(tmp, f"{wait}.wal"), wait_for_sync=wait,
+                               sync_interval=args.interval) as wal:
+                rate = run(WALTaskRepository(InMemoryTaskRepository(), wal),
+                           args.ops, args.threads)
+                wal.sync()
+                per_sync = wal.records / max(wal.syncs, 1)
+            print(f"{name:<34}{rate:>12,.0f}{per_sync:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
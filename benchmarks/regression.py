@@ -0,0 +1,252 @@
+"""
+Сравнение результатов benchmarks.suite с сохранённой базовой линией.
+
+Для каждой операции и масштаба сравниваются пропускная способность,
+перцентили задержки и пик памяти. Метрика из gated, ухудшившаяся больше
+чем на threshold (доля от базовой линии), считается регрессией.
+Используется run_report.py (код выхода) и tests/conftest.py (раздел
+производительности в HTML-отчёте).
+
+Запуск: python -m benchmarks.regression benchmark_results.json benchmark_baseline.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+RESULTS_FILE = "benchmark_results.json"
+BASELINE_FILE = "benchmark_baseline.json"
+HISTORY_FILE = "benchmark_history.jsonl"
+COMPARISON_FILE = "benchmark_comparison.json"
+
+DEFAULT_THRESHOLD = 0.25
+HISTORY_LIMIT = 20
+# Изменения пика памяти меньше этого порога — шум аллокатора, а не регрессия.
+MIN_MEMORY_DELTA = 64 * 1024
+
+# Метрика -> (путь в записи результата, больше — лучше).
+METRICS: Dict[str, Tuple[Tuple[str, ...], bool]] = {
+    "ops_per_sec": (("ops_per_sec",), True),
+    "latency_p50": (("latency_us", "p50"), False),
+    "latency_p99": (("latency_us", "p99"), False),
+    "peak_memory_bytes": (("peak_memory_bytes",), False),
+}
+# p99 на общей машине слишком шумный, чтобы останавливать по нему сборку.
+GATED_METRICS = ("ops_per_sec", "latency_p50", "peak_memory_bytes")
+
+
+@dataclass
+class MetricChange:
+    """
+    Изменение одной метрики относительно базовой линии.
+
+    Атрибуты:
+        name (str): Операция.
+        scale (int): Масштаб.
+        metric (str): Имя метрики из METRICS.
+        baseline (float): Значение в базовой линии.
+        current (float): Текущее значение.
+        change (float): Относительное изменение current / baseline - 1.
+        gated (bool): Останавливает ли регрессия этой метрики сборку.
+        regressed (bool): Ухудшение больше порога.
+    """
+    name: str
+    scale: int
+    metric: str
+    baseline: float
+    current: float
+    change: float
+    gated: bool
+    regressed: bool
+
+
+def load_results(path: str) -> Optional[dict]:
+    """
+    Читает JSON benchmarks.suite.
+
+    Args:
+        path (str): Путь к файлу.
+
+    Returns:
+        Optional[dict]: Результаты или None, если файла нет.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def metric_value(entry: dict, metric: str) -> Optional[float]:
+    """Значение метрики из записи результата (None, если не измерялась)."""
+    value = entry
+    for key in METRICS[metric][0]:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def _index(results: dict) -> Dict[Tuple[str, int], dict]:
+    return {(entry["name"], entry["scale"]): entry for entry in results.get("results", [])}
+
+
+def _is_regression(metric: str, baseline: float, current: float, threshold: float) -> bool:
+    higher_is_better = METRICS[metric][1]
+    if metric == "peak_memory_bytes" and current - baseline < MIN_MEMORY_DELTA:
+        return False
+    if higher_is_better:
+        return current < baseline * (1 - threshold)
+    return current > baseline * (1 + threshold)
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD,
+            gated: Iterable[str] = GATED_METRICS) -> List[MetricChange]:
+    """
+    Сравнивает результаты с базовой линией.
+
+    Сравниваются только записи с одинаковыми операцией, масштабом и числом
+    вызовов (например, при другом --max-smtp письма не сравниваются).
+
+    Args:
+        current (dict): Текущие результаты benchmarks.suite.
+        baseline (dict): Базовая линия в том же формате.
+        threshold (float): Допустимое ухудшение (доля базового значения).
+        gated (Iterable[str]): Метрики, регрессия которых считается провалом.
+
+    Returns:
+        List[MetricChange]: Изменения по всем метрикам в порядке current.
+    """
+    if threshold < 0:
+        raise ValueError("threshold не может быть отрицательным.")
+    gated = set(gated)
+    base = _index(baseline)
+    changes = []
+    for key, entry in _index(current).items():
+        old = base.get(key)
+        if old is None or old.get("ops") != entry.get("ops"):
+            continue
+        for metric in METRICS:
+            before, after = metric_value(old, metric), metric_value(entry, metric)
+            if before is None or after is None or before <= 0:
+                continue
+            is_gated = metric in gated
+            changes.append(MetricChange(
+                name=key[0], scale=key[1], metric=metric,
+                baseline=before, current=after, change=after / before - 1,
+                gated=is_gated,
+                regressed=is_gated and _is_regression(metric, before, after, threshold),
+            ))
+    return changes
+
+
+def regressions(changes: Iterable[MetricChange]) -> List[MetricChange]:
+    """Только изменения, признанные регрессией."""
+    return [change for change in changes if change.regressed]
+
+
+def write_comparison(path: str, changes: List[MetricChange], threshold: float) -> None:
+    """Сохраняет сравнение для отчёта."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"threshold": threshold, "changes": [asdict(change) for change in changes]},
+                  f, ensure_ascii=False, indent=2)
+
+
+def load_comparison(path: str) -> Optional[Tuple[float, List[MetricChange]]]:
+    """
+    Читает сохранённое сравнение.
+
+    Returns:
+        Optional[Tuple[float, List[MetricChange]]]: Порог и изменения или None.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["threshold"], [MetricChange(**change) for change in data["changes"]]
+
+
+def append_history(path: str, results: dict) -> None:
+    """Дописывает прогон одной строкой в историю (JSON Lines)."""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(results, ensure_ascii=False) + "\n")
+
+
+def load_history(path: str, limit: int = HISTORY_LIMIT) -> List[dict]:
+    """
+    Последние limit прогонов из истории, от старых к новым.
+
+    Args:
+        path (str): Файл истории.
+        limit (int): Сколько прогонов вернуть.
+
+    Returns:
+        List[dict]: Прогоны; повреждённые строки пропускаются.
+    """
+    if not os.path.exists(path):
+        return []
+    runs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                continue
+    return runs[-limit:]
+
+
+def trend(history: List[dict], baseline: dict, metric: str) -> Dict[str, List[Optional[float]]]:
+    """
+    Значения метрики в процентах от базовой линии по прогонам истории.
+
+    Args:
+        history (List[dict]): Прогоны от старых к новым.
+        baseline (dict): Базовая линия.
+        metric (str): Имя метрики из METRICS.
+
+    Returns:
+        Dict[str, List[Optional[float]]]: "операция@масштаб" -> проценты
+            (None, если в прогоне нет этой записи).
+    """
+    base = _index(baseline)
+    series: Dict[str, List[Optional[float]]] = {}
+    for key, entry in base.items():
+        before = metric_value(entry, metric)
+        if not before:
+            continue
+        points = []
+        for run in history:
+            current = _index(run).get(key)
+            value = metric_value(current, metric) if current is not None else None
+            points.append(None if value is None else 100.0 * value / before)
+        if any(point is not None for point in points):
+            series[f"{key[0]}@{key[1]}"] = points
+    return series
+
+
+def format_change(change: MetricChange) -> str:
+    """Строка для консоли: операция, метрика, значения и изменение."""
+    mark = "РЕГРЕССИЯ" if change.regressed else ""
+    return (f"{change.name:<24}{change.scale:>10,} {change.metric:<18}"
+            f"{change.baseline:>14.1f}{change.current:>14.1f}{change.change:>+9.1%} {mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("current", help="результаты benchmarks.suite")
+    parser.add_argument("baseline", help="базовая линия")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    current, baseline = load_results(args.current), load_results(args.baseline)
+    if current is None or baseline is None:
+        parser.error("файл результатов или базовой линии не найден")
+    changes = compare(current, baseline, args.threshold)
+    for change in changes:
+        print(format_change(change))
+    failed = regressions(changes)
+    print(f"Регрессий: {len(failed)} (порог {args.threshold:.0%})")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
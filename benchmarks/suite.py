@@ -0,0 +1,247 @@
+"""
+Набор бенчмарков публичных функций task_manager (create_task, track_time,
+calculate_invoice, check_project_deadline, send_task_notification)
+в масштабах 1k / 100k / 1M вызовов с результатом в JSON.
+
+Для каждой операции и масштаба измеряются операций в секунду, перцентили
+задержки одного вызова и пик памяти (tracemalloc, отдельным проходом,
+чтобы трассировка не искажала время). Уведомления отправляются на локальный
+SMTP-сервер aiosmtpd; число писем ограничено --max-smtp.
+
+Запуск: python -m benchmarks.suite --scales 1k,100k,1m --output benchmark_results.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from array import array
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import task_manager
+from task_manager.models import Project
+
+DEFAULT_OUTPUT = "benchmark_results.json"
+SMTP_PORT = 8030
+SCALE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_scale(text: str) -> int:
+    """'1k' -> 1000, '1m' -> 1000000, '500' -> 500."""
+    text = text.strip().lower()
+    multiplier = SCALE_SUFFIXES.get(text[-1:], 1)
+    number = text[:-1] if multiplier != 1 else text
+    return int(float(number) * multiplier)
+
+
+def _reset_state() -> None:
+    task_manager.task_repo.clear()
+    task_manager.project_repo.clear()
+
+
+def setup_create_task(count: int) -> Callable[[int], object]:
+    _reset_state()
+    pid = task_manager.project_repo.add_project(Project(name="Bench"))
+    deadline = datetime.now() + timedelta(days=365)
+    return lambda i: task_manager.create_task(pid, "Bench task", deadline)
+
+
+def setup_track_time(count: int) -> Callable[[int], object]:
+    _reset_state()
+    pid = task_manager.project_repo.add_project(Project(name="Bench"))
+    deadline = datetime.now() + timedelta(days=365)
+    task_ids = task_manager.create_tasks(
+        [(pid, f"Task {i}", deadline) for i in range(min(count, 1000))]
+    ).created_ids
+    size = len(task_ids)
+    return lambda i: task_manager.track_time(task_ids[i % size], 0.5)
+
+
+def setup_calculate_invoice(count: int) -> Callable[[int], object]:
+    return lambda i: task_manager.calculate_invoice(10.0, 50.0, "USD")
+
+
+def setup_check_project_deadline(count: int) -> Callable[[int], object]:
+    _reset_state()
+    now = datetime.now()
+    project_ids = [
+        task_manager.project_repo.add_project(
+            Project(name=f"P{i}", deadline=now + timedelta(days=i - 50) if i % 3 else None)
+        )
+        for i in range(100)
+    ]
+    return lambda i: task_manager.check_project_deadline(project_ids[i % 100])
+
+
+def setup_send_task_notification(count: int) -> Callable[[int], object]:
+    task_info = {"title": "Bench", "deadline": datetime.now() + timedelta(days=1)}
+    return lambda i: task_manager.send_task_notification("bench@example.com", task_info)
+
+
+OPERATIONS: Dict[str, Callable[[int], Callable[[int], object]]] = {
+    "create_task": setup_create_task,
+    "track_time": setup_track_time,
+    "calculate_invoice": setup_calculate_invoice,
+    "check_project_deadline": setup_check_project_deadline,
+    "send_task_notification": setup_send_task_notification,
+}
+
+
+def _percentile(sorted_values, share: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(share * len(sorted_values)))]
+
+
+def measure(setup: Callable[[int], Callable[[int], object]], count: int,
+            memory: bool = True) -> dict:
+    """
+    Измеряет одну операцию.
+
+    Args:
+        setup: Готовит состояние и возвращает вызов операции по номеру.
+        count (int): Число вызовов.
+        memory (bool): Измерять ли пик памяти отдельным проходом.
+
+    Returns:
+        dict: ops, ops_per_sec, latency_us (p50/p90/p99/max), peak_memory_bytes.
+    """
+    call = setup(count)
+    clock = time.perf_counter_ns
+    timings = array("q", bytes(8 * count))
+    started = clock()
+    for i in range(count):
+        before = clock()
+        call(i)
+        timings[i] = clock() - before
+    elapsed = (clock() - started) / 1e9
+
+    ordered = sorted(timings)
+    result = {
+        "ops": count,
+        "ops_per_sec": count / elapsed if elapsed else None,
+        "latency_us": {
+            "p50": _percentile(ordered, 0.50) / 1000,
+            "p90": _percentile(ordered, 0.90) / 1000,
+            "p99": _percentile(ordered, 0.99) / 1000,
+            "max": ordered[-1] / 1000,
+        },
+        "peak_memory_bytes": None,
+    }
+    del timings, ordered
+
+    if memory:
+        call = setup(count)
+        tracemalloc.start()
+        for i in range(count):
+            call(i)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_memory_bytes"] = peak
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(scales: List[int], operations: Optional[List[str]] = None,
+              max_smtp: int = 10_000, smtp_port: int = SMTP_PORT,
+              memory: bool = True, progress: Callable[[str], None] = lambda line: None) -> dict:
+    """
+    Запускает набор и возвращает результаты в виде словаря для JSON.
+
+    Args:
+        scales (List[int]): Числа вызовов на операцию.
+        operations (Optional[List[str]]): Имена операций (по умолчанию — все).
+        max_smtp (int): Максимум писем на один масштаб для send_task_notification.
+        smtp_port (int): Порт локального SMTP-сервера.
+        memory (bool): Измерять ли пик памяти.
+        progress (Callable[[str], None]): Вывод строки о каждом результате.
+
+    Returns:
+        dict: {"meta": {...}, "results": [{"name", "scale", ...}, ...]}.
+    """
+    operations = operations or list(OPERATIONS)
+    unknown = set(operations) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Неизвестные операции: {', '.join(sorted(unknown))}.")
+
+    controller = None
+    service = task_manager.notification_service
+    saved_smtp = (service.smtp_host, service.smtp_port)
+    if "send_task_notification" in operations:
+        from aiosmtpd.controller import Controller
+        from aiosmtpd.handlers import Sink
+
+        controller = Controller(Sink(), hostname="localhost", port=smtp_port)
+        controller.start()
+        service.smtp_host, service.smtp_port = "localhost", smtp_port
+
+    results = []
+    try:
+        for scale in scales:
+            for name in operations:
+                count = min(scale, max_smtp) if name == "send_task_notification" else scale
+                entry = {"name": name, "scale": scale}
+                entry.update(measure(OPERATIONS[name], count, memory))
+                results.append(entry)
+                progress(_format_row(entry))
+    finally:
+        if controller is not None:
+            controller.stop()
+            service.smtp_host, service.smtp_port = saved_smtp
+        _reset_state()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "scales": scales,
+        },
+        "results": results,
+    }
+
+
+def _format_row(entry: dict) -> str:
+    latency = entry["latency_us"]
+    memory = entry["peak_memory_bytes"]
+    memory_text = "-" if memory is None else f"{memory / 2 ** 20:.1f}"
+    return (f"{entry['name']:<24}{entry['ops']:>10,}{entry['ops_per_sec']:>14,.0f}"
+            f"{latency['p50']:>10.1f}{latency['p99']:>10.1f}{memory_text:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", default="1k,100k,1m",
+                        help="масштабы через запятую, например 1k,100k,1m")
+    parser.add_argument("--operations", default=None,
+                        help="операции через запятую (по умолчанию все)")
+    parser.add_argument("--max-smtp", type=int, default=10_000)
+    parser.add_argument("--smtp-port", type=int, default=SMTP_PORT)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="не измерять пик памяти (вдвое быстрее)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    scales = [parse_scale(scale) for scale in args.scales.split(",")]
+    operations = args.operations.split(",") if args.operations else None
+    print(f"{'операция':<24}{'вызовов':>10}{'операций/с':>14}"
+          f"{'p50, мкс':>10}{'p99, мкс':>10}{'пик, МБ':>10}")
+    report = run_suite(scales, operations, args.max_smtp, args.smtp_port,
+                       memory=not args.no_memory, progress=print)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
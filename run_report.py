@@ -1,14 +1,39 @@
 # Универсальный скрипт запуска pytest с HTML-отчётом и покрытием кода
 # Работает на Windows, Linux, macOS
+import argparse
+import ast
+import hashlib
+import json
 import os
+import shutil
 import subprocess
 import sys
+import time
 import webbrowser
+from contextlib import contextmanager
+
+from benchmarks import regression
 
 LOG = "report_log.txt"
 VENV_DIR = "venv"
 REQ_FILE = "requirements.txt"
 REPORT_FILE = "report.html"
+COVERAGE_FILE = "coverage.json"
+# Частичный прогон пишет отдельный отчёт, полный остаётся нетронутым.
+PARTIAL_REPORT_FILE = "report_partial.html"
+PARTIAL_COVERAGE_FILE = "coverage_partial.json"
+BENCH_SCALES = "10k"
+# Хэш requirements.txt последней успешной установки; лежит в venv,
+# поэтому пересоздание окружения сбрасывает его.
+REQ_HASH_FILE = os.path.join(VENV_DIR, ".requirements.sha256")
+# Хэши исходников на момент последнего успешного прогона.
+STATE_FILE = ".run_report_state.json"
+SOURCE_DIRS = ("task_manager", "benchmarks", "tests")
+TESTS_DIR = "tests"
+# Изменения в этих каталогах требуют перезапуска бенчмарков.
+BENCH_SOURCES = ("task_manager", "benchmarks")
+
+phase_times = {}
 
 
 def log(msg):
@@ -23,56 +48,331 @@ def run(cmd, shell=False):
     return result.returncode
 
 
+@contextmanager
+def phase(name):
+    """Замеряет и пишет в лог время этапа."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phase_times[name] = time.perf_counter() - start
+        log(f"[{name}: {phase_times[name]:.1f} с]")
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
 def create_venv():
     log("Создание виртуального окружения...")
     return run([sys.executable, "-m", "venv", VENV_DIR]) == 0
 
 
 def install_requirements(pip_cmd):
+    """Устанавливает зависимости, если requirements.txt изменился с прошлой установки."""
+    req_hash = file_hash(REQ_FILE)
+    if os.path.exists(REQ_HASH_FILE):
+        with open(REQ_HASH_FILE, encoding="utf-8") as f:
+            if f.read().strip() == req_hash:
+                log("Зависимости не изменились, установка пропущена.")
+                return True
     log("Установка зависимостей...")
-    return run([pip_cmd, "install", "-r", REQ_FILE]) == 0
+    if run([pip_cmd, "install", "-r", REQ_FILE]) != 0:
+        return False
+    with open(REQ_HASH_FILE, "w", encoding="utf-8") as f:
+        f.write(req_hash)
+    return True
+
+
+def source_hashes():
+    """Хэши всех .py файлов в SOURCE_DIRS: путь (через /) -> sha256."""
+    hashes = {}
+    for root in SOURCE_DIRS:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [name for name in dirnames if name != "__pycache__"]
+            for name in filenames:
+                if name.endswith(".py"):
+                    path = os.path.join(dirpath, name)
+                    hashes[path.replace(os.sep, "/")] = file_hash(path)
+    return hashes
+
+
+def module_name(path):
+    """'task_manager/models.py' -> 'task_manager.models', '__init__.py' -> пакет."""
+    parts = path[:-3].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def local_imports(path, modules):
+    """
+    Локальные модули, которые импортирует файл (по AST, без выполнения).
+
+    `from task_manager.models import Task` зависит от task_manager.models,
+    а не от всего пакета: иначе любое изменение задевало бы все тесты.
+    """
+    with open(path, encoding="utf-8") as f:
+        try:
+            tree = ast.parse(f.read(), path)
+        except SyntaxError:
+            return set()
+    package = module_name(path).split(".")
+    if not path.endswith("__init__.py"):
+        package = package[:-1]
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parent = package[:len(package) - node.level + 1]
+                base = ".".join(parent + ([base] if base else []))
+            # `from пакет import модуль` зависит от модуля, а не от пакета.
+            names = [f"{base}.{alias.name}" if f"{base}.{alias.name}" in modules else base
+                     for alias in node.names]
+        else:
+            continue
+        found.update(name for name in names if name in modules)
+    return found
+
+
+def affected_tests(changed, hashes):
+    """
+    Тестовые файлы, которые зависят (транзитивно) от изменённых файлов.
+
+    Args:
+        changed (set): Изменённые, добавленные и удалённые пути.
+        hashes (dict): Текущие хэши исходников (source_hashes).
+
+    Returns:
+        list | None: Пути тестов; None — нужен полный прогон (изменён conftest
+            или файл удалён/переименован: его импортёров по текущим
+            исходникам уже не найти).
+    """
+    if any(os.path.basename(path) == "conftest.py" or path not in hashes
+           for path in changed):
+        return None
+    modules = {module_name(path): path for path in hashes}
+    importers = {}
+    for name, path in modules.items():
+        for imported in local_imports(path, modules):
+            importers.setdefault(imported, set()).add(name)
+
+    pending = [module_name(path) for path in changed]
+    seen = set(pending)
+    while pending:
+        for importer in importers.get(pending.pop(), ()):
+            if importer not in seen:
+                seen.add(importer)
+                pending.append(importer)
+    return sorted(
+        modules[name] for name in seen
+        if name in modules and modules[name].startswith(TESTS_DIR + "/")
+        and os.path.basename(modules[name]).startswith("test_")
+    )
+
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        return None
+    try:
+        with open(STATE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except ValueError:
+        return None
+
+
+def run_settings(args):
+    """
+    Всё, кроме исходников, от чего зависят результаты прогона:
+    зависимости и порог регрессий.
+    """
+    return {
+        "requirements": file_hash(REQ_FILE) if os.path.exists(REQ_FILE) else None,
+        "threshold": args.threshold,
+    }
+
+
+def save_state(hashes, settings):
+    with open(STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump({"sources": hashes, "settings": settings}, f, indent=1)
+
+
+def run_pytest(python_cmd, tests=None):
+    """
+    Запускает pytest параллельно (pytest-xdist). Файлы тестов не делятся
+    между процессами: тесты одного файла используют общие SMTP-порты.
 
+    Полный прогон пишет report.html и coverage.json; прогон части тестов —
+    report_partial.html и coverage_partial.json, чтобы не затирать полный
+    отчёт данными подмножества.
 
-def run_pytest(python_cmd):
-    log("Запуск тестов и генерация отчёта...")
+    Args:
+        python_cmd (str): Python из venv.
+        tests (list | None): Файлы тестов; None — все.
+    """
+    report, coverage = ((REPORT_FILE, COVERAGE_FILE) if tests is None
+                        else (PARTIAL_REPORT_FILE, PARTIAL_COVERAGE_FILE))
+    log(f"Запуск тестов и генерация отчёта {report}...")
     return run([
         python_cmd, "-m", "pytest",
-        "--html=" + REPORT_FILE,
+        "-n", "auto", "--dist", "loadfile",
+        "--html=" + report,
         "--self-contained-html",
-        "--cov=.", "--cov-report=json:coverage.json"
+        "--cov=.", "--cov-report=json:" + coverage
+    ] + (tests or [])) == 0
+
+
+def run_benchmarks(python_cmd, scales):
+    log("Запуск бенчмарков...")
+    return run([
+        python_cmd, "-m", "benchmarks.suite",
+        "--scales", scales,
+        "--output", regression.RESULTS_FILE
     ]) == 0
 
 
-def main():
-    if os.path.exists(LOG):
-        os.remove(LOG)
+def check_performance(threshold, update_baseline):
+    """
+    Сравнивает результаты бенчмарков с базовой линией, сохраняет сравнение
+    для отчёта и дописывает прогон в историю.
+
+    Если базовой линии нет (или update_baseline), текущие результаты
+    становятся базовой линией.
+
+    Returns:
+        bool: True — если нет регрессий сверх порога.
+    """
+    current = regression.load_results(regression.RESULTS_FILE)
+    if current is None:
+        log("Результаты бенчмарков не найдены.")
+        return True
+    regression.append_history(regression.HISTORY_FILE, current)
+
+    baseline = regression.load_results(regression.BASELINE_FILE)
+    if baseline is None or update_baseline:
+        log("Сохранение базовой линии производительности...")
+        shutil.copyfile(regression.RESULTS_FILE, regression.BASELINE_FILE)
+        baseline = current
+
+    changes = regression.compare(current, baseline, threshold)
+    regression.write_comparison(regression.COMPARISON_FILE, changes, threshold)
+    failed = regression.regressions(changes)
+    for change in failed:
+        log(regression.format_change(change))
+    return not failed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Запуск тестов, бенчмарков и HTML-отчёта.")
+    parser.add_argument("--bench-scales", default=BENCH_SCALES,
+                        help="масштабы бенчмарков через запятую, например 10k,100k")
+    parser.add_argument("--threshold", type=float, default=regression.DEFAULT_THRESHOLD,
+                        help="допустимое ухудшение метрики (доля базовой линии)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="сохранить текущие результаты как базовую линию")
+    parser.add_argument("--no-bench", action="store_true",
+                        help="не запускать бенчмарки")
+    parser.add_argument("--full", action="store_true",
+                        help="запустить все тесты и бенчмарки независимо от изменений")
+    return parser.parse_args()
 
-    log("Запуск сборки отчёта PyTest")
 
+def build_report(args):
+    """Этапы сборки; возвращает код выхода."""
     venv_bin = os.path.join(VENV_DIR, "Scripts" if os.name == "nt" else "bin")
     python_cmd = os.path.join(venv_bin, "python")
     pip_cmd = os.path.join(venv_bin, "pip")
 
-    if not os.path.exists(python_cmd):
-        if not create_venv():
-            log("Ошибка при создании venv.")
-            return
+    with phase("Окружение"):
+        if not os.path.exists(python_cmd):
+            if not create_venv():
+                log("Ошибка при создании venv.")
+                return 1
+        if not install_requirements(pip_cmd):
+            log("Ошибка при установке зависимостей.")
+            return 1
 
-    if not install_requirements(pip_cmd):
-        log("Ошибка при установке зависимостей.")
-        return
-
-    if run_pytest(python_cmd):
-        log("Все тесты выполнены.")
+    # Сравниваем исходники с последним успешным прогоном (тесты прошли,
+    # регрессий нет); после неудачи изменения остаются «новыми».
+    # Обновление базовой линии, новые зависимости или порог — полный прогон.
+    hashes = source_hashes()
+    settings = run_settings(args)
+    state = None if args.full or args.update_baseline else load_state()
+    if state is not None and state.get("settings") != settings:
+        log("Изменились зависимости или порог регрессий, полный прогон.")
+        state = None
+    if state is None:
+        changed = set(hashes)
+        tests = None
     else:
-        log("Некоторые тесты завершились с ошибками.")
+        previous = state.get("sources", {})
+        changed = {path for path in hashes.keys() | previous.keys()
+                   if hashes.get(path) != previous.get(path)}
+        tests = affected_tests(changed, hashes)
+        if not changed and os.path.exists(REPORT_FILE):
+            log("Изменений с последнего успешного прогона нет, используется прежний отчёт.")
+            webbrowser.open(os.path.abspath(REPORT_FILE))
+            return 0
+        log(f"Изменено файлов: {len(changed)}.")
+
+    # Бенчмарки запускаются до тестов: раздел производительности
+    # строится хуком отчёта во время pytest.
+    performance_ok = True
+    if args.no_bench:
+        if os.path.exists(regression.COMPARISON_FILE):
+            os.remove(regression.COMPARISON_FILE)
+    elif args.update_baseline or any(path.startswith(BENCH_SOURCES) for path in changed):
+        with phase("Бенчмарки"):
+            if run_benchmarks(python_cmd, args.bench_scales):
+                performance_ok = check_performance(args.threshold, args.update_baseline)
+            else:
+                log("Ошибка при запуске бенчмарков.")
+                performance_ok = False
+
+    tests_ok = True
+    report = REPORT_FILE
+    with phase("Тесты"):
+        if tests == []:
+            log("Изменения не затрагивают тесты, прогон пропущен.")
+        else:
+            if tests is not None:
+                log("Тесты, затронутые изменениями: " + ", ".join(tests))
+                log(f"Частичный прогон: отчёт в {PARTIAL_REPORT_FILE}, "
+                    f"полный отчёт {REPORT_FILE} не изменяется.")
+                report = PARTIAL_REPORT_FILE
+            tests_ok = run_pytest(python_cmd, tests)
+            log("Все тесты выполнены." if tests_ok else "Некоторые тесты завершились с ошибками.")
 
-    if os.path.exists(REPORT_FILE):
+    if tests_ok and performance_ok:
+        save_state(hashes, settings)
+
+    if os.path.exists(report):
         log("Открытие итогового отчёта...")
-        webbrowser.open(os.path.abspath(REPORT_FILE))
+        webbrowser.open(os.path.abspath(report))
     else:
         log("Файл отчёта не найден.")
 
+    if not performance_ok:
+        log("Производительность ухудшилась сверх порога.")
+    return 0 if tests_ok and performance_ok else 1
+
+
+def main():
+    args = parse_args()
+    if os.path.exists(LOG):
+        os.remove(LOG)
+
+    log("Запуск сборки отчёта PyTest")
+    start = time.perf_counter()
+    code = build_report(args)
+    timings = ", ".join(f"{name} {seconds:.1f} с" for name, seconds in phase_times.items())
+    log(f"Общее время: {time.perf_counter() - start:.1f} с ({timings})")
+    return code
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
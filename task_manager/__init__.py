@@ -1,12 +1,19 @@
 from datetime import datetime, date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+from task_manager import data_io
 from task_manager.models import Project, Task
 from task_manager.repositories import (
     InMemoryProjectRepository,
     InMemoryTaskRepository
 )
 from task_manager.notifications import NotificationService
-from task_manager.services import TaskService, InvoiceService
+from task_manager.services import (
+    BulkCreateResult,
+    InvoiceBatch,
+    InvoiceService,
+    TaskService
+)
 
 # Инициализация хранилищ (in-memory реализация)
 task_repo = InMemoryTaskRepository()
@@ -33,6 +40,19 @@ def create_task(project_id: int, title: str, deadline: datetime) -> int:
     return task_service.create_task(project_id, title, deadline)
 
 
+def create_tasks(rows: Iterable[Tuple[int, str, datetime]]) -> BulkCreateResult:
+    """
+    Создаёт задачи пакетом.
+
+    Args:
+        rows (Iterable[Tuple[int, str, datetime]]): Строки (project_id, title, deadline).
+
+    Returns:
+        BulkCreateResult: ID созданных задач и ошибки по номерам строк.
+    """
+    return task_service.create_tasks(rows)
+
+
 def track_time(task_id: int, hours: float) -> float:
     """
     Добавляет количество часов к задаче.
@@ -62,6 +82,22 @@ def calculate_invoice(hours: float, rate: float, currency: str) -> float:
     return invoice_service.calculate_invoice(hours, rate, currency)
 
 
+def calculate_invoices(hours: Sequence[float], rates: Sequence[float],
+                       currencies: Sequence[str]) -> InvoiceBatch:
+    """
+    Рассчитывает счета пакетом.
+
+    Args:
+        hours (Sequence[float]): Часы по строкам.
+        rates (Sequence[float]): Ставки по строкам.
+        currencies (Sequence[str]): Валюты по строкам.
+
+    Returns:
+        InvoiceBatch: Суммы по строкам и итоги по валютам.
+    """
+    return invoice_service.calculate_invoices(hours, rates, currencies)
+
+
 def check_project_deadline(project_id: int) -> bool:
     """
     Проверяет, просрочен ли проект.
@@ -87,3 +123,85 @@ def send_task_notification(email: str, task_info: dict) -> bool:
         bool: True при успешной отправке, False при ошибке.
     """
     return notification_service.send_task_notification(email, task_info)
+
+
+def send_task_notifications(notifications: Iterable[Tuple[str, dict]]) -> List[bool]:
+    """
+    Отправляет пакет email-уведомлений через одно SMTP-соединение.
+
+    Args:
+        notifications (Iterable[Tuple[str, dict]]): Пары (email, task_info).
+
+    Returns:
+        List[bool]: Результат по каждому письму в исходном порядке.
+    """
+    return notification_service.send_task_notifications(notifications)
+
+
+def send_task_digest(updates: Iterable[Tuple[str, dict]]) -> Dict[str, bool]:
+    """
+    Отправляет каждому получателю одно письмо со всеми его обновлениями задач.
+
+    Args:
+        updates (Iterable[Tuple[str, dict]]): Пары (email, task_info).
+
+    Returns:
+        Dict[str, bool]: Результат по каждому получателю.
+    """
+    return notification_service.send_task_digest(updates)
+
+
+def import_tasks(source, fmt: Optional[str] = None) -> data_io.ImportReport:
+    """
+    Импортирует задачи из CSV или JSON Lines пакетами.
+
+    Args:
+        source: Путь к файлу или открытый текстовый файл.
+        fmt (Optional[str]): "csv" или "jsonl"; по умолчанию — по расширению.
+
+    Returns:
+        ImportReport: Число прочитанных и созданных записей и ошибки.
+    """
+    return data_io.import_tasks(source, task_service, fmt)
+
+
+def export_tasks(dest, fmt: Optional[str] = None) -> int:
+    """
+    Выгружает все задачи в CSV или JSON Lines.
+
+    Args:
+        dest: Путь к файлу или открытый текстовый файл.
+        fmt (Optional[str]): "csv" или "jsonl"; по умолчанию — по расширению.
+
+    Returns:
+        int: Количество выгруженных задач.
+    """
+    return data_io.export_tasks(task_repo, dest, fmt)
+
+
+def import_projects(source, fmt: Optional[str] = None) -> data_io.ImportReport:
+    """
+    Импортирует проекты из CSV или JSON Lines.
+
+    Args:
+        source: Путь к файлу или открытый текстовый файл.
+        fmt (Optional[str]): "csv" или "jsonl"; по умолчанию — по расширению.
+
+    Returns:
+        ImportReport: Число прочитанных и созданных записей и ошибки.
+    """
+    return data_io.import_projects(source, project_repo, fmt)
+
+
+def export_projects(dest, fmt: Optional[str] = None) -> int:
+    """
+    Выгружает все проекты в CSV или JSON Lines.
+
+    Args:
+        dest: Путь к файлу или открытый текстовый файл.
+        fmt (Optional[str]): "csv" или "jsonl"; по умолчанию — по расширению.
+
+    Returns:
+        int: Количество выгруженных проектов.
+    """
+    return data_io.export_projects(project_repo, dest, fmt)
@@ -0,0 +1,129 @@
+import asyncio
+import smtplib
+from datetime import datetime
+from typing import List, Optional
+
+from task_manager.notifications import SENDER, NotificationService
+
+
+class AsyncNotificationService:
+    """
+    Асинхронная очередь email-уведомлений поверх NotificationService.
+
+    enqueue кладёт письмо в ограниченную очередь и сразу возвращает future
+    с результатом отправки; фоновые воркеры (не больше concurrency штук)
+    разбирают очередь, каждый через собственное долгоживущее SMTP-соединение.
+    Временные сбои повторяются с экспоненциальной задержкой.
+
+    Пример:
+        async with AsyncNotificationService(service, concurrency=4) as notifier:
+            future = await notifier.enqueue("user@example.com", task_info)
+            await notifier.drain()
+    """
+
+    def __init__(self, service: Optional[NotificationService] = None,
+                 concurrency: int = 4, queue_size: int = 1000,
+                 max_retries: int = 3, backoff: float = 0.5):
+        """
+        Args:
+            service (Optional[NotificationService]): Синхронный сервис с настройками SMTP.
+            concurrency (int): Число одновременных SMTP-сессий.
+            queue_size (int): Ёмкость очереди; при заполнении enqueue ждёт.
+            max_retries (int): Число повторов после неудачной попытки.
+            backoff (float): Начальная задержка между повторами, секунды.
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency должен быть положительным.")
+        self._service = service if service is not None else NotificationService()
+        self._concurrency = concurrency
+        self._queue_size = queue_size
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self):
+        """Запускает воркеры. Вызывается автоматически в async with."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self._concurrency)
+        ]
+
+    async def enqueue(self, email: str, task_info: dict) -> "asyncio.Future[bool]":
+        """
+        Ставит уведомление в очередь.
+
+        Args:
+            email (str): Email-адрес получателя.
+            task_info (dict): Информация о задаче.
+
+        Returns:
+            asyncio.Future[bool]: Завершится True при успешной отправке, иначе False.
+        """
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        if not self._service._is_valid_email(email):
+            future.set_result(False)
+            return future
+        await self._queue.put((email, task_info, future))
+        return future
+
+    async def drain(self):
+        """Ждёт, пока все поставленные в очередь письма будут обработаны."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        """Дожидается очереди и останавливает воркеры."""
+        await self.drain()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _worker(self):
+        session = self._service.open_session()
+        try:
+            while True:
+                email, task_info, future = await self._queue.get()
+                try:
+                    result = await self._send_with_retry(session, email, task_info)
+                except Exception:
+                    # Как и синхронный send_task_notification: ошибка письма —
+                    # результат False, воркер продолжает разбирать очередь.
+                    result = False
+                finally:
+                    self._queue.task_done()
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            await asyncio.to_thread(session.close)
+
+    async def _send_with_retry(self, session, email: str, task_info: dict) -> bool:
+        message = self._service._build_message(email, task_info, datetime.now())
+        delay = self._backoff
+        for attempt in range(self._max_retries + 1):
+            try:
+                await asyncio.to_thread(session.sendmail, SENDER, [email], message)
+                return True
+            except smtplib.SMTPRecipientsRefused:
+                return False
+            except smtplib.SMTPResponseException as exc:
+                if exc.smtp_code >= 500:
+                    return False
+            except OSError:
+                pass
+            await asyncio.to_thread(session.close)
+            if attempt < self._max_retries:
+                await asyncio.sleep(delay)
+                delay *= 2
+        return False
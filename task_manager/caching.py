@@ -0,0 +1,257 @@
+"""
+Кэширующие обёртки над репозиториями.
+
+CachingTaskRepository и CachingProjectRepository отвечают на get_task /
+get_project из ограниченного LRU-кэша с необязательным TTL. Отсутствующие
+ID тоже кэшируются (отрицательный кэш), поэтому повторные проверки
+несуществующего проекта не доходят до хранилища. Изменения проходят
+через обёртку в хранилище и сразу обновляют или сбрасывают кэш.
+Выборки (list_by_project, list_due_before и т.п.) не кэшируются.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Optional
+import threading
+import time
+
+from task_manager.models import Project, Task
+from task_manager.repositories import ProjectRepository, TaskRepository
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Счётчики кэша.
+
+    Атрибуты:
+        hits (int): Найдено в кэше (включая отрицательные попадания).
+        negative_hits (int): Из них — закэшированное отсутствие ID.
+        misses (int): Обращений к хранилищу.
+        evictions (int): Вытеснено по размеру.
+        size (int): Текущее число записей.
+    """
+    hits: int
+    negative_hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Доля попаданий среди всех обращений."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _LRUCache:
+    """LRU-кэш с TTL; значение _MISSING означает «ID не существует»."""
+
+    def __init__(self, max_size: int, ttl: Optional[float], clock: Callable[[], float]):
+        if max_size <= 0:
+            raise ValueError("max_size должен быть положительным.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl должен быть положительным.")
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Растёт при каждом изменении через обёртку; fill не кладёт в кэш
+        # значение, прочитанное до параллельного изменения.
+        self.version = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Возвращает значение, _MISSING или None (нет в кэше)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    if value is _MISSING:
+                        self.negative_hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def fill(self, key, value, version: int) -> None:
+        """Кладёт прочитанное из хранилища значение, если с version ничего не менялось."""
+        with self._lock:
+            if version == self.version:
+                self._store(key, value)
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self.version += 1
+            self._store(key, value)
+
+    def _store(self, key, value) -> None:
+        expires_at = None if self._ttl is None else self._clock() + self._ttl
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self.hits, self.negative_hits, self.misses,
+                              self.evictions, len(self._entries))
+
+
+class CachingTaskRepository(TaskRepository):
+    """
+    Обёртка TaskRepository с кэшем get_task.
+
+    Закэшированный объект возвращается как есть (как у InMemoryTaskRepository):
+    изменения нужно сохранять через update_task, который обновляет кэш.
+    """
+
+    def __init__(self, inner: TaskRepository, max_size: int = 4096,
+                 ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            inner (TaskRepository): Кэшируемый репозиторий.
+            max_size (int): Максимальное число записей в кэше.
+            ttl (Optional[float]): Время жизни записи в секундах; None — без срока.
+            clock (Callable[[], float]): Источник времени для TTL.
+        """
+        self.inner = inner
+        self._cache = _LRUCache(max_size, ttl, clock)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Счётчики попаданий и промахов."""
+        return self._cache.stats()
+
+    def add_task(self, task: Task) -> int:
+        new_id = self.inner.add_task(task)
+        # Сбрасываем возможную отрицательную запись для нового ID.
+        self._cache.discard(new_id)
+        return new_id
+
+    def add_tasks(self, tasks: Iterable[Task]) -> List[int]:
+        new_ids = self.inner.add_tasks(tasks)
+        for new_id in new_ids:
+            self._cache.discard(new_id)
+        return new_ids
+
+    def get_task(self, task_id: int) -> Task:
+        task = self._cache.get(task_id)
+        if task is _MISSING:
+            raise KeyError(f"Задача с id={task_id} не найдена.")
+        if task is None:
+            version = self._cache.version
+            try:
+                task = self.inner.get_task(task_id)
+            except KeyError:
+                self._cache.fill(task_id, _MISSING, version)
+                raise
+            self._cache.fill(task_id, task, version)
+        return task
+
+    def update_task(self, task: Task) -> None:
+        try:
+            self.inner.update_task(task)
+        except KeyError:
+            self._cache.discard(task.id)
+            raise
+        self._cache.put(task.id, task)
+
+    def list_by_project(self, project_id: int) -> List[Task]:
+        return self.inner.list_by_project(project_id)
+
+    def list_due_before(self, moment: datetime) -> List[Task]:
+        return self.inner.list_due_before(moment)
+
+    def iter_tasks(self) -> Iterator[Task]:
+        return self.inner.iter_tasks()
+
+    def restore_tasks(self, tasks: Iterable[Task]) -> None:
+        tasks = list(tasks)
+        self.inner.restore_tasks(tasks)
+        for task in tasks:
+            self._cache.discard(task.id)
+
+    def clear(self):
+        self.inner.clear()
+        self._cache.clear()
+
+
+class CachingProjectRepository(ProjectRepository):
+    """
+    Обёртка ProjectRepository с кэшем get_project.
+
+    TaskService проверяет существование проекта при каждом create_task,
+    поэтому для дисковых и удалённых хранилищ кэш снимает основную нагрузку.
+    """
+
+    def __init__(self, inner: ProjectRepository, max_size: int = 4096,
+                 ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            inner (ProjectRepository): Кэшируемый репозиторий.
+            max_size (int): Максимальное число записей в кэше.
+            ttl (Optional[float]): Время жизни записи в секундах; None — без срока.
+            clock (Callable[[], float]): Источник времени для TTL.
+        """
+        self.inner = inner
+        self._cache = _LRUCache(max_size, ttl, clock)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Счётчики попаданий и промахов."""
+        return self._cache.stats()
+
+    def add_project(self, project: Project) -> int:
+        new_id = self.inner.add_project(project)
+        self._cache.discard(new_id)
+        return new_id
+
+    def get_project(self, project_id: int) -> Project:
+        project = self._cache.get(project_id)
+        if project is _MISSING:
+            raise KeyError(f"Проект с id={project_id} не найден.")
+        if project is None:
+            version = self._cache.version
+            try:
+                project = self.inner.get_project(project_id)
+            except KeyError:
+                self._cache.fill(project_id, _MISSING, version)
+                raise
+            self._cache.fill(project_id, project, version)
+        return project
+
+    def iter_projects(self) -> Iterator[Project]:
+        return self.inner.iter_projects()
+
+    def restore_projects(self, projects: Iterable[Project]) -> None:
+        projects = list(projects)
+        self.inner.restore_projects(projects)
+        for project in projects:
+            self._cache.discard(project.id)
+
+    def clear(self):
+        self.inner.clear()
+        self._cache.clear()
@@ -0,0 +1,274 @@
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+import sys
+import threading
+
+from task_manager.ids import IdAllocator, SequentialIdAllocator
+from task_manager.models import Task, datetime_to_micros, micros_to_datetime
+from task_manager.repositories import TaskRepository
+
+
+class TaskView:
+    """
+    Лёгкое представление строки ColumnarTaskRepository с интерфейсом Task.
+
+    Поля читаются из колонок хранилища при обращении; hours_spent можно
+    изменять — значение записывается прямо в колонку.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "ColumnarTaskRepository", row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return self._store._ids[self._row]
+
+    @property
+    def project_id(self) -> int:
+        return self._store._project_ids[self._row]
+
+    @property
+    def title(self) -> str:
+        return self._store._titles[self._row]
+
+    @property
+    def deadline(self) -> datetime:
+        return micros_to_datetime(self._store._deadlines[self._row])
+
+    @property
+    def hours_spent(self) -> float:
+        return self._store._hours[self._row]
+
+    @hours_spent.setter
+    def hours_spent(self, value: float):
+        if not isinstance(value, (int, float)):
+            raise TypeError("hours_spent должен быть числом.")
+        if value < 0:
+            raise ValueError("hours_spent не может быть отрицательным.")
+        self._store._hours[self._row] = value
+
+    def to_task(self) -> Task:
+        """Возвращает независимую копию в виде обычного Task."""
+        return Task.from_trusted(self.id, self.project_id, self.title,
+                                 self.deadline, self.hours_spent)
+
+    def __eq__(self, other):
+        if isinstance(other, TaskView):
+            return self._store is other._store and self._row == other._row
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self._store), self._row))
+
+    def __repr__(self):
+        return (f"TaskView(id={self.id!r}, project_id={self.project_id!r}, "
+                f"title={self.title!r}, deadline={self.deadline!r}, "
+                f"hours_spent={self.hours_spent!r})")
+
+
+class ColumnarTaskRepository(TaskRepository):
+    """
+    Колоночная реализация TaskRepository для миллионов задач.
+
+    Поля хранятся в типизированных массивах (array): id, project_id,
+    дедлайн в микросекундах от эпохи и hours_spent; названия интернируются.
+    get_task и выборки возвращают TaskView вместо объектов Task.
+    Поддерживаются только наивные datetime в дедлайнах.
+
+    Переданный в add_task объект Task после вставки не связан с хранилищем:
+    изменения нужно вносить через полученный TaskView или update_task.
+    Вставка, изменение и выборки выполняются под общей блокировкой.
+    """
+
+    def __init__(self, id_allocator: Optional[IdAllocator] = None):
+        """
+        Args:
+            id_allocator (Optional[IdAllocator]): Генератор ID задач.
+                По умолчанию — последовательный счётчик с 1.
+        """
+        self._id_allocator = id_allocator if id_allocator is not None else SequentialIdAllocator()
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._ids = array("q")
+        self._project_ids = array("q")
+        self._deadlines = array("q")
+        self._hours = array("d")
+        self._titles: List[str] = []
+        self._rows: Dict[int, int] = {}
+        self._rows_by_project: Dict[int, array] = {}
+        # Номера строк, отсортированные по дедлайну; перестраивается лениво.
+        self._deadline_order = array("q")
+        self._deadline_order_stale = False
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _append(self, task_id: int, task: Task) -> None:
+        # Сначала преобразования: ошибка не должна оставить колонки разной длины.
+        deadline = datetime_to_micros(task.deadline)
+        hours = float(task.hours_spent)
+        title = sys.intern(task.title)
+        row = len(self._ids)
+        # Может упасть только на переполнении "q", поэтому первым.
+        self._project_ids.append(task.project_id)
+        self._ids.append(task_id)
+        self._deadlines.append(deadline)
+        self._hours.append(hours)
+        self._titles.append(title)
+        self._rows[task_id] = row
+        rows = self._rows_by_project.get(task.project_id)
+        if rows is None:
+            self._rows_by_project[task.project_id] = array("q", (row,))
+        else:
+            rows.append(row)
+        self._deadline_order_stale = True
+
+    def add_task(self, task: Task) -> int:
+        new_id = self._id_allocator.next_id()
+        with self._lock:
+            self._append(new_id, task)
+        task.id = new_id
+        return new_id
+
+    def add_tasks(self, tasks: Iterable[Task]) -> List[int]:
+        tasks = list(tasks)
+        new_ids = list(self._id_allocator.reserve(len(tasks)))
+        with self._lock:
+            for new_id, task in zip(new_ids, tasks):
+                self._append(new_id, task)
+                task.id = new_id
+        return new_ids
+
+    def _row_of(self, task_id: int) -> int:
+        row = self._rows.get(task_id)
+        if row is None:
+            raise KeyError(f"Задача с id={task_id} не найдена.")
+        return row
+
+    def get_task(self, task_id: int) -> TaskView:
+        return TaskView(self, self._row_of(task_id))
+
+    def update_task(self, task: Task) -> None:
+        with self._lock:
+            self._update_row(self._row_of(task.id), task)
+
+    def _update_row(self, row: int, task: Task) -> None:
+        if isinstance(task, TaskView) and task._store is self:
+            # Представление уже пишет hours_spent прямо в колонку.
+            return
+        old_project_id = self._project_ids[row]
+        if task.project_id != old_project_id:
+            rows = self._rows_by_project[old_project_id]
+            del rows[rows.index(row)]
+            if not rows:
+                del self._rows_by_project[old_project_id]
+            self._rows_by_project.setdefault(task.project_id, array("q")).append(row)
+            self._project_ids[row] = task.project_id
+        deadline = datetime_to_micros(task.deadline)
+        if deadline != self._deadlines[row]:
+            self._deadlines[row] = deadline
+            self._deadline_order_stale = True
+        self._hours[row] = task.hours_spent
+        self._titles[row] = sys.intern(task.title)
+
+    def list_by_project(self, project_id: int) -> List[TaskView]:
+        with self._lock:
+            return [TaskView(self, row) for row in self._rows_by_project.get(project_id, ())]
+
+    def project_hours(self, project_id: int) -> array:
+        """
+        Колонка hours_spent задач проекта без создания TaskView.
+
+        Returns:
+            array: Часы задач проекта в порядке добавления (typecode "d").
+        """
+        with self._lock:
+            rows = self._rows_by_project.get(project_id, ())
+            return array("d", map(self._hours.__getitem__, rows))
+
+    def list_due_before(self, moment: datetime) -> List[TaskView]:
+        with self._lock:
+            if self._deadline_order_stale:
+                deadlines = self._deadlines
+                self._deadline_order = array(
+                    "q", sorted(range(len(deadlines)), key=deadlines.__getitem__)
+                )
+                self._deadline_order_stale = False
+            order = self._deadline_order
+            end = bisect_left(order, datetime_to_micros(moment), key=self._deadlines.__getitem__)
+            return [TaskView(self, row) for row in order[:end]]
+
+    def iter_tasks(self) -> Iterator[TaskView]:
+        return (TaskView(self, row) for row in range(len(self)))
+
+    def restore_tasks(self, tasks: Iterable[Task]) -> None:
+        tasks = list(tasks)
+        if not tasks:
+            return
+        with self._lock:
+            for task in tasks:
+                row = self._rows.get(task.id)
+                if row is None:
+                    self._append(task.id, task)
+                else:
+                    self._update_row(row, task)
+        self._id_allocator.advance_past(max(task.id for task in tasks))
+
+    def export_columns(self) -> tuple:
+        """
+        Копии колонок для сохранения снимка без создания TaskView.
+
+        Returns:
+            tuple: (ids, project_ids, deadlines, hours, titles).
+        """
+        with self._lock:
+            return (array("q", self._ids), array("q", self._project_ids),
+                    array("q", self._deadlines), array("d", self._hours),
+                    [self._titles[row] for row in range(len(self._ids))])
+
+    def restore_columns(self, ids: array, project_ids: array, deadlines: array,
+                        hours: array, titles: Sequence[str]) -> None:
+        """
+        Заменяет содержимое хранилища готовыми колонками без создания Task.
+
+        Используется при загрузке снимка: массивы принимаются как есть
+        (дедлайны — микросекунды от эпохи), индексы строятся заново.
+
+        Args:
+            ids (array): ID задач (typecode "q").
+            project_ids (array): ID проектов (typecode "q").
+            deadlines (array): Дедлайны в микросекундах (typecode "q").
+            hours (array): Часы (typecode "d").
+            titles (Sequence[str]): Названия; может быть ленивой последовательностью.
+        """
+        if not len(ids) == len(project_ids) == len(deadlines) == len(hours) == len(titles):
+            raise ValueError("Колонки снимка должны быть одной длины.")
+        with self._lock:
+            self._reset()
+            self._ids = ids
+            self._project_ids = project_ids
+            self._deadlines = deadlines
+            self._hours = hours
+            self._titles = titles
+            self._rows = dict(zip(ids, range(len(ids))))
+            by_project = self._rows_by_project
+            for row, project_id in enumerate(project_ids):
+                rows = by_project.get(project_id)
+                if rows is None:
+                    by_project[project_id] = array("q", (row,))
+                else:
+                    rows.append(row)
+            self._deadline_order_stale = True
+        if len(ids):
+            self._id_allocator.advance_past(max(ids))
+
+    def clear(self):
+        with self._lock:
+            self._reset()
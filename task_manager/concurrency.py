@@ -0,0 +1,37 @@
+from contextlib import nullcontext
+import threading
+
+
+class StripedLock:
+    """
+    Набор блокировок, разделённых по ключу (lock striping).
+
+    Операции над одним ключом (например, ID задачи) сериализуются, а над
+    разными ключами почти всегда идут параллельно: ключ отображается
+    на одну из stripes блокировок по хешу.
+    """
+
+    def __init__(self, stripes: int = 64):
+        """
+        Args:
+            stripes (int): Количество блокировок. 0 — блокировка отключена.
+        """
+        if stripes < 0:
+            raise ValueError("stripes не может быть отрицательным.")
+        self._stripes = stripes
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._noop = nullcontext()
+
+    def for_key(self, key):
+        """
+        Возвращает блокировку для ключа (контекстный менеджер).
+
+        Args:
+            key: Хешируемый ключ.
+
+        Returns:
+            Блокировку ключа или пустой контекст, если striping отключён.
+        """
+        if not self._stripes:
+            return self._noop
+        return self._locks[hash(key) % self._stripes]
@@ -0,0 +1,295 @@
+"""
+Потоковый импорт и экспорт задач и проектов в CSV и JSON Lines.
+
+Файлы читаются и пишутся генераторами: в памяти одновременно находится
+не больше одного пакета строк (batch_size), поэтому размер файла
+не ограничен памятью. Задачи импортируются через TaskService.create_tasks
+пакетами; строки с ошибками (разбор, проверка, несуществующий проект)
+попадают в отчёт и не прерывают импорт.
+
+Поля задач: id, project_id, title, deadline, hours_spent.
+Поля проектов: id, name, deadline. Дедлайн — ISO 8601, пустое значение
+(null в JSON) у проекта означает «без дедлайна». При импорте id
+и hours_spent игнорируются: ID выдаёт хранилище, а часы учитываются
+через track_time. Для полного сохранения состояния — task_manager.snapshot.
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+import csv
+import json
+import os
+
+from task_manager.models import Project
+from task_manager.repositories import ProjectRepository, TaskRepository
+from task_manager.services import TaskService
+
+TASK_FIELDS = ("id", "project_id", "title", "deadline", "hours_spent")
+PROJECT_FIELDS = ("id", "name", "deadline")
+_TASK_INPUT = ("project_id", "title", "deadline")
+_PROJECT_INPUT = ("name", "deadline")
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+T = TypeVar("T")
+
+
+@dataclass
+class ImportReport:
+    """
+    Итог импорта.
+
+    Атрибуты:
+        rows (int): Прочитано записей.
+        created (int): Создано объектов.
+        failed (int): Записей с ошибками.
+        errors (Dict[int, Exception]): Ошибки по номерам записей (с 1, без
+            заголовка CSV); хранятся первые max_errors.
+        max_errors (int): Сколько ошибок сохранять в errors.
+    """
+    rows: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: Dict[int, Exception] = field(default_factory=dict)
+    max_errors: int = 1000
+
+    def add_error(self, record_no: int, exc: Exception) -> None:
+        """Учитывает ошибку записи."""
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors[record_no] = exc
+
+
+def _detect_format(source, fmt: Optional[str]) -> str:
+    if fmt is None:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+        fmt = FORMATS.get(os.path.splitext(os.fspath(name))[1].lower())
+        if fmt is None:
+            raise ValueError("Не удалось определить формат по имени файла; укажите fmt.")
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"Формат {fmt} не поддерживается.")
+    return fmt
+
+
+@contextmanager
+def _open(source, mode: str, fmt: Optional[str]):
+    """Открывает путь (или использует готовый текстовый файл) и определяет формат."""
+    fmt = _detect_format(source, fmt)
+    if hasattr(source, "read") or hasattr(source, "write"):
+        yield source, fmt
+        return
+    with open(source, mode, encoding="utf-8", newline="") as f:
+        yield f, fmt
+
+
+def _read_records(f, fmt: str, fields: Tuple[str, ...]) -> Iterator[Tuple[int, object]]:
+    """
+    Перебирает (номер записи, значения полей fields или исключение разбора).
+
+    Отсутствующее поле даёт None.
+    """
+    if fmt == "csv":
+        reader = csv.reader(f)
+        header = next(reader, [])
+        positions = [header.index(name) if name in header else None for name in fields]
+        record_no = 0
+        while True:
+            record_no += 1
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as exc:
+                # Например, поле длиннее csv.field_size_limit(): запись
+                # пропускается, чтение продолжается со следующей.
+                yield record_no, ValueError(f"Ошибка разбора CSV: {exc}")
+                continue
+            size = len(row)
+            yield record_no, tuple(
+                row[i] if i is not None and i < size else None for i in positions
+            )
+    record_no = 0
+    for line in f:
+        if not line.strip():
+            continue
+        record_no += 1
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield record_no, exc
+            continue
+        if isinstance(record, dict):
+            yield record_no, tuple(record.get(name) for name in fields)
+        else:
+            yield record_no, TypeError("Запись должна быть объектом.")
+
+
+def _batches(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _values(record, fields: Tuple[str, ...]) -> tuple:
+    """Проверяет, что запись разобрана и обязательные поля есть."""
+    if isinstance(record, Exception):
+        raise record
+    for name, value in zip(fields, record):
+        # Пустое название отклонит проверка Task с обычным сообщением.
+        if value is None or (value == "" and name != "title"):
+            raise ValueError(f"Нет поля {name}.")
+    return record
+
+
+def _parse_int(value):
+    return int(value) if isinstance(value, str) else value
+
+
+def _parse_deadline(value) -> Optional[datetime]:
+    if value is None or value == "":
+        return None
+    if not isinstance(value, str):
+        raise TypeError("deadline должен быть строкой ISO 8601.")
+    return datetime.fromisoformat(value)
+
+
+def _parse_task(record) -> Tuple[int, str, datetime]:
+    project_id, title, deadline = _values(record, _TASK_INPUT)
+    return _parse_int(project_id), title, _parse_deadline(deadline)
+
+
+def import_tasks(source, service: TaskService, fmt: Optional[str] = None,
+                 batch_size: int = 10_000, max_errors: int = 1000) -> ImportReport:
+    """
+    Импортирует задачи из CSV или JSON Lines через TaskService.create_tasks.
+
+    Args:
+        source: Путь к файлу или открытый текстовый файл.
+        service (TaskService): Сервис, создающий задачи.
+        fmt (Optional[str]): "csv" или "jsonl"; по умолчанию — по расширению.
+        batch_size (int): Размер пакета для create_tasks.
+        max_errors (int): Сколько ошибок сохранять в отчёте.
+
+    Returns:
+        ImportReport: Число прочитанных и созданных записей и ошибки.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size должен быть положительным.")
+    report = ImportReport(max_errors=max_errors)
+    with _open(source, "r", fmt) as (f, fmt):
+        for batch in _batches(_read_records(f, fmt, _TASK_INPUT), batch_size):
+            rows = []
+            numbers = []
+            for record_no, record in batch:
+                report.rows += 1
+                try:
+                    rows.append(_parse_task(record))
+                except (TypeError, ValueError) as exc:
+                    report.add_error(record_no, exc)
+                    continue
+                numbers.append(record_no)
+            result = service.create_tasks(rows)
+            report.created += len(rows) - len(result.errors)
+            for position, exc in result.errors.items():
+                report.add_error(numbers[position], exc)
+    return report
+
+
+def import_projects(source, project_repo: ProjectRepository, fmt: Optional[str] = None,
+                    max_errors: int = 1000) -> ImportReport:
+    """
+    Импортирует проекты из CSV или JSON Lines.
+
+    Args:
+        source: Путь к файлу или открытый текстовый файл.
+        project_repo (ProjectRepository): Хранилище проектов.
+        fmt (Optional[str]): "csv" или "jsonl"; по умолчанию — по расширению.
+        max_errors (int): Сколько ошибок сохранять в отчёте.
+
+    Returns:
+        ImportReport: Число прочитанных и созданных записей и ошибки.
+    """
+    report = ImportReport(max_errors=max_errors)
+    with _open(source, "r", fmt) as (f, fmt):
+        for record_no, record in _read_records(f, fmt, _PROJECT_INPUT):
+            report.rows += 1
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                name, deadline = record
+                if name is None:
+                    raise ValueError("Нет поля name.")
+                project = Project(name=name, deadline=_parse_deadline(deadline))
+            except (TypeError, ValueError) as exc:
+                report.add_error(record_no, exc)
+                continue
+            project_repo.add_project(project)
+            report.created += 1
+    return report
+
+
+def _write_records(f, fmt: str, fields: Tuple[str, ...], rows: Iterable[tuple]) -> int:
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
+    for row in rows:
+        f.write(json.dumps(dict(zip(fields, row)), ensure_ascii=False))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def _isoformat(value: Optional[datetime], fmt: str):
+    if value is None:
+        return "" if fmt == "csv" else None
+    return value.isoformat()
+
+
+def export_tasks(task_repo: TaskRepository, dest, fmt: Optional[str] = None) -> int:
+    """
+    Выгружает все задачи в CSV или JSON Lines.
+
+    Args:
+        task_repo (TaskRepository): Хранилище задач.
+        dest: Путь к файлу или открытый текстовый файл.
+        fmt (Optional[str]): "csv" или "jsonl"; по умолчанию — по расширению.
+
+    Returns:
+        int: Количество выгруженных задач.
+    """
+    with _open(dest, "w", fmt) as (f, fmt):
+        rows = (
+            (task.id, task.project_id, task.title, task.deadline.isoformat(), task.hours_spent)
+            for task in task_repo.iter_tasks()
+        )
+        return _write_records(f, fmt, TASK_FIELDS, rows)
+
+
+def export_projects(project_repo: ProjectRepository, dest, fmt: Optional[str] = None) -> int:
+    """
+    Выгружает все проекты в CSV или JSON Lines.
+
+    Args:
+        project_repo (ProjectRepository): Хранилище проектов.
+        dest: Путь к файлу или открытый текстовый файл.
+        fmt (Optional[str]): "csv" или "jsonl"; по умолчанию — по расширению.
+
+    Returns:
+        int: Количество выгруженных проектов.
+    """
+    with _open(dest, "w", fmt) as (f, fmt):
+        rows = (
+            (project.id, project.name, _isoformat(project.deadline, fmt))
+            for project in project_repo.iter_projects()
+        )
+        return _write_records(f, fmt, PROJECT_FIELDS, rows)
@@ -0,0 +1,177 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Callable, Optional, Sequence
+import threading
+import time
+
+
+class IdAllocator(ABC):
+    """
+    Абстрактный генератор идентификаторов.
+
+    Идентификаторы — обычные int, уникальные в пределах генератора.
+    """
+
+    @abstractmethod
+    def next_id(self) -> int:
+        """
+        Возвращает следующий свободный идентификатор.
+
+        Returns:
+            int: Новый ID.
+        """
+        pass
+
+    def reserve(self, count: int) -> Sequence[int]:
+        """
+        Резервирует сразу несколько идентификаторов (для пакетной вставки).
+
+        Args:
+            count (int): Количество идентификаторов.
+
+        Returns:
+            Sequence[int]: Зарезервированные ID в порядке выдачи.
+        """
+        return [self.next_id() for _ in range(count)]
+
+    def advance_past(self, value: int) -> None:
+        """
+        Гарантирует, что следующие идентификаторы будут больше value.
+
+        Вызывается после восстановления данных с уже выданными ID.
+        По умолчанию ничего не делает (генераторы на основе времени).
+
+        Args:
+            value (int): Наибольший существующий ID.
+        """
+        pass
+
+
+class SequentialIdAllocator(IdAllocator):
+    """
+    Монотонный счётчик: 1, 2, 3, ...
+
+    Потокобезопасен; reserve выдаёт непрерывный диапазон за одну блокировку.
+    """
+
+    def __init__(self, start: int = 1):
+        """
+        Args:
+            start (int): Первый выдаваемый идентификатор.
+        """
+        self._next = start
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            value = self._next
+            self._next = value + 1
+        return value
+
+    def reserve(self, count: int) -> range:
+        if count < 0:
+            raise ValueError("count не может быть отрицательным.")
+        with self._lock:
+            first = self._next
+            self._next = first + count
+        return range(first, first + count)
+
+    def advance_past(self, value: int) -> None:
+        with self._lock:
+            if self._next <= value:
+                self._next = value + 1
+
+
+class BlockIdAllocator(IdAllocator):
+    """
+    Генератор, который забирает у источника блоки идентификаторов
+    и раздаёт их локально.
+
+    Полезен, когда источник общий (или дорогой — например, последовательность
+    в БД): обращение к нему происходит раз в block_size вставок.
+    """
+
+    def __init__(self, source: IdAllocator, block_size: int = 1024):
+        """
+        Args:
+            source (IdAllocator): Источник идентификаторов.
+            block_size (int): Размер резервируемого блока.
+        """
+        if block_size <= 0:
+            raise ValueError("block_size должен быть положительным.")
+        self._source = source
+        self._block_size = block_size
+        self._block = iter(())
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            value = next(self._block, None)
+            if value is None:
+                self._block = iter(self._source.reserve(self._block_size))
+                value = next(self._block)
+        return value
+
+    def reserve(self, count: int) -> Sequence[int]:
+        return self._source.reserve(count)
+
+    def advance_past(self, value: int) -> None:
+        with self._lock:
+            self._source.advance_past(value)
+            # Остаток текущего блока может пересекаться с восстановленными ID.
+            self._block = iter(())
+
+
+class SnowflakeIdAllocator(IdAllocator):
+    """
+    Идентификаторы вида «время + шард + счётчик» для нескольких процессов-писателей.
+
+    Раскладка 63 бит: 41 бит — миллисекунды от epoch, 10 бит — номер шарда,
+    12 бит — счётчик внутри миллисекунды. Разные шарды никогда не пересекаются,
+    а идентификаторы одного шарда строго возрастают.
+    """
+
+    SHARD_BITS = 10
+    SEQUENCE_BITS = 12
+    MAX_SHARD = (1 << SHARD_BITS) - 1
+    MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+    DEFAULT_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def __init__(self, shard_id: int, epoch: datetime = DEFAULT_EPOCH,
+                 clock: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            shard_id (int): Номер процесса-писателя (0..1023).
+            epoch (datetime): Начало отсчёта времени.
+            clock (Optional[Callable[[], float]]): Источник времени в секундах
+                (по умолчанию time.time; подменяется в тестах).
+        """
+        if not 0 <= shard_id <= self.MAX_SHARD:
+            raise ValueError(f"shard_id должен быть в диапазоне 0..{self.MAX_SHARD}.")
+        self._shard_id = shard_id
+        self._epoch_ms = int(epoch.timestamp() * 1000)
+        self._clock = clock if clock is not None else time.time
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            now_ms = int(self._clock() * 1000) - self._epoch_ms
+            if now_ms < self._last_ms:
+                # Часы ушли назад — продолжаем с последней метки.
+                now_ms = self._last_ms
+            if now_ms == self._last_ms:
+                self._sequence = (self._sequence + 1) & self.MAX_SEQUENCE
+                if self._sequence == 0:
+                    # Счётчик исчерпан — ждём следующую миллисекунду.
+                    while now_ms <= self._last_ms:
+                        now_ms = int(self._clock() * 1000) - self._epoch_ms
+            else:
+                self._sequence = 0
+            self._last_ms = now_ms
+            return (
+                (now_ms << (self.SHARD_BITS + self.SEQUENCE_BITS))
+                | (self._shard_id << self.SEQUENCE_BITS)
+                | self._sequence
+            )
@@ -0,0 +1,402 @@
+"""
+Необязательная инструментация горячих путей.
+
+enable() подменяет методы TaskService, InvoiceService, NotificationService,
+SMTPSession и get_task / get_project репозиториев обёртками, которые
+считают вызовы и время; disable() возвращает исходные методы. Пока
+инструментация выключена, код работает без обёрток и без накладных
+расходов.
+
+Метрики:
+    task_manager_calls_total{method, outcome}     — вызовы методов сервисов
+        (outcome="error", если метод бросил исключение);
+    task_manager_call_duration_seconds{method}    — гистограмма времени вызова;
+    task_manager_repository_misses_total{repository, method} — KeyError
+        из get_task / get_project (обёртки вроде CachingTaskRepository
+        учитываются отдельно от хранилища, которое они оборачивают);
+    task_manager_smtp_connect_seconds{outcome}    — подключение к SMTP;
+    task_manager_smtp_send_seconds{outcome}       — отправка письма
+        (включая переподключение после обрыва).
+
+Снимок — snapshot() (словарь для JSON) или to_prometheus() (текстовый
+формат Prometheus).
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import threading
+import time
+
+# Импорт модулей регистрирует встроенные подклассы репозиториев,
+# чтобы enable() обернул и их get_task / get_project.
+from task_manager import caching, columnar, sqlite_repositories, wal  # noqa: F401
+from task_manager.notifications import NotificationService, SMTPSession
+from task_manager.repositories import ProjectRepository, TaskRepository
+from task_manager.services import InvoiceService, TaskService
+
+# Границы корзин гистограмм, секунды: от 10 мкс до 10 с.
+DEFAULT_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                   0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CALLS = "task_manager_calls_total"
+CALL_DURATION = "task_manager_call_duration_seconds"
+REPOSITORY_MISSES = "task_manager_repository_misses_total"
+SMTP_CONNECT = "task_manager_smtp_connect_seconds"
+SMTP_SEND = "task_manager_smtp_send_seconds"
+
+_HELP = {
+    CALLS: "Service method calls.",
+    CALL_DURATION: "Service method call duration in seconds.",
+    REPOSITORY_MISSES: "Repository lookups of a missing id.",
+    SMTP_CONNECT: "SMTP connection time in seconds.",
+    SMTP_SEND: "SMTP send time in seconds.",
+}
+
+SERVICE_METHODS = {
+    TaskService: ("create_task", "create_tasks", "track_time", "check_project_deadline"),
+    InvoiceService: ("calculate_invoice", "calculate_invoices",
+                     "invoice_from_ledger", "invoices_from_ledger"),
+    NotificationService: ("send_task_notification", "send_task_notifications",
+                          "send_task_digest"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Counter:
+    """Монотонный счётчик."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами (как histogram в Prometheus)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # Последняя корзина — значения больше всех границ (+Inf).
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Пары (граница le, число значений не больше неё), последняя — "+Inf"."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (None,), self.counts):
+            total += count
+            result.append(("+Inf" if bound is None else repr(bound), total))
+        return result
+
+
+class MetricsRegistry:
+    """
+    Потокобезопасное хранилище счётчиков и гистограмм с метками.
+
+    Метки передаются кортежем пар (имя, значение). Обёртки получают
+    объекты Counter и Histogram один раз при включении и на каждом вызове
+    только обновляют их под блокировкой реестра, без поиска по словарям.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets (Sequence[float]): Границы корзин гистограмм в секундах.
+        """
+        self._buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], Counter] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+
+    def counter(self, name: str, labels: Labels = ()) -> Counter:
+        """Счётчик name с метками labels (создаётся при первом обращении)."""
+        key = (name, labels)
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = Counter()
+            return counter
+
+    def histogram(self, name: str, labels: Labels = ()) -> Histogram:
+        """Гистограмма name с метками labels (создаётся при первом обращении)."""
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self._buckets)
+            return histogram
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1) -> None:
+        """Увеличивает счётчик name с метками labels."""
+        counter = self.counter(name, labels)
+        with self._lock:
+            counter.value += value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        """Добавляет значение в гистограмму name с метками labels."""
+        histogram = self.histogram(name, labels)
+        with self._lock:
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        """Обнуляет все метрики (объекты остаются: на них ссылаются обёртки)."""
+        with self._lock:
+            for counter in self._counters.values():
+                counter.value = 0
+            for histogram in self._histograms.values():
+                histogram.reset()
+
+    def snapshot(self) -> dict:
+        """
+        Снимок метрик для JSON.
+
+        Returns:
+            dict: {"counters": {имя: [{"labels", "value"}]},
+                "histograms": {имя: [{"labels", "count", "sum", "buckets"}]}}.
+        """
+        with self._lock:
+            counters: Dict[str, list] = {}
+            # Ключи уникальны, поэтому сами счётчики и гистограммы не сравниваются.
+            for (name, labels), counter in sorted(self._counters.items()):
+                counters.setdefault(name, []).append({"labels": dict(labels),
+                                                      "value": counter.value})
+            histograms: Dict[str, list] = {}
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                histograms.setdefault(name, []).append({
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "buckets": dict(histogram.cumulative()),
+                })
+        return {"counters": counters, "histograms": histograms}
+
+    def to_prometheus(self) -> str:
+        """
+        Снимок метрик в текстовом формате Prometheus (exposition format 0.0.4).
+
+        Returns:
+            str: Текст для отдачи по /metrics.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, series in snapshot["counters"].items():
+            lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for item in series:
+                lines.append(f"{name}{_format_labels(item['labels'])} {_format_value(item['value'])}")
+        for name, series in snapshot["histograms"].items():
+            lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for item in series:
+                labels = item["labels"]
+                for bound, count in item["buckets"].items():
+                    lines.append(f"{name}_bucket{_format_labels(labels, le=bound)} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(item['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {item['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str], **extra: str) -> str:
+    labels = {**labels, **extra}
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+_active: Optional[MetricsRegistry] = None
+# (класс, имя атрибута, исходный метод) для disable().
+_patched: List[Tuple[type, str, object]] = []
+_state_lock = threading.Lock()
+
+
+def _timed(metrics: MetricsRegistry, method, label: str):
+    """Обёртка метода сервиса: счётчик вызовов по исходу и гистограмма времени."""
+    ok = metrics.counter(CALLS, (("method", label), ("outcome", "ok")))
+    error_labels = (("method", label), ("outcome", "error"))
+    duration = metrics.histogram(CALL_DURATION, (("method", label),))
+    lock = metrics._lock
+    clock = time.perf_counter
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            result = method(*args, **kwargs)
+        except BaseException:
+            elapsed = clock() - start
+            # Ошибки редки: их счётчик создаётся при первой ошибке.
+            metrics.inc(CALLS, error_labels)
+            with lock:
+                duration.observe(elapsed)
+            raise
+        elapsed = clock() - start
+        with lock:
+            ok.value += 1
+            duration.observe(elapsed)
+        return result
+
+    return wrapper
+
+
+def _counting_misses(metrics: MetricsRegistry, method, repository: str, name: str):
+    """Обёртка get_task / get_project: считает KeyError (ID не найден)."""
+    labels = (("method", name), ("repository", repository))
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except KeyError:
+            metrics.inc(REPOSITORY_MISSES, labels)
+            raise
+
+    return wrapper
+
+
+def _smtp_timed(metrics: MetricsRegistry, method, name: str):
+    """Обёртка SMTPSession: гистограмма времени по исходу (ok / error)."""
+    ok = metrics.histogram(name, (("outcome", "ok"),))
+    error_labels = (("outcome", "error"),)
+    lock = metrics._lock
+    clock = time.perf_counter
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            result = method(*args, **kwargs)
+        except BaseException:
+            metrics.observe(name, error_labels, clock() - start)
+            raise
+        elapsed = clock() - start
+        with lock:
+            ok.observe(elapsed)
+        return result
+
+    return wrapper
+
+
+def _subclasses(base: type) -> Iterator[type]:
+    for cls in base.__subclasses__():
+        yield cls
+        yield from _subclasses(cls)
+
+
+def _patch(owner: type, attr: str, replacement) -> None:
+    _patched.append((owner, attr, owner.__dict__[attr]))
+    setattr(owner, attr, replacement)
+
+
+def enable(metrics: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """
+    Включает инструментацию (для всех экземпляров сервисов и репозиториев).
+
+    Оборачиваются встроенные репозитории и уже импортированные
+    пользовательские подклассы. Повторный вызов переключает запись
+    на другой реестр.
+
+    Args:
+        metrics (Optional[MetricsRegistry]): Реестр; по умолчанию — модульный registry.
+
+    Returns:
+        MetricsRegistry: Реестр, в который пишутся метрики.
+    """
+    global _active
+    metrics = registry if metrics is None else metrics
+    with _state_lock:
+        _restore()
+        for cls, methods in SERVICE_METHODS.items():
+            for name in methods:
+                _patch(cls, name, _timed(metrics, cls.__dict__[name], f"{cls.__name__}.{name}"))
+        for base, name in ((TaskRepository, "get_task"), (ProjectRepository, "get_project")):
+            for cls in _subclasses(base):
+                method = cls.__dict__.get(name)
+                if method is not None and not getattr(method, "__isabstractmethod__", False):
+                    _patch(cls, name, _counting_misses(metrics, method, cls.__name__, name))
+        _patch(SMTPSession, "_connect",
+               _smtp_timed(metrics, SMTPSession.__dict__["_connect"], SMTP_CONNECT))
+        _patch(SMTPSession, "sendmail",
+               _smtp_timed(metrics, SMTPSession.__dict__["sendmail"], SMTP_SEND))
+        _active = metrics
+    return metrics
+
+
+def _restore() -> None:
+    global _active
+    while _patched:
+        owner, attr, original = _patched.pop()
+        setattr(owner, attr, original)
+    _active = None
+
+
+def disable() -> None:
+    """Выключает инструментацию и возвращает исходные методы. Метрики сохраняются."""
+    with _state_lock:
+        _restore()
+
+
+def is_enabled() -> bool:
+    """True, если инструментация включена."""
+    return _active is not None
+
+
+@contextmanager
+def instrumented(metrics: Optional[MetricsRegistry] = None) -> Iterator[MetricsRegistry]:
+    """
+    Инструментация на время блока with.
+
+    Блоки можно вкладывать: внутренний переключает запись на свой реестр,
+    а при выходе восстанавливает реестр внешнего блока (или выключает
+    инструментацию, если до блока она была выключена).
+
+    Args:
+        metrics (Optional[MetricsRegistry]): Реестр; по умолчанию — модульный registry.
+
+    Yields:
+        MetricsRegistry: Реестр с метриками блока.
+    """
+    previous = _active
+    active = enable(metrics)
+    try:
+        yield active
+    finally:
+        if previous is None:
+            disable()
+        else:
+            enable(previous)
+
+
+def snapshot() -> dict:
+    """Снимок модульного реестра для JSON (см. MetricsRegistry.snapshot)."""
+    return registry.snapshot()
+
+
+def to_prometheus() -> str:
+    """Модульный реестр в текстовом формате Prometheus."""
+    return registry.to_prometheus()
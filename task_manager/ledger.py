@@ -0,0 +1,146 @@
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, Optional
+import threading
+
+from task_manager.models import datetime_to_micros, micros_to_datetime
+
+
+@dataclass(frozen=True, slots=True)
+class TimeEntry:
+    """
+    Запись учёта времени.
+
+    Атрибуты:
+        task_id (int): ID задачи.
+        project_id (int): ID проекта задачи.
+        hours (float): Добавленные часы.
+        recorded_at (datetime): Момент записи.
+    """
+    task_id: int
+    project_id: int
+    hours: float
+    recorded_at: datetime
+
+
+class TimeLedger:
+    """
+    Журнал учёта времени только на добавление.
+
+    Записи хранятся в типизированных массивах (task_id, project_id, часы,
+    время в микросекундах). Итоги по задаче, проекту и проекту за день
+    поддерживаются инкрементально при каждой записи, поэтому «часы проекта
+    за месяц» считаются за O(дней), а общие итоги — за O(1), без просмотра
+    журнала.
+    """
+
+    def __init__(self):
+        self._task_ids = array("q")
+        self._project_ids = array("q")
+        self._hours = array("d")
+        self._recorded_at = array("q")
+        self._by_task: Dict[int, float] = {}
+        self._by_project: Dict[int, float] = {}
+        self._by_project_day: Dict[int, Dict[date, float]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._hours)
+
+    def record(self, task_id: int, project_id: int, hours: float,
+               recorded_at: Optional[datetime] = None) -> None:
+        """
+        Добавляет запись и обновляет итоги.
+
+        Args:
+            task_id (int): ID задачи.
+            project_id (int): ID проекта задачи.
+            hours (float): Количество часов.
+            recorded_at (Optional[datetime]): Момент записи. По умолчанию datetime.now().
+        """
+        if recorded_at is None:
+            recorded_at = datetime.now()
+        # Сначала преобразования: ошибка не должна оставить колонки разной длины.
+        micros = datetime_to_micros(recorded_at)
+        day = recorded_at.date()
+        with self._lock:
+            self._task_ids.append(task_id)
+            self._project_ids.append(project_id)
+            self._hours.append(hours)
+            self._recorded_at.append(micros)
+            self._by_task[task_id] = self._by_task.get(task_id, 0.0) + hours
+            self._by_project[project_id] = self._by_project.get(project_id, 0.0) + hours
+            days = self._by_project_day.setdefault(project_id, {})
+            days[day] = days.get(day, 0.0) + hours
+
+    def entries(self) -> Iterator[TimeEntry]:
+        """Перебирает записи в порядке добавления."""
+        for i in range(len(self)):
+            yield TimeEntry(self._task_ids[i], self._project_ids[i], self._hours[i],
+                            micros_to_datetime(self._recorded_at[i]))
+
+    def hours_for_task(self, task_id: int) -> float:
+        """Всего часов по задаче, O(1)."""
+        return self._by_task.get(task_id, 0.0)
+
+    def hours_for_project(self, project_id: int, start: Optional[date] = None,
+                          end: Optional[date] = None) -> float:
+        """
+        Часы проекта за период [start, end] (даты включительно).
+
+        Без границ — O(1); с границами — сумма дневных итогов.
+
+        Args:
+            project_id (int): ID проекта.
+            start (Optional[date]): Первый день периода.
+            end (Optional[date]): Последний день периода.
+
+        Returns:
+            float: Сумма часов.
+        """
+        if start is None and end is None:
+            return self._by_project.get(project_id, 0.0)
+        return sum(self.hours_by_day(project_id, start, end).values())
+
+    def hours_by_day(self, project_id: int, start: Optional[date] = None,
+                     end: Optional[date] = None) -> Dict[date, float]:
+        """
+        Дневные итоги проекта за период [start, end].
+
+        Returns:
+            Dict[date, float]: Часы по дням, в которые были записи.
+        """
+        # Под блокировкой: record() дополняет словарь дней из других потоков.
+        with self._lock:
+            days = self._by_project_day.get(project_id, {})
+            if start is None or end is None or (end - start).days + 1 > len(days):
+                return {
+                    day: hours for day, hours in days.items()
+                    if (start is None or day >= start) and (end is None or day <= end)
+                }
+            result = {}
+            day = start
+            while day <= end:
+                hours = days.get(day)
+                if hours is not None:
+                    result[day] = hours
+                day += timedelta(days=1)
+            return result
+
+    def hours_by_project(self, start: Optional[date] = None,
+                         end: Optional[date] = None) -> Dict[int, float]:
+        """
+        Часы всех проектов за период [start, end].
+
+        Returns:
+            Dict[int, float]: Часы по ID проекта.
+        """
+        with self._lock:
+            if start is None and end is None:
+                return dict(self._by_project)
+            project_ids = list(self._by_project_day)
+        return {
+            project_id: self.hours_for_project(project_id, start, end)
+            for project_id in project_ids
+        }
@@ -1,9 +1,72 @@
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
 
-@dataclass
+
+def datetime_to_micros(value: datetime) -> int:
+    """
+    Переводит наивный datetime в целое число микросекунд от 1970-01-01.
+
+    Используется компактными хранилищами вместо объектов datetime.
+
+    Args:
+        value (datetime): Наивный datetime.
+
+    Returns:
+        int: Микросекунды от эпохи.
+    """
+    if value.tzinfo is not None:
+        raise ValueError("Поддерживаются только наивные datetime.")
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def micros_to_datetime(value: int) -> datetime:
+    """
+    Обратное преобразование для datetime_to_micros.
+
+    Args:
+        value (int): Микросекунды от эпохи.
+
+    Returns:
+        datetime: Наивный datetime.
+    """
+    return _EPOCH + timedelta(microseconds=value)
+
+
+# Проверки полей задачи: общие для Task.__post_init__ и validate_task_columns.
+# Возвращают исключение для некорректного значения, иначе None.
+def _project_id_error(value) -> Optional[Exception]:
+    if not isinstance(value, int):
+        return TypeError("project_id должен быть целым числом.")
+    return None
+
+
+def _title_error(value) -> Optional[Exception]:
+    if not isinstance(value, str):
+        return TypeError("title должен быть строкой.")
+    if value.strip() == "":
+        return ValueError("title не может быть пустым.")
+    return None
+
+
+def _deadline_error(value) -> Optional[Exception]:
+    if not isinstance(value, datetime):
+        return TypeError("deadline должен быть экземпляром datetime.")
+    return None
+
+
+def _hours_error(value) -> Optional[Exception]:
+    if not isinstance(value, (int, float)):
+        return TypeError("hours_spent должен быть числом.")
+    if value < 0:
+        return ValueError("hours_spent не может быть отрицательным.")
+    return None
+
+
+@dataclass(slots=True)
 class Task:
     """
     Модель данных задачи.
@@ -23,21 +86,64 @@ class Task:
 
     def __post_init__(self):
         """Проверка типов и значений полей после инициализации."""
-        if not isinstance(self.project_id, int):
-            raise TypeError("project_id должен быть целым числом.")
-        if not isinstance(self.title, str):
-            raise TypeError("title должен быть строкой.")
-        if self.title.strip() == "":
-            raise ValueError("title не может быть пустым.")
-        if not isinstance(self.deadline, datetime):
-            raise TypeError("deadline должен быть экземпляром datetime.")
-        if not isinstance(self.hours_spent, (int, float)):
-            raise TypeError("hours_spent должен быть числом.")
-        if self.hours_spent < 0:
-            raise ValueError("hours_spent не может быть отрицательным.")
-
-
-@dataclass
+        error = (_project_id_error(self.project_id) or _title_error(self.title)
+                 or _deadline_error(self.deadline) or _hours_error(self.hours_spent))
+        if error is not None:
+            raise error
+
+    @classmethod
+    def from_trusted(cls, task_id: Optional[int], project_id: int, title: str,
+                     deadline: datetime, hours_spent: float = 0.0) -> "Task":
+        """
+        Создаёт задачу без проверок __post_init__.
+
+        Только для данных, уже прошедших проверку: строки хранилища,
+        снимки, журнал, колонки после validate_task_columns.
+
+        Args:
+            task_id (Optional[int]): ID задачи.
+            project_id (int): ID проекта.
+            title (str): Название.
+            deadline (datetime): Дедлайн.
+            hours_spent (float): Отработанные часы.
+
+        Returns:
+            Task: Новая задача.
+        """
+        task = cls.__new__(cls)
+        task.id = task_id
+        task.project_id = project_id
+        task.title = title
+        task.deadline = deadline
+        task.hours_spent = hours_spent
+        return task
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[Optional[int], int, str, datetime, float]]) -> List["Task"]:
+        """
+        Пакетный вариант from_trusted для строк (id, project_id, title, deadline, hours_spent).
+
+        Args:
+            rows (Iterable[Tuple]): Проверенные строки.
+
+        Returns:
+            List[Task]: Задачи в порядке строк.
+        """
+        new = cls.__new__
+        tasks = []
+        append = tasks.append
+        for task_id, project_id, title, deadline, hours_spent in rows:
+            task = new(cls)
+            task.id = task_id
+            task.project_id = project_id
+            task.title = title
+            task.deadline = deadline
+            task.hours_spent = hours_spent
+            append(task)
+        return tasks
+
+
+@dataclass(slots=True)
 class Project:
     """
     Модель данных проекта.
@@ -57,3 +163,75 @@ class Project:
             raise TypeError("name должен быть строкой.")
         if self.deadline is not None and not isinstance(self.deadline, datetime):
             raise TypeError("deadline должен быть datetime или None.")
+
+    @classmethod
+    def from_trusted(cls, project_id: Optional[int], name: str,
+                     deadline: Optional[datetime] = None) -> "Project":
+        """
+        Создаёт проект без проверок __post_init__ (для уже проверенных данных).
+
+        Args:
+            project_id (Optional[int]): ID проекта.
+            name (str): Название.
+            deadline (Optional[datetime]): Дедлайн.
+
+        Returns:
+            Project: Новый проект.
+        """
+        project = cls.__new__(cls)
+        project.id = project_id
+        project.name = name
+        project.deadline = deadline
+        return project
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[Optional[int], str, Optional[datetime]]]) -> List["Project"]:
+        """
+        Пакетный вариант from_trusted для строк (id, name, deadline).
+
+        Args:
+            rows (Iterable[Tuple]): Проверенные строки.
+
+        Returns:
+            List[Project]: Проекты в порядке строк.
+        """
+        return [cls.from_trusted(*row) for row in rows]
+
+
+def validate_task_columns(project_ids: Sequence, titles: Sequence, deadlines: Sequence,
+                          hours_spent: Optional[Sequence] = None) -> Dict[int, Exception]:
+    """
+    Проверяет колонки входных данных задач теми же проверками полей,
+    что и Task.__post_init__, но проходом по каждой колонке, а не по
+    каждому объекту.
+
+    Для строки сообщается первая ошибка в порядке проверок __post_init__.
+    Строки без ошибок можно создавать через Task.from_trusted / Task.from_rows.
+
+    Args:
+        project_ids (Sequence): ID проектов.
+        titles (Sequence): Названия.
+        deadlines (Sequence): Дедлайны.
+        hours_spent (Optional[Sequence]): Часы; None — все нули.
+
+    Returns:
+        Dict[int, Exception]: Ошибки по номерам строк (с нуля).
+    """
+    count = len(project_ids)
+    columns = (titles, deadlines) if hours_spent is None else (titles, deadlines, hours_spent)
+    if any(len(column) != count for column in columns):
+        raise ValueError("Колонки должны быть одной длины.")
+
+    checks = [(project_ids, _project_id_error), (titles, _title_error),
+              (deadlines, _deadline_error)]
+    if hours_spent is not None:
+        checks.append((hours_spent, _hours_error))
+
+    errors: Dict[int, Exception] = {}
+    add = errors.setdefault
+    for column, check in checks:
+        for row, value in enumerate(column):
+            error = check(value)
+            if error is not None:
+                add(row, error)
+    return dict(sorted(errors.items()))
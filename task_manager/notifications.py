@@ -1,6 +1,165 @@
 import re
 import smtplib
+import threading
 from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SENDER = "no-reply@example.com"
+SUBJECT = "Notification: Task Update"
+DIGEST_SUBJECT = "Notification: Task Digest"
+
+_EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+EMAIL_CACHE_SIZE = 8192
+TEMPLATE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=EMAIL_CACHE_SIZE)
+def _email_is_valid(email: str) -> bool:
+    """Проверка формата email с кэшем уже проверенных адресов."""
+    return _EMAIL_RE.match(email) is not None
+
+
+class MessageTemplates:
+    """
+    Кэш заранее закодированных писем.
+
+    Для пары (название задачи, статус) один раз собирается и кодируется
+    в UTF-8 часть письма после заголовка To; для каждого получателя
+    остаётся склеить готовые байты с его адресом. Так же кэшируются строки
+    дайджеста. При переполнении вытесняются самые старые записи.
+    Потокобезопасен: запись и вытеснение выполняются под блокировкой.
+    """
+
+    def __init__(self, max_size: int = TEMPLATE_CACHE_SIZE):
+        """
+        Args:
+            max_size (int): Максимальное число закэшированных пар (задача, статус).
+        """
+        if max_size <= 0:
+            raise ValueError("max_size должен быть положительным.")
+        self._max_size = max_size
+        self._head = f"From: {SENDER}\r\nTo: ".encode("utf-8")
+        self._subject = f"\r\nSubject: {SUBJECT}\r\n\r\n".encode("utf-8")
+        self._tails: Dict[Tuple[str, str], bytes] = {}
+        self._lines: Dict[Tuple[str, str], bytes] = {}
+        self._lock = threading.Lock()
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._tails)
+
+    def _remember(self, cache: dict, key, value: bytes) -> bytes:
+        with self._lock:
+            if key not in cache and len(cache) >= self._max_size:
+                del cache[next(iter(cache))]
+            cache[key] = value
+        return value
+
+    def _line(self, key: Tuple[str, str]) -> bytes:
+        line = self._lines.get(key)
+        if line is None:
+            title, status = key
+            line = self._remember(self._lines, key, f'Задача "{title}" {status}.'.encode("utf-8"))
+        return line
+
+    def render(self, email: str, title: str, status: str) -> bytes:
+        """
+        Письмо об одной задаче для получателя email.
+
+        Args:
+            email (str): Адрес получателя.
+            title (str): Название задачи.
+            status (str): Статус задачи.
+
+        Returns:
+            bytes: Закодированное письмо.
+        """
+        key = (title, status)
+        tail = self._tails.get(key)
+        if tail is None:
+            self.misses += 1
+            tail = self._remember(self._tails, key, self._subject + self._line(key))
+        return self._head + email.encode("utf-8") + tail
+
+    def render_digest(self, email: str, items: Iterable[Tuple[str, str]]) -> bytes:
+        """
+        Одно письмо со строкой на каждую пару (название задачи, статус).
+
+        Args:
+            email (str): Адрес получателя.
+            items (Iterable[Tuple[str, str]]): Пары (название, статус).
+
+        Returns:
+            bytes: Закодированное письмо.
+        """
+        lines = [self._line(item) for item in items]
+        header = f"\r\nSubject: {DIGEST_SUBJECT} ({len(lines)})\r\n\r\n".encode("utf-8")
+        return b"".join((self._head, email.encode("utf-8"), header, b"\r\n".join(lines)))
+
+
+class SMTPSession:
+    """
+    Долгоживущее SMTP-соединение для отправки нескольких писем подряд.
+
+    Подключается лениво при первой отправке. Если соединение оборвалось
+    (сервер закрыл его, таймаут, сетевая ошибка), переподключается
+    и повторяет отправку один раз. Отказы сервера по конкретному письму
+    (SMTPResponseException, SMTPRecipientsRefused) пробрасываются без повтора.
+    """
+
+    def __init__(self, mailer, host: str, port: int):
+        """
+        Args:
+            mailer: Класс SMTP-клиента (smtplib.SMTP или совместимый).
+            host (str): Адрес SMTP-сервера.
+            port (int): Порт SMTP-сервера.
+        """
+        self._mailer = mailer
+        self._host = host
+        self._port = port
+        self._smtp = None
+        self.connections = 0
+
+    def _connect(self):
+        self._smtp = self._mailer(self._host, self._port)
+        self.connections += 1
+
+    def sendmail(self, sender: str, recipients: List[str], message: bytes):
+        """
+        Отправляет письмо через текущее соединение.
+
+        Args:
+            sender (str): Адрес отправителя.
+            recipients (List[str]): Получатели.
+            message (bytes): Закодированное письмо.
+        """
+        if self._smtp is None:
+            self._connect()
+        try:
+            return self._smtp.sendmail(sender, recipients, message)
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            raise
+        except OSError:
+            self.close()
+            self._connect()
+            return self._smtp.sendmail(sender, recipients, message)
+
+    def close(self):
+        """Закрывает соединение (QUIT), ошибки при закрытии игнорируются."""
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.__exit__(None, None, None)
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
 
 class NotificationService:
@@ -26,6 +185,7 @@ class NotificationService:
         self.mailer = mailer if mailer is not None else (
             smtplib.SMTP_SSL if use_tls else smtplib.SMTP
         )
+        self.templates = MessageTemplates()
 
     def send_task_notification(self, email: str, task_info: dict) -> bool:
         """
@@ -38,40 +198,110 @@ class NotificationService:
         Returns:
             bool: True — при успешной отправке, False — в случае ошибки.
         """
-        if not self._is_valid_email(email):
+        try:
+            if not self._is_valid_email(email):
+                return False
+            message = self._build_message(email, task_info, datetime.now())
+            with self.open_session() as session:
+                session.sendmail(SENDER, [email], message)
+            return True
+        except Exception:
             return False
 
-        status = "создана"
-        completed = task_info.get("completed", False)
+    def send_task_notifications(self, notifications: Iterable[Tuple[str, dict]],
+                                now: Optional[datetime] = None) -> List[bool]:
+        """
+        Отправляет пакет уведомлений через одно SMTP-соединение.
+
+        Соединение открывается один раз на пакет и переоткрывается
+        при обрыве; ошибка по одному письму не прерывает пакет.
+
+        Args:
+            notifications (Iterable[Tuple[str, dict]]): Пары (email, task_info).
+            now (Optional[datetime]): Момент, относительно которого задача
+                считается просроченной. По умолчанию datetime.now().
+
+        Returns:
+            List[bool]: Результат отправки по каждой паре в исходном порядке.
+        """
+        if now is None:
+            now = datetime.now()
+        results = []
+        with self.open_session() as session:
+            for email, task_info in notifications:
+                try:
+                    if not self._is_valid_email(email):
+                        results.append(False)
+                        continue
+                    session.sendmail(SENDER, [email], self._build_message(email, task_info, now))
+                    results.append(True)
+                except Exception:
+                    results.append(False)
+        return results
+
+    def send_task_digest(self, updates: Iterable[Tuple[str, dict]]) -> Dict[str, bool]:
+        """
+        Отправляет по одному письму-дайджесту на получателя со всеми
+        его обновлениями задач (вместо письма на каждое обновление).
+
+        Args:
+            updates (Iterable[Tuple[str, dict]]): Пары (email, task_info).
+
+        Returns:
+            Dict[str, bool]: Результат по каждому получателю в порядке
+                первого появления; False — и для получателя, у которого
+                хотя бы одно обновление некорректно.
+        """
+        now = datetime.now()
+        digests: Dict[str, List[Tuple[str, str]]] = {}
+        broken = set()
+        for email, task_info in updates:
+            items = digests.setdefault(email, [])
+            try:
+                items.append((str(task_info.get("title", "")), self._task_status(task_info, now)))
+            except Exception:
+                broken.add(email)
+        results = {}
+        with self.open_session() as session:
+            for email, items in digests.items():
+                try:
+                    if email in broken or not self._is_valid_email(email):
+                        results[email] = False
+                        continue
+                    session.sendmail(SENDER, [email], self.templates.render_digest(email, items))
+                    results[email] = True
+                except Exception:
+                    results[email] = False
+        return results
+
+    def open_session(self) -> SMTPSession:
+        """
+        Создаёт SMTP-сессию с настройками сервиса.
+
+        Returns:
+            SMTPSession: Сессия; подключение происходит при первой отправке.
+        """
+        return SMTPSession(self.mailer, self.smtp_host, self.smtp_port)
+
+    @staticmethod
+    def _task_status(task_info: dict, now: datetime) -> str:
+        """Статус задачи для текста письма: создана, завершена или просрочена."""
+        if task_info.get("completed", False):
+            return "завершена"
         deadline = task_info.get("deadline")
+        if isinstance(deadline, datetime) and deadline < now:
+            return "просрочена"
+        return "создана"
 
-        if completed:
-            status = "завершена"
-        elif isinstance(deadline, datetime):
-            if deadline < datetime.now():
-                status = "просрочена"
-
-        title = task_info.get("title", "")
-        subject = "Notification: Task Update"
-        body = f'Задача "{title}" {status}.'
-
-        message = (
-            f"From: no-reply@example.com\r\n"
-            f"To: {email}\r\n"
-            f"Subject: {subject}\r\n\r\n"
-            f"{body}"
+    def _build_message(self, email: str, task_info: dict, now: datetime) -> bytes:
+        """Письмо для одного получателя из кэша шаблонов."""
+        return self.templates.render(
+            email, str(task_info.get("title", "")), self._task_status(task_info, now)
         )
 
-        try:
-            with self.mailer(self.smtp_host, self.smtp_port) as smtp:
-                smtp.sendmail("no-reply@example.com", [email], message.encode("utf-8"))
-            return True
-        except Exception:
-            return False
-
     def _is_valid_email(self, email: str) -> bool:
         """
-        Проверка формата email через регулярное выражение.
+        Проверка формата email через предкомпилированное выражение с LRU-кэшем.
 
         Args:
             email (str): Email для проверки.
@@ -79,7 +309,19 @@ class NotificationService:
         Returns:
             bool: True — если email валиден.
         """
-        return bool(re.match(r"[^@]+@[^@]+\.[^@]+", email))
+        return _email_is_valid(email)
+
+    def validate_emails(self, emails: Iterable[str]) -> List[str]:
+        """
+        Отбирает корректные адреса из списка получателей за один проход.
+
+        Args:
+            emails (Iterable[str]): Адреса получателей.
+
+        Returns:
+            List[str]: Корректные адреса в исходном порядке.
+        """
+        return [email for email in emails if _email_is_valid(email)]
 
 
 class StubMailSender:
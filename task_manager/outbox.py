@@ -0,0 +1,406 @@
+"""
+Надёжная очередь исходящих уведомлений (outbox) в SQLite.
+
+enqueue сразу собирает письмо и сохраняет его в базе — отправитель
+не ждёт SMTP, а письмо не теряется при сбое сервера или процесса.
+Фоновый поток забирает пакеты готовых к отправке писем, отправляет их
+через одну SMTP-сессию с ограничением скорости, при временных сбоях
+откладывает повтор с экспоненциальной задержкой, а после отказа сервера
+(5xx) или исчерпания попыток переносит письмо в таблицу dead letters.
+"""
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional, Tuple
+import logging
+import smtplib
+import sqlite3
+import threading
+import time
+
+from task_manager.notifications import SENDER, NotificationService
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    message BLOB NOT NULL,
+    enqueued_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (next_attempt_at, id);
+-- Собственный ID: ID строк outbox после удаления используются повторно.
+CREATE TABLE IF NOT EXISTS outbox_dead (
+    id INTEGER PRIMARY KEY,
+    outbox_id INTEGER NOT NULL,
+    email TEXT NOT NULL,
+    message BLOB NOT NULL,
+    enqueued_at REAL NOT NULL,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    failed_at REAL NOT NULL
+);
+"""
+
+_INSERT = (
+    "INSERT INTO outbox (email, message, enqueued_at, next_attempt_at) VALUES (?, ?, ?, ?)"
+)
+_SELECT_DUE = (
+    "SELECT id, email, message, enqueued_at, attempts FROM outbox"
+    " WHERE next_attempt_at <= ? ORDER BY next_attempt_at, id LIMIT ?"
+)
+_DELETE = "DELETE FROM outbox WHERE id = ?"
+_RESCHEDULE = (
+    "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?"
+)
+_BURY = (
+    "INSERT INTO outbox_dead"
+    " (outbox_id, email, message, enqueued_at, attempts, last_error, failed_at)"
+    " SELECT id, email, message, enqueued_at, ?, ?, ? FROM outbox WHERE id = ?"
+)
+_NEXT_DUE = "SELECT MIN(next_attempt_at) FROM outbox"
+_DEPTH = "SELECT COUNT(*) FROM outbox"
+_DEAD_COUNT = "SELECT COUNT(*) FROM outbox_dead"
+_DEAD = (
+    "SELECT id, outbox_id, email, attempts, last_error, failed_at FROM outbox_dead ORDER BY id"
+)
+_REQUEUE_DEAD = (
+    "INSERT INTO outbox (email, message, enqueued_at, next_attempt_at)"
+    " SELECT email, message, enqueued_at, ? FROM outbox_dead ORDER BY id"
+)
+
+
+@dataclass(frozen=True)
+class DeadLetter:
+    """
+    Письмо, которое не удалось доставить.
+
+    Атрибуты:
+        id (int): ID записи dead letters.
+        outbox_id (int): ID письма в очереди на момент переноса.
+        email (str): Получатель.
+        attempts (int): Число попыток.
+        last_error (str): Последняя ошибка.
+        failed_at (float): Время переноса (секунды эпохи).
+    """
+    id: int
+    outbox_id: int
+    email: str
+    attempts: int
+    last_error: str
+    failed_at: float
+
+
+@dataclass(frozen=True)
+class OutboxMetrics:
+    """
+    Метрики очереди.
+
+    Атрибуты:
+        depth (int): Писем в очереди (включая ожидающие повтора).
+        dead (int): Писем в dead letters.
+        sent (int): Отправлено с момента создания объекта.
+        retried (int): Отложено на повтор.
+        latency_p50 (float): Медиана задержки от enqueue до отправки, секунды.
+        latency_p95 (float): 95-й перцентиль задержки, секунды.
+        latency_max (float): Максимальная задержка среди последних отправок.
+    """
+    depth: int
+    dead: int
+    sent: int
+    retried: int
+    latency_p50: float
+    latency_p95: float
+    latency_max: float
+
+
+class _RateLimiter:
+    """Ведро токенов: не больше rate писем в секунду, всплеск до burst."""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float],
+                 sleep: Callable[[float], None]):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+
+    def acquire(self) -> None:
+        while True:
+            now = self._clock()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            self._sleep((1 - self._tokens) / self._rate)
+
+
+def _is_permanent(exc: Exception) -> bool:
+    """Отказ сервера по письму, который повтор не исправит."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+
+class NotificationOutbox:
+    """
+    Очередь уведомлений с фоновым отправителем.
+
+    Пример:
+        with NotificationOutbox(service, "outbox.db") as outbox:
+            outbox.enqueue("user@example.com", task_info)
+    """
+
+    def __init__(self, service: Optional[NotificationService] = None,
+                 path: str = ":memory:", batch_size: int = 100, max_attempts: int = 5,
+                 backoff: float = 1.0, rate_limit: Optional[float] = None,
+                 poll_interval: float = 1.0, clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            service (Optional[NotificationService]): Сервис с настройками SMTP и шаблонами.
+            path (str): Путь к файлу базы очереди или ":memory:".
+            batch_size (int): Сколько писем забирать за один проход.
+            max_attempts (int): Попыток до переноса в dead letters.
+            backoff (float): Задержка перед первым повтором, секунды; далее удваивается.
+            rate_limit (Optional[float]): Максимум писем в секунду; None — без ограничения.
+            poll_interval (float): Максимальный интервал проверки очереди воркером.
+            clock (Callable[[], float]): Источник времени (секунды эпохи).
+            sleep (Callable[[float], None]): Ожидание для ограничения скорости.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size должен быть положительным.")
+        if max_attempts <= 0:
+            raise ValueError("max_attempts должен быть положительным.")
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError("rate_limit должен быть положительным.")
+        self._service = service if service is not None else NotificationService()
+        self._batch_size = batch_size
+        self._max_attempts = max_attempts
+        self._backoff = backoff
+        self._poll_interval = poll_interval
+        self._clock = clock
+        self._limiter = None if rate_limit is None else _RateLimiter(
+            rate_limit, max(1, int(rate_limit)), time.monotonic, sleep
+        )
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        # Один отправитель за раз: воркер и ручной drain не берут одни и те же письма.
+        self._send_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._latencies = deque(maxlen=1024)
+        self._sent = 0
+        self._retried = 0
+
+    def enqueue(self, email: str, task_info: dict) -> Optional[int]:
+        """
+        Собирает письмо и сохраняет его в очереди.
+
+        Args:
+            email (str): Email-адрес получателя.
+            task_info (dict): Информация о задаче.
+
+        Returns:
+            Optional[int]: ID записи очереди; None для некорректного адреса.
+        """
+        ids = self.enqueue_many([(email, task_info)])
+        return ids[0]
+
+    def enqueue_many(self, notifications: Iterable[Tuple[str, dict]]) -> List[Optional[int]]:
+        """
+        Сохраняет пакет писем одной транзакцией.
+
+        Args:
+            notifications (Iterable[Tuple[str, dict]]): Пары (email, task_info).
+
+        Returns:
+            List[Optional[int]]: ID записей; None для некорректных адресов
+                и писем, которые не удалось собрать (например, task_info=None).
+        """
+        now = self._clock()
+        moment = datetime.now()
+        # Письма собираются до транзакции: ошибка одного не откатывает пакет.
+        messages: List[Optional[Tuple[str, bytes]]] = []
+        for email, task_info in notifications:
+            try:
+                if self._service._is_valid_email(email):
+                    messages.append((email, self._service._build_message(email, task_info, moment)))
+                    continue
+            except Exception:
+                pass
+            messages.append(None)
+        ids: List[Optional[int]] = []
+        with self._lock, self._conn:
+            for item in messages:
+                if item is None:
+                    ids.append(None)
+                    continue
+                email, message = item
+                cursor = self._conn.execute(_INSERT, (email, message, now, now))
+                ids.append(cursor.lastrowid)
+        self._wakeup.set()
+        return ids
+
+    def process_batch(self) -> int:
+        """
+        Отправляет один пакет готовых к отправке писем.
+
+        Returns:
+            int: Сколько писем было взято из очереди (отправлено, отложено
+                или перенесено в dead letters).
+        """
+        with self._send_lock:
+            return self._send_due()
+
+    def _send_due(self) -> int:
+        now = self._clock()
+        with self._lock:
+            rows = self._conn.execute(_SELECT_DUE, (now, self._batch_size)).fetchall()
+        if not rows:
+            return 0
+        with self._service.open_session() as session:
+            for row_id, email, message, enqueued_at, attempts in rows:
+                if self._limiter is not None:
+                    self._limiter.acquire()
+                try:
+                    session.sendmail(SENDER, [email], message)
+                except Exception as exc:
+                    self._failed(row_id, attempts + 1, exc)
+                    if not _is_permanent(exc):
+                        # Соединение могло остаться в неизвестном состоянии.
+                        session.close()
+                    continue
+                with self._lock, self._conn:
+                    self._conn.execute(_DELETE, (row_id,))
+                self._sent += 1
+                self._latencies.append(self._clock() - enqueued_at)
+        return len(rows)
+
+    def _failed(self, row_id: int, attempts: int, exc: Exception) -> None:
+        error = f"{type(exc).__name__}: {exc}"
+        now = self._clock()
+        with self._lock, self._conn:
+            if _is_permanent(exc) or attempts >= self._max_attempts:
+                self._conn.execute(_BURY, (attempts, error, now, row_id))
+                self._conn.execute(_DELETE, (row_id,))
+            else:
+                delay = self._backoff * 2 ** (attempts - 1)
+                self._conn.execute(_RESCHEDULE, (attempts, now + delay, error, row_id))
+                self._retried += 1
+
+    def drain(self) -> int:
+        """
+        Отправляет все письма, готовые к отправке сейчас (без ожидания повторов).
+
+        Returns:
+            int: Сколько писем было взято из очереди.
+        """
+        total = 0
+        while True:
+            processed = self.process_batch()
+            if processed == 0:
+                return total
+            total += processed
+
+    def start(self) -> None:
+        """Запускает фоновый поток отправки."""
+        if self._worker is not None:
+            return
+        self._stopping.clear()
+        self._worker = threading.Thread(target=self._run, name="notification-outbox", daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Останавливает фоновый поток; неотправленные письма остаются в базе."""
+        if self._worker is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        self._worker.join()
+        self._worker = None
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            # Сбрасываем до проверки очереди: enqueue после этой точки
+            # снова взведёт событие, и wait не пропустит его.
+            self._wakeup.clear()
+            timeout = self._poll_interval
+            try:
+                if self.process_batch():
+                    continue
+                with self._lock:
+                    (next_due,) = self._conn.execute(_NEXT_DUE).fetchone()
+                if next_due is not None:
+                    timeout = min(timeout, max(0.0, next_due - self._clock()))
+            except Exception:
+                # Воркер не должен молча умирать, пока enqueue принимает письма.
+                logger.exception("Ошибка отправки очереди уведомлений")
+            self._wakeup.wait(timeout)
+
+    def metrics(self) -> OutboxMetrics:
+        """
+        Текущие метрики очереди.
+
+        Returns:
+            OutboxMetrics: Глубина очереди, dead letters, счётчики и задержки.
+        """
+        with self._lock:
+            (depth,) = self._conn.execute(_DEPTH).fetchone()
+            (dead,) = self._conn.execute(_DEAD_COUNT).fetchone()
+            latencies = sorted(self._latencies)
+
+        def percentile(share: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(share * len(latencies)))]
+
+        return OutboxMetrics(depth, dead, self._sent, self._retried,
+                             percentile(0.5), percentile(0.95),
+                             latencies[-1] if latencies else 0.0)
+
+    def dead_letters(self) -> List[DeadLetter]:
+        """
+        Письма, перенесённые в dead letters.
+
+        Returns:
+            List[DeadLetter]: Записи в порядке ID.
+        """
+        with self._lock:
+            return [DeadLetter(*row) for row in self._conn.execute(_DEAD).fetchall()]
+
+    def requeue_dead_letters(self) -> int:
+        """
+        Возвращает все dead letters в очередь с обнулёнными попытками.
+
+        Returns:
+            int: Сколько писем возвращено.
+        """
+        with self._lock, self._conn:
+            count = self._conn.execute(_REQUEUE_DEAD, (self._clock(),)).rowcount
+            self._conn.execute("DELETE FROM outbox_dead")
+        self._wakeup.set()
+        return count
+
+    def close(self) -> None:
+        """Останавливает воркер и закрывает базу."""
+        self.stop()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
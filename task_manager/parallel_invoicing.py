@@ -0,0 +1,154 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from math import fsum
+from typing import Dict, List, Mapping, Optional, Tuple
+import os
+
+from task_manager.repositories import TaskRepository
+from task_manager.services import InvoiceBatchError, InvoiceService
+
+
+@dataclass
+class InvoiceRun:
+    """
+    Результат параллельного расчёта счетов.
+
+    Атрибуты:
+        project_totals (Dict[int, float]): Сумма счёта по ID проекта.
+        totals (Dict[str, float]): Итоговые суммы по валютам.
+    """
+    project_totals: Dict[int, float] = field(default_factory=dict)
+    totals: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class _Shard:
+    """
+    Компактный пакет для воркера: колонки в виде bytes вместо списка Task.
+
+    project_ids, task_counts и rates — по проектам шарда; hours — часы всех
+    задач шарда подряд, сгруппированные по проектам в том же порядке.
+    """
+    project_ids: bytes = b""
+    task_counts: bytes = b""
+    rates: bytes = b""
+    currencies: List[str] = field(default_factory=list)
+    hours: bytes = b""
+
+
+def _invoice_shard(shard: _Shard) -> Tuple[Dict[int, float], Dict[str, float]]:
+    """Считает шард в процессе-воркере через пакетный calculate_invoices."""
+    project_ids = array("q")
+    project_ids.frombytes(shard.project_ids)
+    task_counts = array("q")
+    task_counts.frombytes(shard.task_counts)
+    rates = array("d")
+    rates.frombytes(shard.rates)
+    hours = array("d")
+    hours.frombytes(shard.hours)
+
+    task_rates = array("d")
+    task_currencies = []
+    for count, rate, currency in zip(task_counts, rates, shard.currencies):
+        task_rates.extend(array("d", (rate,)) * count)
+        task_currencies.extend([currency] * count)
+    batch = InvoiceService().calculate_invoices(hours, task_rates, task_currencies)
+
+    amounts = array("d", batch.amounts)
+    project_totals = {}
+    position = 0
+    for project_id, count in zip(project_ids, task_counts):
+        project_totals[project_id] = fsum(amounts[position:position + count])
+        position += count
+    return project_totals, batch.totals
+
+
+class ParallelInvoiceEngine:
+    """
+    Параллельный расчёт счетов по проектам в пуле процессов.
+
+    Проекты распределяются по шардам с балансировкой по числу задач;
+    каждому воркеру отправляются колонки часов и ставок в виде bytes,
+    а не pickle-объекты Task. Итоги по валютам объединяются в родителе.
+    Если хранилище умеет отдавать колонку часов проекта (project_hours,
+    как ColumnarTaskRepository), задачи при подготовке шардов не создаются.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers (Optional[int]): Число процессов. По умолчанию — число ядер.
+                При 1 расчёт выполняется в текущем процессе без пула.
+        """
+        self._max_workers = max_workers or os.cpu_count() or 1
+
+    def run(self, task_repo: TaskRepository,
+            billing: Mapping[int, Tuple[float, str]]) -> InvoiceRun:
+        """
+        Рассчитывает счета проектов по часам их задач.
+
+        Args:
+            task_repo (TaskRepository): Хранилище задач.
+            billing (Mapping[int, Tuple[float, str]]): (rate, currency) по ID проекта.
+
+        Returns:
+            InvoiceRun: Суммы по проектам и итоги по валютам.
+        """
+        self._validate(billing)
+        shards = self._make_shards(task_repo, billing)
+        if self._max_workers == 1 or len(shards) <= 1:
+            results = [_invoice_shard(shard) for shard in shards]
+        else:
+            with ProcessPoolExecutor(max_workers=self._max_workers) as pool:
+                results = list(pool.map(_invoice_shard, shards))
+
+        run = InvoiceRun()
+        for project_totals, totals in results:
+            run.project_totals.update(project_totals)
+            for currency, amount in totals.items():
+                run.totals[currency] = run.totals.get(currency, 0.0) + amount
+        return run
+
+    @staticmethod
+    def _validate(billing: Mapping[int, Tuple[float, str]]) -> None:
+        errors = {}
+        for project_id, (rate, currency) in billing.items():
+            if rate < 0:
+                errors[project_id] = "Ставка (rate) не может быть отрицательной."
+            elif currency not in InvoiceService.SUPPORTED_CURRENCIES:
+                errors[project_id] = f"Валюта {currency} не поддерживается."
+        if errors:
+            raise InvoiceBatchError(errors)
+
+    def _make_shards(self, task_repo: TaskRepository,
+                     billing: Mapping[int, Tuple[float, str]]) -> List[_Shard]:
+        project_hours = getattr(task_repo, "project_hours", None)
+        columns = []
+        for project_id, (rate, currency) in billing.items():
+            if project_hours is not None:
+                hours = project_hours(project_id)
+            else:
+                hours = array("d", (t.hours_spent for t in task_repo.list_by_project(project_id)))
+            columns.append((len(hours), project_id, rate, currency, hours))
+        # Жадная балансировка: крупные проекты — в наименее загруженный шард.
+        columns.sort(key=lambda column: column[0], reverse=True)
+        shard_count = min(self._max_workers, len(columns))
+        loads = [0] * shard_count
+        parts = [
+            (array("q"), array("q"), array("d"), [], array("d")) for _ in range(shard_count)
+        ]
+        for count, project_id, rate, currency, hours in columns:
+            target = loads.index(min(loads))
+            loads[target] += count
+            project_ids, counts, rates, currencies, all_hours = parts[target]
+            project_ids.append(project_id)
+            counts.append(count)
+            rates.append(rate)
+            currencies.append(currency)
+            all_hours.extend(hours)
+        return [
+            _Shard(project_ids.tobytes(), counts.tobytes(), rates.tobytes(),
+                   currencies, all_hours.tobytes())
+            for project_ids, counts, rates, currencies, all_hours in parts
+        ]
@@ -0,0 +1,393 @@
+"""
+Профилирование нагрузок на API task_manager.
+
+profile() оборачивает блок кода одним из профилировщиков:
+    "sampling" — выборочный: фоновый поток раз в interval секунд снимает
+        стеки через sys._current_frames(). Меряет реальное (wall-clock) время,
+        включая ожидание SMTP и диска; накладные расходы малы, поэтому
+        подходит для длинных импортов;
+    "cprofile" — детерминированный cProfile: точные времена функций, но
+        заметно замедляет код. Стеки восстанавливаются по графу вызовов
+        (для каждой функции — по самому «тяжёлому» вызывающему), то есть
+        приближённо.
+
+Результат (Profile) агрегируется по модулям: для task_manager — по имени
+подмодуля (repositories, services, models, notifications, ...), для
+остального — по пакету верхнего уровня. Стеки записываются в формате
+collapsed stacks («кадр;кадр;кадр вес»), который понимают flamegraph.pl,
+speedscope и inferno; вес — микросекунды.
+
+Запуск: python -m task_manager.profiling --output stacks.txt script.py [аргументы]
+        python -m task_manager.profiling --mode cprofile -m benchmarks.suite --scales 10k
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+import argparse
+import contextlib
+import cProfile
+import os
+import pstats
+import runpy
+import sys
+import threading
+import time
+
+MODES = ("sampling", "cprofile")
+DEFAULT_INTERVAL = 0.005
+PACKAGE = "task_manager"
+
+Stack = Tuple[str, ...]
+
+
+@dataclass
+class ModuleTime:
+    """
+    Время модуля в профиле, секунды.
+
+    Атрибуты:
+        self_time (float): Время в функциях самого модуля (верх стека).
+        total_time (float): Время, когда модуль был где-либо в стеке.
+    """
+    self_time: float = 0.0
+    total_time: float = 0.0
+
+
+def module_group(label: str, main_module: Optional[str] = None) -> str:
+    """
+    Группа для агрегации по кадру "модуль:функция".
+
+    task_manager.services:... -> services; sqlite3.dbapi2:... -> sqlite3;
+    <frozen importlib._bootstrap>:... -> importlib.
+
+    Args:
+        label (str): Кадр "модуль:функция".
+        main_module (Optional[str]): Имя, под которым учитывается __main__
+            (профилируемый скрипт или модуль).
+
+    Returns:
+        str: Имя группы.
+    """
+    module = label.split(":", 1)[0]
+    if module.startswith("<frozen ") and module.endswith(">"):
+        module = module[len("<frozen "):-1]
+    if module == "__main__" and main_module:
+        module = main_module
+    if module.startswith(PACKAGE + "."):
+        return module[len(PACKAGE) + 1:].split(".", 1)[0]
+    return module.split(".", 1)[0] or "?"
+
+
+class Profile:
+    """
+    Результат профилирования: веса (секунды) по стекам от корня к листу.
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.stacks: Dict[Stack, float] = {}
+        self.samples = 0
+        self.duration = 0.0
+        # Имя профилируемого скрипта или модуля для кадров __main__.
+        self.main_module: Optional[str] = None
+        # pstats.Stats в режиме cprofile.
+        self.stats: Optional[pstats.Stats] = None
+
+    def add(self, stack: Stack, weight: float) -> None:
+        """Добавляет вес стеку."""
+        self.stacks[stack] = self.stacks.get(stack, 0.0) + weight
+        self.samples += 1
+
+    def by_module(self) -> Dict[str, ModuleTime]:
+        """
+        Время по группам модулей (см. module_group), по убыванию собственного.
+
+        Returns:
+            Dict[str, ModuleTime]: Группа -> собственное и полное время.
+        """
+        totals: Dict[str, ModuleTime] = {}
+        for stack, weight in self.stacks.items():
+            if not stack:
+                continue
+            groups = [module_group(label, self.main_module) for label in stack]
+            totals.setdefault(groups[-1], ModuleTime()).self_time += weight
+            for group in set(groups):
+                totals.setdefault(group, ModuleTime()).total_time += weight
+        return dict(sorted(totals.items(), key=lambda item: -item[1].self_time))
+
+    def collapsed(self) -> Iterator[str]:
+        """Строки collapsed stacks: кадры через ';', пробел, вес в микросекундах."""
+        for stack, weight in sorted(self.stacks.items()):
+            micros = int(round(weight * 1e6))
+            if stack and micros > 0:
+                yield ";".join(stack) + f" {micros}"
+
+    def write_collapsed(self, path: str) -> int:
+        """
+        Записывает стеки для flamegraph.
+
+        Args:
+            path (str): Путь к файлу.
+
+        Returns:
+            int: Число записанных стеков.
+        """
+        count = 0
+        with open(path, "w", encoding="utf-8") as f:
+            for line in self.collapsed():
+                f.write(line + "\n")
+                count += 1
+        return count
+
+    def report(self, limit: int = 15) -> str:
+        """Текстовая таблица времени по модулям."""
+        modules = self.by_module()
+        total = sum(item.self_time for item in modules.values()) or 1.0
+        lines = [f"{'модуль':<24}{'собств., с':>12}{'%':>8}{'всего, с':>12}"]
+        for name, item in list(modules.items())[:limit]:
+            lines.append(f"{name:<24}{item.self_time:>12.3f}"
+                         f"{100 * item.self_time / total:>8.1f}{item.total_time:>12.3f}")
+        lines.append(f"режим: {self.mode}, длительность: {self.duration:.2f} с, "
+                     f"стеков: {len(self.stacks)}")
+        return "\n".join(lines)
+
+
+def _clean(label: str) -> str:
+    # ';' разделяет кадры в формате collapsed stacks.
+    return label.replace(";", ",")
+
+
+class SamplingProfiler:
+    """
+    Выборочный профилировщик на sys._current_frames().
+
+    По умолчанию снимает стеки потока, вызвавшего start(); с all_threads —
+    всех потоков, кроме собственного.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, all_threads: bool = False):
+        """
+        Args:
+            interval (float): Период выборки в секундах.
+            all_threads (bool): Профилировать все потоки процесса.
+        """
+        if interval <= 0:
+            raise ValueError("interval должен быть положительным.")
+        self.interval = interval
+        self.all_threads = all_threads
+        self.profile = Profile("sampling")
+        self._labels: Dict[object, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._target: Optional[int] = None
+        # Кадры над кодом, вызвавшим start(), одинаковы во всех выборках
+        # профилируемого потока и отрезаются.
+        self._skip = 0
+
+    def _label(self, frame) -> str:
+        code = frame.f_code
+        label = self._labels.get(code)
+        if label is None:
+            module = frame.f_globals.get("__name__", "?")
+            name = getattr(code, "co_qualname", code.co_name)
+            label = self._labels[code] = _clean(f"{module}:{name}")
+        return label
+
+    def _stack(self, frame, skip: int = 0) -> Stack:
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame))
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels[skip:])
+
+    @staticmethod
+    def _caller_depth() -> int:
+        """Число кадров над кодом, вызвавшим profile() или start()."""
+        frame = sys._getframe(1)
+        while frame is not None and (
+            frame.f_code.co_filename == contextlib.__file__
+            or (frame.f_code.co_filename == __file__ and frame.f_code.co_name in ("start", "profile"))
+        ):
+            frame = frame.f_back
+        depth = 0
+        while frame is not None and frame.f_back is not None:
+            depth += 1
+            frame = frame.f_back
+        return depth
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        clock = time.perf_counter
+        last = clock()
+        while not self._stop.wait(self.interval):
+            now = clock()
+            # Вес выборки — реально прошедшее время: под нагрузкой GIL
+            # поток просыпается реже, чем раз в interval.
+            weight, last = now - last, now
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self._target:
+                    self.profile.add(self._stack(frame, self._skip), weight)
+                elif self.all_threads and thread_id != own:
+                    self.profile.add(self._stack(frame), weight)
+
+    def start(self) -> None:
+        """Запускает выборку в фоновом потоке."""
+        self._target = threading.get_ident()
+        self._skip = self._caller_depth()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Profile:
+        """Останавливает выборку и возвращает профиль."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.profile
+
+
+def _module_names() -> Dict[str, str]:
+    """Путь файла -> имя модуля для загруженных модулей."""
+    names = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path:
+            names[path] = name
+    return names
+
+
+def profile_from_stats(stats: pstats.Stats) -> Profile:
+    """
+    Профиль из статистики cProfile.
+
+    Для каждой функции со своим временем стек строится вверх по вызывающим,
+    на каждом шаге — по тому, из которого пришло больше всего времени.
+
+    Args:
+        stats (pstats.Stats): Статистика cProfile.
+
+    Returns:
+        Profile: Профиль с приближёнными стеками; вес — собственное время функции.
+    """
+    modules = _module_names()
+    raw = stats.stats
+    labels = {}
+    for func in raw:
+        path, _, name = func
+        module = modules.get(path)
+        if module is None:
+            # Встроенные функции, замороженные модули ("<frozen ...>")
+            # и скрипты, не попавшие в sys.modules.
+            if path == "~":
+                module = "builtins"
+            elif path.startswith("<"):
+                module = path
+            else:
+                module = os.path.splitext(os.path.basename(path))[0]
+        labels[func] = _clean(f"{module}:{name}")
+
+    result = Profile("cprofile")
+    result.stats = stats
+    for func, (_, _, own_time, _, callers) in raw.items():
+        if own_time <= 0:
+            continue
+        path = [func]
+        seen = {func}
+        while callers:
+            caller = max(callers, key=lambda item: callers[item][3])
+            if caller in seen or caller not in raw:
+                break
+            path.append(caller)
+            seen.add(caller)
+            callers = raw[caller][4]
+        result.add(tuple(labels[item] for item in reversed(path)), own_time)
+    return result
+
+
+@contextlib.contextmanager
+def profile(mode: str = "sampling", interval: float = DEFAULT_INTERVAL,
+            output: Optional[str] = None, all_threads: bool = False) -> Iterator[Profile]:
+    """
+    Профилирует блок with.
+
+    Профиль заполняется при выходе из блока; если задан output, туда же
+    записываются стеки в формате collapsed stacks.
+
+    Args:
+        mode (str): "sampling" или "cprofile".
+        interval (float): Период выборки (только sampling).
+        output (Optional[str]): Файл для collapsed stacks.
+        all_threads (bool): Профилировать все потоки (только sampling).
+
+    Yields:
+        Profile: Профиль (пустой до конца блока).
+    """
+    if mode not in MODES:
+        raise ValueError(f"Режим {mode} не поддерживается.")
+    result = Profile(mode)
+    start = time.perf_counter()
+    if mode == "sampling":
+        sampler = SamplingProfiler(interval, all_threads)
+        sampler.start()
+        try:
+            yield result
+        finally:
+            collected = sampler.stop()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield result
+        finally:
+            profiler.disable()
+            collected = profile_from_stats(pstats.Stats(profiler))
+
+    result.stacks, result.samples, result.stats = (
+        collected.stacks, collected.samples, collected.stats
+    )
+    result.duration = time.perf_counter() - start
+    if output is not None:
+        result.write_collapsed(output)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--mode", choices=MODES, default="sampling")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="период выборки, секунды")
+    parser.add_argument("--all-threads", action="store_true",
+                        help="профилировать все потоки")
+    parser.add_argument("--output", default="stacks.txt",
+                        help="файл collapsed stacks для flamegraph")
+    parser.add_argument("-m", dest="module", action="store_true",
+                        help="target — имя модуля, а не путь к скрипту")
+    parser.add_argument("target", help="скрипт или модуль с нагрузкой")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="аргументы нагрузки")
+    args = parser.parse_args(argv)
+
+    saved_argv = sys.argv
+    sys.argv = [args.target] + args.args
+    exit_code = None
+    try:
+        with profile(args.mode, args.interval, args.output, args.all_threads) as result:
+            try:
+                if args.module:
+                    runpy.run_module(args.target, run_name="__main__", alter_sys=True)
+                else:
+                    runpy.run_path(args.target, run_name="__main__")
+            except SystemExit as exc:
+                exit_code = exc.code
+    finally:
+        sys.argv = saved_argv
+    result.main_module = (args.target if args.module
+                          else os.path.splitext(os.path.basename(args.target))[0])
+    print(result.report())
+    print(f"Стеки: {args.output}")
+    # Код выхода нагрузки — после отчёта: профиль упавшего прогона тоже нужен.
+    if exit_code not in (None, 0):
+        sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Dict
-import uuid
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import threading
 
+from task_manager.ids import IdAllocator, SequentialIdAllocator
 from task_manager.models import Task, Project
 
 
@@ -25,6 +28,21 @@ class TaskRepository(ABC):
         """
         pass
 
+    def add_tasks(self, tasks: Iterable[Task]) -> List[int]:
+        """
+        Добавляет несколько задач и возвращает их ID.
+
+        Реализация по умолчанию вызывает add_task для каждой задачи;
+        хранилища могут переопределить её для вставки за один проход.
+
+        Args:
+            tasks (Iterable[Task]): Экземпляры задач.
+
+        Returns:
+            List[int]: Присвоенные ID в порядке следования задач.
+        """
+        return [self.add_task(task) for task in tasks]
+
     @abstractmethod
     def get_task(self, task_id: int) -> Task:
         """
@@ -38,6 +56,97 @@ class TaskRepository(ABC):
         """
         pass
 
+    def update_task(self, task: Task) -> None:
+        """
+        Сохраняет изменения уже добавленной задачи.
+
+        Вызывается после изменения полей задачи (например, в track_time),
+        чтобы хранилище могло обновить индексы или записать данные.
+        Реализация по умолчанию только проверяет, что задача есть: она
+        подходит хранилищам, у которых get_task возвращает сам хранимый
+        объект; остальные должны её переопределить.
+
+        Args:
+            task (Task): Изменённая задача с заполненным id.
+        """
+        self.get_task(task.id)
+
+    def list_by_project(self, project_id: int) -> List[Task]:
+        """
+        Возвращает задачи проекта.
+
+        Реализация по умолчанию перебирает iter_tasks.
+
+        Args:
+            project_id (int): Идентификатор проекта.
+
+        Returns:
+            List[Task]: Задачи проекта в порядке добавления.
+        """
+        return [task for task in self.iter_tasks() if task.project_id == project_id]
+
+    def list_due_before(self, moment: datetime) -> List[Task]:
+        """
+        Возвращает задачи с дедлайном строго раньше указанного момента.
+
+        Реализация по умолчанию перебирает iter_tasks.
+
+        Args:
+            moment (datetime): Граница по дедлайну (не включительно).
+
+        Returns:
+            List[Task]: Задачи, упорядоченные по возрастанию дедлайна.
+        """
+        due = [task for task in self.iter_tasks() if task.deadline < moment]
+        due.sort(key=lambda task: (task.deadline, task.id))
+        return due
+
+    def list_overdue(self, now: Optional[datetime] = None) -> List[Task]:
+        """
+        Возвращает просроченные задачи.
+
+        Args:
+            now (Optional[datetime]): Текущий момент. По умолчанию datetime.now().
+
+        Returns:
+            List[Task]: Задачи, дедлайн которых уже прошёл.
+        """
+        return self.list_due_before(now if now is not None else datetime.now())
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """
+        Перебирает все задачи репозитория (например, для снимка).
+
+        Returns:
+            Iterator[Task]: Задачи в порядке хранения.
+        """
+        raise NotImplementedError(f"{type(self).__name__} не поддерживает перебор задач.")
+
+    def restore_tasks(self, tasks: Iterable[Task]) -> None:
+        """
+        Вставляет задачи с уже присвоенными ID (восстановление из снимка
+        или журнала). Задача с существующим ID заменяется; новые ID,
+        выдаваемые после восстановления, больше восстановленных.
+
+        Реализация по умолчанию заменяет существующие задачи через
+        update_task, а новые добавляет через add_task. Поэтому новые ID
+        должны совпасть с выданными хранилищем: так бывает при
+        восстановлении по возрастанию ID в хранилище с последовательными
+        ID. Иначе — ValueError.
+
+        Args:
+            tasks (Iterable[Task]): Задачи с заполненным id.
+        """
+        for task in tasks:
+            task_id = task.id
+            try:
+                self.get_task(task_id)
+            except KeyError:
+                if self.add_task(task) != task_id:
+                    raise ValueError(f"Хранилище выдало задаче {task_id} другой ID.")
+            else:
+                self.update_task(task)
+
     @abstractmethod
     def clear(self):
         """
@@ -79,6 +188,38 @@ class ProjectRepository(ABC):
         """
         pass
 
+    def iter_projects(self) -> Iterator[Project]:
+        """
+        Перебирает все проекты репозитория (например, для снимка).
+
+        Returns:
+            Iterator[Project]: Проекты в порядке хранения.
+        """
+        raise NotImplementedError(f"{type(self).__name__} не поддерживает перебор проектов.")
+
+    def restore_projects(self, projects: Iterable[Project]) -> None:
+        """
+        Вставляет проекты с уже присвоенными ID (восстановление из снимка
+        или журнала). Проект с существующим ID заменяется.
+
+        Реализация по умолчанию копирует поля в объект, который вернул
+        get_project. Новые проекты она добавляет через add_project, и их
+        ID должны совпасть с выданными хранилищем (см.
+        TaskRepository.restore_tasks).
+
+        Args:
+            projects (Iterable[Project]): Проекты с заполненным id.
+        """
+        for project in projects:
+            project_id = project.id
+            try:
+                existing = self.get_project(project_id)
+            except KeyError:
+                if self.add_project(project) != project_id:
+                    raise ValueError(f"Хранилище выдало проекту {project_id} другой ID.")
+            else:
+                existing.name, existing.deadline = project.name, project.deadline
+
     @abstractmethod
     def clear(self):
         """
@@ -87,27 +228,157 @@ class ProjectRepository(ABC):
         pass
 
 
+class _TaskIndex:
+    """
+    Вторичные индексы задач: project_id -> id задач и отсортированный
+    список (дедлайн, id) для выборок по диапазону дедлайнов.
+
+    Ключ дедлайна может быть любым сравнимым значением
+    (datetime или, например, число микросекунд).
+    """
+
+    def __init__(self):
+        self._by_project: Dict[int, List[int]] = {}
+        self._by_deadline: List[Tuple[object, int]] = []
+        self._keys: Dict[int, Tuple[int, object]] = {}
+
+    def add(self, task_id: int, project_id: int, deadline) -> None:
+        self._keys[task_id] = (project_id, deadline)
+        self._by_project.setdefault(project_id, []).append(task_id)
+        insort(self._by_deadline, (deadline, task_id))
+
+    def add_many(self, entries: Iterable[Tuple[int, int, object]]) -> None:
+        """Добавляет записи (id, project_id, дедлайн) с одной сортировкой в конце."""
+        by_project = self._by_project
+        by_deadline = self._by_deadline
+        keys = self._keys
+        for task_id, project_id, deadline in entries:
+            keys[task_id] = (project_id, deadline)
+            ids = by_project.get(project_id)
+            if ids is None:
+                by_project[project_id] = [task_id]
+            else:
+                ids.append(task_id)
+            by_deadline.append((deadline, task_id))
+        by_deadline.sort()
+
+    def update(self, task_id: int, project_id: int, deadline) -> None:
+        old_project_id, old_deadline = self._keys[task_id]
+        if old_project_id == project_id and old_deadline == deadline:
+            return
+        if old_project_id != project_id:
+            ids = self._by_project[old_project_id]
+            ids.remove(task_id)
+            if not ids:
+                del self._by_project[old_project_id]
+            self._by_project.setdefault(project_id, []).append(task_id)
+        if old_deadline != deadline:
+            pos = bisect_left(self._by_deadline, (old_deadline, task_id))
+            del self._by_deadline[pos]
+            insort(self._by_deadline, (deadline, task_id))
+        self._keys[task_id] = (project_id, deadline)
+
+    def by_project(self, project_id: int) -> List[int]:
+        return list(self._by_project.get(project_id, ()))
+
+    def due_before(self, deadline) -> List[int]:
+        end = bisect_left(self._by_deadline, (deadline,))
+        return [task_id for _, task_id in self._by_deadline[:end]]
+
+    def clear(self) -> None:
+        self._by_project.clear()
+        self._by_deadline.clear()
+        self._keys.clear()
+
+
 class InMemoryTaskRepository(TaskRepository):
     """
     Реализация TaskRepository в оперативной памяти.
+
+    Поддерживает вторичные индексы по проекту и дедлайну, поэтому
+    list_by_project и list_due_before не просматривают все задачи.
+    Изменения и выборки по индексам выполняются под общей блокировкой,
+    так что хранилище можно использовать из нескольких потоков.
     """
 
-    def __init__(self):
+    def __init__(self, id_allocator: Optional[IdAllocator] = None):
+        """
+        Args:
+            id_allocator (Optional[IdAllocator]): Генератор ID задач.
+                По умолчанию — последовательный счётчик с 1.
+        """
         self._tasks: Dict[int, Task] = {}
+        self._index = _TaskIndex()
+        self._ids = id_allocator if id_allocator is not None else SequentialIdAllocator()
+        self._lock = threading.RLock()
 
     def add_task(self, task: Task) -> int:
-        new_id = uuid.uuid4().int
+        new_id = self._ids.next_id()
         task.id = new_id
-        self._tasks[new_id] = task
+        with self._lock:
+            self._tasks[new_id] = task
+            self._index.add(new_id, task.project_id, task.deadline)
         return new_id
 
+    def add_tasks(self, tasks: Iterable[Task]) -> List[int]:
+        tasks = list(tasks)
+        new_ids = list(self._ids.reserve(len(tasks)))
+        for new_id, task in zip(new_ids, tasks):
+            task.id = new_id
+        with self._lock:
+            store = self._tasks
+            for task in tasks:
+                store[task.id] = task
+            self._index.add_many(
+                (task.id, task.project_id, task.deadline) for task in tasks
+            )
+        return new_ids
+
     def get_task(self, task_id: int) -> Task:
         if task_id not in self._tasks:
             raise KeyError(f"Задача с id={task_id} не найдена.")
         return self._tasks[task_id]
 
+    def update_task(self, task: Task) -> None:
+        with self._lock:
+            if task.id not in self._tasks:
+                raise KeyError(f"Задача с id={task.id} не найдена.")
+            self._tasks[task.id] = task
+            self._index.update(task.id, task.project_id, task.deadline)
+
+    def list_by_project(self, project_id: int) -> List[Task]:
+        with self._lock:
+            return [self._tasks[task_id] for task_id in self._index.by_project(project_id)]
+
+    def list_due_before(self, moment: datetime) -> List[Task]:
+        with self._lock:
+            return [self._tasks[task_id] for task_id in self._index.due_before(moment)]
+
+    def iter_tasks(self) -> Iterator[Task]:
+        with self._lock:
+            tasks = list(self._tasks.values())
+        return iter(tasks)
+
+    def restore_tasks(self, tasks: Iterable[Task]) -> None:
+        tasks = list(tasks)
+        if not tasks:
+            return
+        with self._lock:
+            store = self._tasks
+            fresh = []
+            for task in tasks:
+                if task.id in store:
+                    self._index.update(task.id, task.project_id, task.deadline)
+                else:
+                    fresh.append(task)
+                store[task.id] = task
+            self._index.add_many((t.id, t.project_id, t.deadline) for t in fresh)
+        self._ids.advance_past(max(task.id for task in tasks))
+
     def clear(self):
-        self._tasks.clear()
+        with self._lock:
+            self._tasks.clear()
+            self._index.clear()
 
 
 class InMemoryProjectRepository(ProjectRepository):
@@ -115,11 +386,17 @@ class InMemoryProjectRepository(ProjectRepository):
     Реализация ProjectRepository в оперативной памяти.
     """
 
-    def __init__(self):
+    def __init__(self, id_allocator: Optional[IdAllocator] = None):
+        """
+        Args:
+            id_allocator (Optional[IdAllocator]): Генератор ID проектов.
+                По умолчанию — последовательный счётчик с 1.
+        """
         self._projects: Dict[int, Project] = {}
+        self._ids = id_allocator if id_allocator is not None else SequentialIdAllocator()
 
     def add_project(self, project: Project) -> int:
-        new_id = uuid.uuid4().int
+        new_id = self._ids.next_id()
         project.id = new_id
         self._projects[new_id] = project
         return new_id
@@ -129,5 +406,16 @@ class InMemoryProjectRepository(ProjectRepository):
             raise KeyError(f"Проект с id={project_id} не найден.")
         return self._projects[project_id]
 
+    def iter_projects(self) -> Iterator[Project]:
+        return iter(list(self._projects.values()))
+
+    def restore_projects(self, projects: Iterable[Project]) -> None:
+        projects = list(projects)
+        if not projects:
+            return
+        for project in projects:
+            self._projects[project.id] = project
+        self._ids.advance_past(max(project.id for project in projects))
+
     def clear(self):
         self._projects.clear()
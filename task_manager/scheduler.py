@@ -0,0 +1,167 @@
+from dataclasses import dataclass
+from datetime import datetime
+from heapq import heapify, heappop, heappush
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import itertools
+import threading
+
+from task_manager.models import Project, Task
+from task_manager.notifications import NotificationService
+
+
+@dataclass(frozen=True)
+class OverdueItem:
+    """
+    Элемент, дедлайн которого наступил.
+
+    Атрибуты:
+        kind (str): "task" или "project".
+        item_id (int): ID задачи или проекта.
+        title (str): Название задачи или проекта.
+        deadline (datetime): Наступивший дедлайн.
+    """
+    kind: str
+    item_id: int
+    title: str
+    deadline: datetime
+
+
+class DeadlineScheduler:
+    """
+    Планировщик дедлайнов на min-куче.
+
+    Хранит задачи и проекты в куче по дедлайну; pop_newly_overdue(now)
+    извлекает только те, чей дедлайн прошёл с прошлого вызова, за O(k log n)
+    вместо просмотра всех проектов. Повторное планирование того же элемента
+    заменяет прежний дедлайн (старая запись в куче пропускается лениво);
+    когда устаревших записей становится больше половины, куча
+    перестраивается, поэтому частые переносы не раздувают её.
+    """
+
+    TASK = "task"
+    PROJECT = "project"
+    # Меньшие кучи не перестраиваются: это дешевле, чем пропуск записей.
+    COMPACT_MIN_SIZE = 64
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, str, int, str]] = []
+        # Актуальная запись (дедлайн, порядковый номер) по ключу (kind, id).
+        self._live: Dict[Tuple[str, int], Tuple[datetime, int]] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def schedule(self, kind: str, item_id: int, title: str, deadline: datetime) -> None:
+        """
+        Ставит элемент в расписание или переносит его дедлайн.
+
+        Args:
+            kind (str): DeadlineScheduler.TASK или DeadlineScheduler.PROJECT.
+            item_id (int): ID элемента.
+            title (str): Название для уведомлений.
+            deadline (datetime): Дедлайн.
+        """
+        with self._lock:
+            seq = next(self._counter)
+            self._live[(kind, item_id)] = (deadline, seq)
+            heappush(self._heap, (deadline, seq, kind, item_id, title))
+            self._compact_if_stale()
+
+    def schedule_task(self, task: Task) -> None:
+        """Ставит задачу (с уже присвоенным id) в расписание."""
+        self.schedule(self.TASK, task.id, task.title, task.deadline)
+
+    def schedule_project(self, project: Project) -> None:
+        """Ставит проект в расписание; проект без дедлайна снимается с него."""
+        if project.deadline is None:
+            self.cancel(self.PROJECT, project.id)
+        else:
+            self.schedule(self.PROJECT, project.id, project.name, project.deadline)
+
+    def cancel(self, kind: str, item_id: int) -> None:
+        """Снимает элемент с расписания (например, задача завершена)."""
+        with self._lock:
+            self._live.pop((kind, item_id), None)
+            self._compact_if_stale()
+
+    def next_deadline(self) -> Optional[datetime]:
+        """Ближайший дедлайн в расписании или None, если оно пусто."""
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_newly_overdue(self, now: Optional[datetime] = None) -> List[OverdueItem]:
+        """
+        Извлекает элементы, дедлайн которых прошёл к моменту now.
+
+        Каждый элемент возвращается один раз: после извлечения он
+        снимается с расписания.
+
+        Args:
+            now (Optional[datetime]): Текущий момент. По умолчанию datetime.now().
+
+        Returns:
+            List[OverdueItem]: Просроченные элементы в порядке дедлайнов.
+        """
+        if now is None:
+            now = datetime.now()
+        overdue = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] < now:
+                deadline, seq, kind, item_id, title = heappop(heap)
+                if self._live.get((kind, item_id)) != (deadline, seq):
+                    continue
+                del self._live[(kind, item_id)]
+                overdue.append(OverdueItem(kind, item_id, title, deadline))
+        return overdue
+
+    def notify_overdue(self, notification_service: NotificationService,
+                       recipients: Callable[[OverdueItem], Iterable[str]],
+                       now: Optional[datetime] = None) -> List[Tuple[OverdueItem, str, bool]]:
+        """
+        Отправляет уведомления только по элементам, просроченным с прошлого вызова.
+
+        Письма уходят одним пакетом через send_task_notifications; статус
+        в письме считается относительно того же now.
+
+        Args:
+            notification_service (NotificationService): Сервис отправки.
+            recipients (Callable[[OverdueItem], Iterable[str]]): Адресаты элемента.
+            now (Optional[datetime]): Текущий момент. По умолчанию datetime.now().
+
+        Returns:
+            List[Tuple[OverdueItem, str, bool]]: (элемент, email, результат отправки).
+        """
+        if now is None:
+            now = datetime.now()
+        targets = []
+        notifications = []
+        for item in self.pop_newly_overdue(now):
+            task_info = {"title": item.title, "deadline": item.deadline, "completed": False}
+            for email in recipients(item):
+                targets.append((item, email))
+                notifications.append((email, task_info))
+        if not notifications:
+            return []
+        results = notification_service.send_task_notifications(notifications, now=now)
+        return [(item, email, ok) for (item, email), ok in zip(targets, results)]
+
+    def _drop_stale(self) -> None:
+        heap = self._heap
+        while heap:
+            deadline, seq, kind, item_id, _ = heap[0]
+            if self._live.get((kind, item_id)) == (deadline, seq):
+                return
+            heappop(heap)
+
+    def _compact_if_stale(self) -> None:
+        """Перестраивает кучу без устаревших записей, если их больше половины."""
+        heap = self._heap
+        if len(heap) < self.COMPACT_MIN_SIZE or len(heap) <= 2 * len(self._live):
+            return
+        live = self._live
+        heap[:] = [entry for entry in heap if live.get((entry[2], entry[3])) == entry[:2]]
+        heapify(heap)
@@ -1,17 +1,69 @@
-from datetime import datetime
-from task_manager.models import Task
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import repeat
+from numbers import Real
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from task_manager.concurrency import StripedLock
+from task_manager.ledger import TimeLedger
+from task_manager.models import Task, validate_task_columns
 from task_manager.repositories import TaskRepository, ProjectRepository
+from task_manager.scheduler import DeadlineScheduler
+
+try:
+    import numpy as np
+except ImportError:  # numpy необязателен: без него пакетный расчёт идёт циклом
+    np = None
+
+# Виды dtype numpy, которые считаются числами: bool, int, uint, float.
+_NUMERIC_KINDS = "biuf"
+
+
+@dataclass
+class BulkCreateResult:
+    """
+    Результат пакетного создания задач.
+
+    Атрибуты:
+        ids (List[Optional[int]]): ID созданных задач по позициям входных строк;
+            None для строк, которые не прошли проверку.
+        errors (Dict[int, Exception]): Ошибки по номерам строк (с нуля).
+    """
+    ids: List[Optional[int]] = field(default_factory=list)
+    errors: Dict[int, Exception] = field(default_factory=dict)
+
+    @property
+    def created_ids(self) -> List[int]:
+        """ID только успешно созданных задач."""
+        return [task_id for task_id in self.ids if task_id is not None]
+
 
 class TaskService:
     """
     Сервис для операций над задачами:
     - create_task
+    - create_tasks
     - track_time
     - check_project_deadline
     """
-    def __init__(self, task_repo: TaskRepository, project_repo: ProjectRepository):
+    def __init__(self, task_repo: TaskRepository, project_repo: ProjectRepository,
+                 scheduler: Optional[DeadlineScheduler] = None, lock_stripes: int = 64,
+                 ledger: Optional[TimeLedger] = None):
+        """
+        Args:
+            task_repo (TaskRepository): Хранилище задач.
+            project_repo (ProjectRepository): Хранилище проектов.
+            scheduler (Optional[DeadlineScheduler]): Планировщик дедлайнов;
+                если задан, новые задачи ставятся в расписание.
+            lock_stripes (int): Число блокировок по ID задачи для track_time.
+                0 отключает блокировку (однопоточное использование).
+            ledger (Optional[TimeLedger]): Журнал учёта времени; если задан,
+                каждый вызов track_time добавляет в него запись.
+        """
         self._task_repo = task_repo
         self._project_repo = project_repo
+        self._scheduler = scheduler
+        self._task_locks = StripedLock(lock_stripes)
+        self._ledger = ledger
 
     def create_task(self, project_id: int, title: str, deadline: datetime) -> int:
         """
@@ -28,22 +80,95 @@ class TaskService:
         # Создаём объект Task (dataclass)
         new_task = Task(project_id=project_id, title=title, deadline=deadline)
         new_id = self._task_repo.add_task(new_task)
+        if self._scheduler is not None:
+            self._scheduler.schedule_task(new_task)
         return new_id
 
+    def create_tasks(self, rows: Iterable[Tuple[int, str, datetime]]) -> BulkCreateResult:
+        """
+        Создаёт задачи пакетом из строк (project_id, title, deadline).
+
+        Время читается один раз на весь пакет, каждый проект проверяется
+        один раз, поля проверяются по колонкам (validate_task_columns),
+        а корректные задачи добавляются в хранилище одним вызовом add_tasks.
+        Ошибочные строки не прерывают пакет и попадают в errors.
+        """
+        now = datetime.now()
+        known_projects: Dict[int, bool] = {}
+        result = BulkCreateResult()
+        project_ids: List[int] = []
+        titles: List[str] = []
+        deadlines: List[datetime] = []
+        positions: List[int] = []
+
+        for row_no, row in enumerate(rows):
+            result.ids.append(None)
+            try:
+                project_id, title, deadline = row
+                if deadline < now:
+                    raise ValueError("Нельзя задать дедлайн в прошлом.")
+                exists = known_projects.get(project_id)
+                if exists is None:
+                    try:
+                        self._project_repo.get_project(project_id)
+                        exists = True
+                    except KeyError:
+                        exists = False
+                    known_projects[project_id] = exists
+                if not exists:
+                    raise ValueError(f"Проект с id={project_id} не найден.")
+            except (TypeError, ValueError) as exc:
+                result.errors[row_no] = exc
+                continue
+            project_ids.append(project_id)
+            titles.append(title)
+            deadlines.append(deadline)
+            positions.append(row_no)
+
+        # Поля проверяются по колонкам, задачи создаются без повторной проверки.
+        invalid = validate_task_columns(project_ids, titles, deadlines)
+        for index, exc in invalid.items():
+            result.errors[positions[index]] = exc
+        if invalid:
+            keep = [index for index in range(len(positions)) if index not in invalid]
+            positions = [positions[index] for index in keep]
+            project_ids = [project_ids[index] for index in keep]
+            titles = [titles[index] for index in keep]
+            deadlines = [deadlines[index] for index in keep]
+        tasks = Task.from_rows(
+            zip(repeat(None), project_ids, titles, deadlines, repeat(0.0))
+        )
+        result.errors = dict(sorted(result.errors.items()))
+
+        if tasks:
+            new_ids = self._task_repo.add_tasks(tasks)
+            for row_no, new_id in zip(positions, new_ids):
+                result.ids[row_no] = new_id
+            if self._scheduler is not None:
+                for task in tasks:
+                    self._scheduler.schedule_task(task)
+        return result
+
     def track_time(self, task_id: int, hours: float) -> float:
         """
         Добавляет указанное число часов к задаче.
         Возвращает итоговое значение hours_spent по задаче.
+        Чтение-изменение-запись выполняется под блокировкой задачи,
+        поэтому параллельные вызовы не теряют часы.
         """
         if hours <= 0:
             raise ValueError("Нельзя добавить неположительное число часов.")
-        # Проверяем, есть ли такая задача
-        try:
-            task = self._task_repo.get_task(task_id)
-        except KeyError:
-            raise ValueError(f"Задача с id={task_id} не найдена.")
-        task.hours_spent += hours
-        return task.hours_spent
+        with self._task_locks.for_key(task_id):
+            # Проверяем, есть ли такая задача
+            try:
+                task = self._task_repo.get_task(task_id)
+            except KeyError:
+                raise ValueError(f"Задача с id={task_id} не найдена.")
+            task.hours_spent += hours
+            self._task_repo.update_task(task)
+            if self._ledger is not None:
+                self._ledger.record(task_id, task.project_id, hours)
+            return task.hours_spent
 
     def check_project_deadline(self, project_id: int) -> bool:
         """
@@ -59,9 +184,39 @@ class TaskService:
         return datetime.now() > project.deadline
 
 
+@dataclass
+class InvoiceBatch:
+    """
+    Результат пакетного расчёта счетов.
+
+    Атрибуты:
+        amounts: Суммы по строкам (numpy.ndarray, если установлен numpy, иначе list).
+        totals (Dict[str, float]): Итоговые суммы по валютам.
+    """
+    amounts: Sequence[float]
+    totals: Dict[str, float]
+
+
+class InvoiceBatchError(ValueError):
+    """
+    Ошибка пакетного расчёта: содержит все некорректные строки сразу.
+
+    Атрибуты:
+        errors (Dict[int, str]): Сообщения об ошибках по номерам строк.
+    """
+
+    def __init__(self, errors: Dict[int, str]):
+        self.errors = errors
+        super().__init__(f"Некорректных строк: {len(errors)}.")
+
+    def __reduce__(self):
+        # Для передачи между процессами (pickle) восстанавливаем из errors.
+        return type(self), (self.errors,)
+
+
 class InvoiceService:
     """
-    Сервис для расчёта счета (calculate_invoice).
+    Сервис для расчёта счета (calculate_invoice, calculate_invoices).
     Фиктивно поддерживает список валют, а фактический расчёт — hours * rate.
     """
     SUPPORTED_CURRENCIES = {"USD", "EUR", "GBP", "RUB"}
@@ -78,3 +233,105 @@ class InvoiceService:
         if currency not in self.SUPPORTED_CURRENCIES:
             raise ValueError(f"Валюта {currency} не поддерживается.")
         return hours * rate
+
+    def calculate_invoices(self, hours: Sequence[float], rates: Sequence[float],
+                           currencies: Sequence[str]) -> InvoiceBatch:
+        """
+        Пакетный расчёт: hours[i] * rates[i] для каждой строки и итоги по валютам.
+        Принимает последовательности или массивы numpy одинаковой длины.
+        Проверки выполняются для всех строк сразу; при наличии ошибок бросает
+        InvoiceBatchError со всеми некорректными строками (в том числе
+        с нечисловыми часами или ставкой) — с numpy и без него одинаково.
+        """
+        if not len(hours) == len(rates) == len(currencies):
+            raise ValueError("hours, rates и currencies должны быть одной длины.")
+        if np is None:
+            return self._calculate_invoices_python(hours, rates, currencies)
+
+        hours_arr = np.asarray(hours)
+        rates_arr = np.asarray(rates)
+        if hours_arr.dtype.kind not in _NUMERIC_KINDS or rates_arr.dtype.kind not in _NUMERIC_KINDS:
+            # Нечисловые значения (строки, None): строки с ошибками
+            # собирает построчная реализация — так же, как без numpy.
+            return self._calculate_invoices_python(hours, rates, currencies)
+        hours_arr = hours_arr.astype(float, copy=False)
+        rates_arr = rates_arr.astype(float, copy=False)
+        currency_arr = np.asarray(currencies, dtype=str)
+        if hours_arr.ndim != 1 or rates_arr.ndim != 1 or currency_arr.ndim != 1:
+            raise ValueError("Ожидаются одномерные последовательности.")
+
+        bad_hours = hours_arr < 0
+        bad_rates = rates_arr < 0
+        bad_currency = ~np.isin(currency_arr, sorted(self.SUPPORTED_CURRENCIES))
+        invalid = bad_hours | bad_rates | bad_currency
+        if invalid.any():
+            errors = {}
+            for row in np.flatnonzero(invalid).tolist():
+                errors[row] = self._row_error(
+                    bad_hours[row], bad_rates[row], bad_currency[row], currency_arr[row]
+                )
+            raise InvoiceBatchError(errors)
+
+        amounts = hours_arr * rates_arr
+        codes, inverse = np.unique(currency_arr, return_inverse=True)
+        sums = np.bincount(inverse, weights=amounts, minlength=len(codes))
+        totals = dict(zip(codes.tolist(), sums.tolist()))
+        return InvoiceBatch(amounts=amounts, totals=totals)
+
+    def _calculate_invoices_python(self, hours, rates, currencies) -> InvoiceBatch:
+        """Реализация calculate_invoices без numpy."""
+        errors = {}
+        amounts = []
+        totals: Dict[str, float] = {}
+        for row, (row_hours, rate, currency) in enumerate(zip(hours, rates, currencies)):
+            if not isinstance(row_hours, Real):
+                errors[row] = "Количество часов должно быть числом."
+                continue
+            if not isinstance(rate, Real):
+                errors[row] = "Ставка (rate) должна быть числом."
+                continue
+            bad_currency = not isinstance(currency, str) or currency not in self.SUPPORTED_CURRENCIES
+            if row_hours < 0 or rate < 0 or bad_currency:
+                errors[row] = self._row_error(row_hours < 0, rate < 0, bad_currency, currency)
+                continue
+            amount = row_hours * rate
+            amounts.append(amount)
+            totals[currency] = totals.get(currency, 0.0) + amount
+        if errors:
+            raise InvoiceBatchError(errors)
+        return InvoiceBatch(amounts=amounts, totals=totals)
+
+    @staticmethod
+    def _row_error(bad_hours: bool, bad_rate: bool, bad_currency: bool, currency: str) -> str:
+        """Сообщение об ошибке строки — то же, что бросает calculate_invoice."""
+        if bad_hours:
+            return "Количество часов не может быть отрицательным."
+        if bad_rate:
+            return "Ставка (rate) не может быть отрицательной."
+        return f"Валюта {currency} не поддерживается."
+
+    def invoice_from_ledger(self, ledger: TimeLedger, project_id: int, rate: float,
+                            currency: str, start: Optional[date] = None,
+                            end: Optional[date] = None) -> float:
+        """
+        Рассчитывает счёт проекта по итогам журнала учёта времени
+        за период [start, end] без просмотра отдельных записей.
+        """
+        return self.calculate_invoice(
+            ledger.hours_for_project(project_id, start, end), rate, currency
+        )
+
+    def invoices_from_ledger(self, ledger: TimeLedger,
+                             billing: Mapping[int, Tuple[float, str]],
+                             start: Optional[date] = None,
+                             end: Optional[date] = None) -> InvoiceBatch:
+        """
+        Пакетный расчёт счетов по журналу: billing задаёт (rate, currency)
+        для каждого ID проекта. Суммы возвращаются в порядке billing.
+        """
+        project_ids = list(billing)
+        return self.calculate_invoices(
+            [ledger.hours_for_project(pid, start, end) for pid in project_ids],
+            [billing[pid][0] for pid in project_ids],
+            [billing[pid][1] for pid in project_ids],
+        )
@@ -0,0 +1,280 @@
+"""
+Снимки in-memory репозиториев в компактном бинарном формате.
+
+Файл снимка задач:
+    заголовок  — сигнатура (8 байт) и число записей (uint64, little-endian);
+    колонки    — ids, project_ids, дедлайны (микросекунды от эпохи) — int64,
+                 hours_spent — float64;
+    названия   — смещения (int64, записей + 1) и UTF-8 блок названий подряд.
+
+Снимок проектов устроен так же: ids, дедлайны (NO_DEADLINE для None),
+смещения и блок имён.
+
+Колонки читаются целиком через array.frombytes, без разбора записей
+по одной; объекты создаются через Task.from_rows / Project.from_rows
+без повторной проверки: снимок считается доверенными данными.
+Названия декодируются лениво, при первом обращении.
+"""
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple
+import os
+import struct
+import sys
+
+from task_manager.columnar import ColumnarTaskRepository
+from task_manager.models import Project, Task, datetime_to_micros, micros_to_datetime
+from task_manager.repositories import (
+    InMemoryProjectRepository,
+    ProjectRepository,
+    TaskRepository,
+)
+
+TASKS_MAGIC = b"TMTASKS1"
+PROJECTS_MAGIC = b"TMPROJS1"
+NO_DEADLINE = -(2 ** 63)
+
+_HEADER = struct.Struct("<8sQ")
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+class LazyTitles:
+    """
+    Последовательность строк из UTF-8 блока и смещений;
+    строка декодируется при первом обращении и кэшируется.
+
+    Поддерживает append и присваивание, поэтому подходит как колонка
+    названий для ColumnarTaskRepository.
+    """
+
+    __slots__ = ("_blob", "_offsets", "_decoded", "_count", "_extra")
+
+    def __init__(self, blob: bytes, offsets: array):
+        self._blob = blob
+        self._offsets = offsets
+        self._count = len(offsets) - 1
+        self._decoded = {}
+        self._extra: List[str] = []
+
+    def __len__(self) -> int:
+        return self._count + len(self._extra)
+
+    def __getitem__(self, row: int) -> str:
+        if row < 0:
+            row += len(self)
+        if row >= self._count:
+            return self._extra[row - self._count]
+        title = self._decoded.get(row)
+        if title is None:
+            raw = self._blob[self._offsets[row]:self._offsets[row + 1]]
+            title = self._decoded[row] = sys.intern(raw.decode("utf-8"))
+        return title
+
+    def __setitem__(self, row: int, value: str) -> None:
+        if row < 0:
+            row += len(self)
+        if row >= self._count:
+            self._extra[row - self._count] = value
+        else:
+            self._decoded[row] = value
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+    def append(self, value: str) -> None:
+        self._extra.append(value)
+
+    def to_list(self) -> List[str]:
+        """
+        Декодирует все строки сразу; одинаковые строки разделяют один объект.
+
+        Returns:
+            List[str]: Все строки по порядку.
+        """
+        blob, offsets, decoded = self._blob, self._offsets, self._decoded
+        cache = {}
+        result = []
+        for row in range(self._count):
+            title = decoded.get(row)
+            if title is None:
+                raw = blob[offsets[row]:offsets[row + 1]]
+                title = cache.get(raw)
+                if title is None:
+                    title = cache[raw] = raw.decode("utf-8")
+            result.append(title)
+        result.extend(self._extra)
+        return result
+
+
+def _encode_strings(values: Iterable[str]) -> Tuple[array, bytes]:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = array("q", [0])
+    position = 0
+    for chunk in encoded:
+        position += len(chunk)
+        offsets.append(position)
+    return offsets, b"".join(encoded)
+
+
+def _write(path: str, magic: bytes, count: int, columns: Sequence[array], blob: bytes) -> None:
+    """Пишет снимок во временный файл и атомарно заменяет им path."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(magic, count))
+        for column in columns:
+            if _BIG_ENDIAN:
+                column = array(column.typecode, column)
+                column.byteswap()
+            column.tofile(f)
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class _Reader:
+    """Последовательное чтение колонок из содержимого файла снимка."""
+
+    def __init__(self, data: bytes, magic: bytes):
+        if len(data) < _HEADER.size:
+            raise ValueError("Файл снимка повреждён: нет заголовка.")
+        found, self.count = _HEADER.unpack_from(data, 0)
+        if found != magic:
+            raise ValueError(f"Неизвестный формат снимка: {found!r}.")
+        self._view = memoryview(data)
+        self._position = _HEADER.size
+
+    def column(self, typecode: str, count: int) -> array:
+        column = array(typecode)
+        end = self._position + count * column.itemsize
+        if end > len(self._view):
+            raise ValueError("Файл снимка повреждён: данные обрезаны.")
+        column.frombytes(self._view[self._position:end])
+        if _BIG_ENDIAN:
+            column.byteswap()
+        self._position = end
+        return column
+
+    def blob(self, size: int) -> bytes:
+        end = self._position + size
+        if end > len(self._view):
+            raise ValueError("Файл снимка повреждён: данные обрезаны.")
+        blob = bytes(self._view[self._position:end])
+        self._position = end
+        return blob
+
+
+def save_tasks(repo: TaskRepository, path: str) -> int:
+    """
+    Сохраняет все задачи репозитория в файл снимка.
+
+    Args:
+        repo (TaskRepository): Репозиторий задач.
+        path (str): Путь к файлу снимка.
+
+    Returns:
+        int: Количество сохранённых задач.
+    """
+    if isinstance(repo, ColumnarTaskRepository):
+        ids, project_ids, deadlines, hours, titles = repo.export_columns()
+    else:
+        ids, project_ids, deadlines, hours = array("q"), array("q"), array("q"), array("d")
+        titles = []
+        for task in repo.iter_tasks():
+            ids.append(task.id)
+            project_ids.append(task.project_id)
+            deadlines.append(datetime_to_micros(task.deadline))
+            hours.append(task.hours_spent)
+            titles.append(task.title)
+    offsets, blob = _encode_strings(titles)
+    _write(path, TASKS_MAGIC, len(ids), (ids, project_ids, deadlines, hours, offsets), blob)
+    return len(ids)
+
+
+def load_tasks(path: str, repo: Optional[TaskRepository] = None) -> TaskRepository:
+    """
+    Загружает снимок задач.
+
+    Без repo (или в ColumnarTaskRepository) колонки подставляются напрямую —
+    это самый быстрый путь. В остальные репозитории задачи передаются
+    через restore_tasks как Task, созданные без повторной проверки.
+
+    Args:
+        path (str): Путь к файлу снимка.
+        repo (Optional[TaskRepository]): Куда загрузить. По умолчанию —
+            новый ColumnarTaskRepository.
+
+    Returns:
+        TaskRepository: Репозиторий с загруженными задачами.
+    """
+    with open(path, "rb") as f:
+        reader = _Reader(f.read(), TASKS_MAGIC)
+    count = reader.count
+    ids = reader.column("q", count)
+    project_ids = reader.column("q", count)
+    deadlines = reader.column("q", count)
+    hours = reader.column("d", count)
+    offsets = reader.column("q", count + 1)
+    titles = LazyTitles(reader.blob(offsets[-1]), offsets)
+
+    if repo is None:
+        repo = ColumnarTaskRepository()
+    if isinstance(repo, ColumnarTaskRepository):
+        repo.restore_columns(ids, project_ids, deadlines, hours, titles)
+    else:
+        repo.restore_tasks(Task.from_rows(zip(
+            ids, project_ids, titles.to_list(), map(micros_to_datetime, deadlines), hours,
+        )))
+    return repo
+
+
+def save_projects(repo: ProjectRepository, path: str) -> int:
+    """
+    Сохраняет все проекты репозитория в файл снимка.
+
+    Args:
+        repo (ProjectRepository): Репозиторий проектов.
+        path (str): Путь к файлу снимка.
+
+    Returns:
+        int: Количество сохранённых проектов.
+    """
+    ids, deadlines, names = array("q"), array("q"), []
+    for project in repo.iter_projects():
+        ids.append(project.id)
+        deadlines.append(
+            NO_DEADLINE if project.deadline is None else datetime_to_micros(project.deadline)
+        )
+        names.append(project.name)
+    offsets, blob = _encode_strings(names)
+    _write(path, PROJECTS_MAGIC, len(ids), (ids, deadlines, offsets), blob)
+    return len(ids)
+
+
+def load_projects(path: str, repo: Optional[ProjectRepository] = None) -> ProjectRepository:
+    """
+    Загружает снимок проектов через restore_projects.
+
+    Args:
+        path (str): Путь к файлу снимка.
+        repo (Optional[ProjectRepository]): Куда загрузить. По умолчанию —
+            новый InMemoryProjectRepository.
+
+    Returns:
+        ProjectRepository: Репозиторий с загруженными проектами.
+    """
+    with open(path, "rb") as f:
+        reader = _Reader(f.read(), PROJECTS_MAGIC)
+    count = reader.count
+    ids = reader.column("q", count)
+    deadlines = reader.column("q", count)
+    offsets = reader.column("q", count + 1)
+    names = LazyTitles(reader.blob(offsets[-1]), offsets)
+
+    if repo is None:
+        repo = InMemoryProjectRepository()
+    repo.restore_projects(Project.from_rows(zip(
+        ids, names.to_list(),
+        (None if deadline == NO_DEADLINE else micros_to_datetime(deadline)
+         for deadline in deadlines),
+    )))
+    return repo
@@ -0,0 +1,257 @@
+import sqlite3
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+import threading
+
+from task_manager.ids import IdAllocator, SequentialIdAllocator
+from task_manager.models import Project, Task, datetime_to_micros, micros_to_datetime
+from task_manager.repositories import ProjectRepository, TaskRepository
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    deadline INTEGER
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    deadline INTEGER NOT NULL,
+    hours_spent REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks (project_id, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_deadline ON tasks (deadline, id);
+"""
+
+# SQL-запросы — константы: sqlite3 кэширует подготовленные выражения
+# на соединении по тексту запроса, поэтому каждый компилируется один раз.
+_INSERT_TASK = (
+    "INSERT INTO tasks (id, project_id, title, deadline, hours_spent) VALUES (?, ?, ?, ?, ?)"
+)
+_SELECT_TASK = "SELECT id, project_id, title, deadline, hours_spent FROM tasks"
+_GET_TASK = _SELECT_TASK + " WHERE id = ?"
+_TASKS_BY_PROJECT = _SELECT_TASK + " WHERE project_id = ? ORDER BY id"
+_TASKS_DUE_BEFORE = _SELECT_TASK + " WHERE deadline < ? ORDER BY deadline, id"
+_UPDATE_TASK = (
+    "UPDATE tasks SET project_id = ?, title = ?, deadline = ?, hours_spent = ? WHERE id = ?"
+)
+# Полный перебор идёт страницами по ключу: в памяти одна страница,
+# блокировка соединения берётся только на чтение страницы.
+_TASKS_PAGE = _SELECT_TASK + " WHERE id > ? ORDER BY id LIMIT ?"
+_RESTORE_TASK = _INSERT_TASK.replace("INSERT", "INSERT OR REPLACE", 1)
+_INSERT_PROJECT = "INSERT INTO projects (id, name, deadline) VALUES (?, ?, ?)"
+_RESTORE_PROJECT = _INSERT_PROJECT.replace("INSERT", "INSERT OR REPLACE", 1)
+_SELECT_PROJECT = "SELECT id, name, deadline FROM projects"
+_GET_PROJECT = _SELECT_PROJECT + " WHERE id = ?"
+_PROJECTS_PAGE = _SELECT_PROJECT + " WHERE id > ? ORDER BY id LIMIT ?"
+PAGE_SIZE = 1000
+
+
+class _Connection(sqlite3.Connection):
+    """Соединение с общей блокировкой для всех репозиториев поверх него."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.RLock()
+
+
+def connect(path: str = ":memory:") -> sqlite3.Connection:
+    """
+    Открывает базу SQLite для репозиториев и создаёт схему.
+
+    Для файловой базы включается WAL-журнал и synchronous=NORMAL:
+    читатели не блокируют писателя, а fsync выполняется при checkpoint.
+    Соединение разрешено использовать из разных потоков; все репозитории
+    поверх него сериализуют обращения одной блокировкой соединения
+    (транзакции `with connection` общие для соединения).
+
+    Args:
+        path (str): Путь к файлу базы или ":memory:".
+
+    Returns:
+        sqlite3.Connection: Готовое соединение.
+    """
+    connection = sqlite3.connect(path, check_same_thread=False, factory=_Connection)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def _connection_lock(connection: sqlite3.Connection) -> threading.RLock:
+    lock = getattr(connection, "lock", None)
+    if lock is None:
+        raise TypeError("Соединение должно быть создано через connect().")
+    return lock
+
+
+def _next_free_id(connection: sqlite3.Connection, table: str) -> int:
+    (max_id,) = connection.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()
+    return max_id + 1
+
+
+def _iter_pages(connection: sqlite3.Connection, lock, query: str, convert) -> Iterator:
+    """Строки query страницами по PAGE_SIZE, по возрастанию id."""
+    last_id = 0
+    while True:
+        with lock:
+            rows = connection.execute(query, (last_id, PAGE_SIZE)).fetchall()
+        yield from map(convert, rows)
+        if len(rows) < PAGE_SIZE:
+            return
+        last_id = rows[-1][0]
+
+
+def _row_to_task(row) -> Task:
+    # Строки таблицы уже проверены при вставке.
+    task_id, project_id, title, deadline, hours_spent = row
+    return Task.from_trusted(task_id, project_id, title,
+                             micros_to_datetime(deadline), hours_spent)
+
+
+def _task_params(task: Task) -> tuple:
+    return (task.id, task.project_id, task.title,
+            datetime_to_micros(task.deadline), task.hours_spent)
+
+
+def _row_to_project(row) -> Project:
+    project_id, name, deadline = row
+    return Project.from_trusted(
+        project_id, name, None if deadline is None else micros_to_datetime(deadline)
+    )
+
+
+def _project_params(project: Project) -> tuple:
+    deadline = None if project.deadline is None else datetime_to_micros(project.deadline)
+    return (project.id, project.name, deadline)
+
+
+class SQLiteTaskRepository(TaskRepository):
+    """
+    Реализация TaskRepository поверх SQLite.
+
+    get_task и выборки возвращают новые объекты Task; изменения сохраняются
+    через update_task (TaskService.track_time вызывает его сам).
+    Дедлайны хранятся как микросекунды от эпохи (только наивные datetime).
+    """
+
+    def __init__(self, connection: sqlite3.Connection,
+                 id_allocator: Optional[IdAllocator] = None):
+        """
+        Args:
+            connection (sqlite3.Connection): Соединение, созданное через connect().
+            id_allocator (Optional[IdAllocator]): Генератор ID. По умолчанию —
+                последовательный счётчик, продолжающий максимальный ID в таблице.
+        """
+        self._conn = connection
+        self._lock = _connection_lock(connection)
+        self._ids = id_allocator if id_allocator is not None else SequentialIdAllocator(
+            _next_free_id(connection, "tasks")
+        )
+
+    def add_task(self, task: Task) -> int:
+        task.id = self._ids.next_id()
+        with self._lock, self._conn:
+            self._conn.execute(_INSERT_TASK, _task_params(task))
+        return task.id
+
+    def add_tasks(self, tasks: Iterable[Task]) -> List[int]:
+        tasks = list(tasks)
+        new_ids = list(self._ids.reserve(len(tasks)))
+        for new_id, task in zip(new_ids, tasks):
+            task.id = new_id
+        with self._lock, self._conn:
+            self._conn.executemany(_INSERT_TASK, [_task_params(task) for task in tasks])
+        return new_ids
+
+    def get_task(self, task_id: int) -> Task:
+        with self._lock:
+            row = self._conn.execute(_GET_TASK, (task_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Задача с id={task_id} не найдена.")
+        return _row_to_task(row)
+
+    def update_task(self, task: Task) -> None:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(_UPDATE_TASK, (
+                task.project_id, task.title, datetime_to_micros(task.deadline),
+                task.hours_spent, task.id,
+            ))
+        if cursor.rowcount == 0:
+            raise KeyError(f"Задача с id={task.id} не найдена.")
+
+    def list_by_project(self, project_id: int) -> List[Task]:
+        with self._lock:
+            rows = self._conn.execute(_TASKS_BY_PROJECT, (project_id,)).fetchall()
+        return [_row_to_task(row) for row in rows]
+
+    def list_due_before(self, moment: datetime) -> List[Task]:
+        with self._lock:
+            rows = self._conn.execute(
+                _TASKS_DUE_BEFORE, (datetime_to_micros(moment),)
+            ).fetchall()
+        return [_row_to_task(row) for row in rows]
+
+    def iter_tasks(self) -> Iterator[Task]:
+        return _iter_pages(self._conn, self._lock, _TASKS_PAGE, _row_to_task)
+
+    def restore_tasks(self, tasks: Iterable[Task]) -> None:
+        params = [_task_params(task) for task in tasks]
+        if not params:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(_RESTORE_TASK, params)
+        self._ids.advance_past(max(row[0] for row in params))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tasks")
+
+
+class SQLiteProjectRepository(ProjectRepository):
+    """
+    Реализация ProjectRepository поверх SQLite.
+    """
+
+    def __init__(self, connection: sqlite3.Connection,
+                 id_allocator: Optional[IdAllocator] = None):
+        """
+        Args:
+            connection (sqlite3.Connection): Соединение, созданное через connect().
+            id_allocator (Optional[IdAllocator]): Генератор ID. По умолчанию —
+                последовательный счётчик, продолжающий максимальный ID в таблице.
+        """
+        self._conn = connection
+        self._lock = _connection_lock(connection)
+        self._ids = id_allocator if id_allocator is not None else SequentialIdAllocator(
+            _next_free_id(connection, "projects")
+        )
+
+    def add_project(self, project: Project) -> int:
+        project.id = self._ids.next_id()
+        with self._lock, self._conn:
+            self._conn.execute(_INSERT_PROJECT, _project_params(project))
+        return project.id
+
+    def get_project(self, project_id: int) -> Project:
+        with self._lock:
+            row = self._conn.execute(_GET_PROJECT, (project_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Проект с id={project_id} не найден.")
+        return _row_to_project(row)
+
+    def iter_projects(self) -> Iterator[Project]:
+        return _iter_pages(self._conn, self._lock, _PROJECTS_PAGE, _row_to_project)
+
+    def restore_projects(self, projects: Iterable[Project]) -> None:
+        params = [_project_params(project) for project in projects]
+        if not params:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(_RESTORE_PROJECT, params)
+        self._ids.advance_past(max(row[0] for row in params))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM projects")
@@ -0,0 +1,495 @@
+"""
+Журнал упреждающей записи (WAL) для репозиториев.
+
+Обёртки WALTaskRepository и WALProjectRepository выполняют операцию
+во внутреннем репозитории и дописывают в журнал полное новое состояние
+записи. Повтор такой записи идемпотентен, поэтому восстановление —
+это загрузка снимка и повтор журнала поверх него через restore_*.
+
+Запись журнала: длина полезной нагрузки (uint32), CRC32 и сама нагрузка —
+код операции и поля. Оборванный или повреждённый хвост (сбой посреди
+записи) при восстановлении отбрасывается.
+
+fsync выполняет фоновый поток группами: одним fsync подтверждаются все
+записи, накопившиеся, пока шёл предыдущий. sync_interval добавляет окно
+сбора после первой несинхронизированной записи (его прерывает набор
+sync_batch записей) — это полезно при wait_for_sync=False или медленном
+диске.
+"""
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+import os
+import struct
+import threading
+import zlib
+
+from task_manager.models import Project, Task, datetime_to_micros, micros_to_datetime
+from task_manager.repositories import ProjectRepository, TaskRepository
+from task_manager.snapshot import (
+    NO_DEADLINE,
+    load_projects,
+    load_tasks,
+    save_projects,
+    save_tasks,
+)
+
+_RECORD_HEADER = struct.Struct("<II")
+_TASK_FIELDS = struct.Struct("<Bqqqd")
+_PROJECT_FIELDS = struct.Struct("<Bqq")
+
+OP_PUT_TASK = 1
+OP_PUT_PROJECT = 2
+OP_CLEAR_TASKS = 3
+OP_CLEAR_PROJECTS = 4
+
+
+# ID ещё не добавленной записи кодируется нулём и подставляется через _with_id.
+_ID = struct.Struct("<q")
+
+
+def _encode_task(task: Task) -> bytes:
+    return _TASK_FIELDS.pack(
+        OP_PUT_TASK, task.id or 0, task.project_id,
+        datetime_to_micros(task.deadline), task.hours_spent,
+    ) + task.title.encode("utf-8")
+
+
+def _encode_project(project: Project) -> bytes:
+    deadline = NO_DEADLINE if project.deadline is None else datetime_to_micros(project.deadline)
+    return (_PROJECT_FIELDS.pack(OP_PUT_PROJECT, project.id or 0, deadline)
+            + project.name.encode("utf-8"))
+
+
+def _with_id(payload: bytes, record_id: int) -> bytes:
+    """Подставляет ID, выданный внутренним репозиторием, в закодированную запись."""
+    record = bytearray(payload)
+    _ID.pack_into(record, 1, record_id)
+    return bytes(record)
+
+
+def _decode(payload: bytes):
+    """Возвращает (код операции, Task | Project | None)."""
+    op = payload[0]
+    if op == OP_PUT_TASK:
+        _, task_id, project_id, deadline, hours = _TASK_FIELDS.unpack_from(payload)
+        title = payload[_TASK_FIELDS.size:].decode("utf-8")
+        return op, Task.from_trusted(task_id, project_id, title,
+                                     micros_to_datetime(deadline), hours)
+    if op == OP_PUT_PROJECT:
+        _, project_id, deadline = _PROJECT_FIELDS.unpack_from(payload)
+        name = payload[_PROJECT_FIELDS.size:].decode("utf-8")
+        return op, Project.from_trusted(
+            project_id, name, None if deadline == NO_DEADLINE else micros_to_datetime(deadline)
+        )
+    if op in (OP_CLEAR_TASKS, OP_CLEAR_PROJECTS):
+        return op, None
+    raise ValueError(f"Неизвестная операция журнала: {op}.")
+
+
+class WriteAheadLog:
+    """
+    Файл журнала с групповой фиксацией (group commit).
+
+    write помещает запись в буфер и возвращает её номер; commit ждёт,
+    пока фоновый поток подтвердит её fsync. Пока один fsync выполняется,
+    следующие записи копятся и подтверждаются следующим. При
+    wait_for_sync=False commit не ждёт — при сбое теряются записи
+    последних sync_interval секунд. Счётчики records и syncs показывают,
+    сколько записей пришлось на один fsync.
+    """
+
+    def __init__(self, path: str, sync_interval: float = 0.0, sync_batch: int = 256,
+                 wait_for_sync: bool = True):
+        """
+        Args:
+            path (str): Путь к файлу журнала (создаётся при необходимости).
+            sync_interval (float): Сколько секунд собирать записи перед fsync
+                (0 — начинать fsync сразу).
+            sync_batch (int): Число записей, при котором fsync выполняется сразу.
+            wait_for_sync (bool): Ждать ли в commit подтверждения fsync.
+        """
+        if sync_interval < 0:
+            raise ValueError("sync_interval не может быть отрицательным.")
+        if sync_batch <= 0:
+            raise ValueError("sync_batch должен быть положительным.")
+        self.path = path
+        self._sync_interval = sync_interval
+        self._sync_batch = sync_batch
+        self._wait_for_sync = wait_for_sync
+        self._file = open(path, "ab")
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._written = 0
+        self._synced = 0
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self.records = 0
+        self.syncs = 0
+        self._flusher = threading.Thread(target=self._run_flusher, name="wal-flusher", daemon=True)
+        self._flusher.start()
+
+    def write(self, payload: bytes) -> int:
+        """
+        Дописывает запись в буфер журнала, не дожидаясь fsync.
+
+        Args:
+            payload (bytes): Закодированная операция.
+
+        Returns:
+            int: Номер записи для commit.
+        """
+        record = _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._cond:
+            self._check_usable()
+            self._file.write(record)
+            self._written += 1
+            self.records += 1
+            pending = self._written - self._synced
+            if pending == 1 or pending >= self._sync_batch:
+                self._cond.notify_all()
+            return self._written
+
+    def commit(self, seq: int) -> None:
+        """
+        Ждёт подтверждения fsync для записи seq и всех предыдущих
+        (при wait_for_sync=False возвращается сразу).
+
+        Args:
+            seq (int): Номер записи, полученный от write.
+        """
+        if not self._wait_for_sync:
+            return
+        with self._cond:
+            self._wait_synced(seq)
+
+    def append(self, payload: bytes) -> None:
+        """
+        Дописывает запись и ждёт её подтверждения (write + commit).
+
+        Args:
+            payload (bytes): Закодированная операция.
+        """
+        self.commit(self.write(payload))
+
+    def check(self) -> None:
+        """
+        Проверяет, что в журнал можно писать.
+
+        Raises:
+            ValueError: Журнал закрыт.
+            OSError: Предыдущая запись или fsync завершились ошибкой.
+        """
+        with self._cond:
+            self._check_usable()
+
+    def sync(self) -> None:
+        """Ждёт, пока все уже записанные операции будут подтверждены fsync."""
+        with self._cond:
+            self._check_usable()
+            self._cond.notify_all()
+            self._wait_synced(self._written)
+
+    def _check_usable(self) -> None:
+        if self._closed:
+            raise ValueError("Журнал закрыт.")
+        if self._error is not None:
+            raise OSError("Ошибка записи журнала.") from self._error
+
+    def _wait_synced(self, seq: int) -> None:
+        # После close фоновый поток ещё досинхронизирует хвост, поэтому
+        # здесь проверяется только ошибка записи.
+        while self._synced < seq:
+            if self._error is not None:
+                raise OSError("Ошибка записи журнала.") from self._error
+            self._cond.wait()
+
+    def _run_flusher(self) -> None:
+        with self._cond:
+            while True:
+                while self._written == self._synced and not self._closed:
+                    self._cond.wait()
+                if self._written == self._synced:
+                    return
+                # Окно сбора: ждём ещё записей, пока пакет не заполнится.
+                if not self._closed and self._written - self._synced < self._sync_batch:
+                    self._cond.wait(self._sync_interval)
+                target = self._written
+                try:
+                    self._file.flush()
+                    fd = self._file.fileno()
+                    # fsync без блокировки: писатели тем временем копят следующий пакет.
+                    self._cond.release()
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        self._cond.acquire()
+                except OSError as exc:
+                    self._error = exc
+                    self._cond.notify_all()
+                    return
+                # compact мог уже подтвердить больше записей.
+                self._synced = max(self._synced, target)
+                self.syncs += 1
+                self._cond.notify_all()
+
+    def replay(self, task_repo: Optional[TaskRepository] = None,
+               project_repo: Optional[ProjectRepository] = None) -> int:
+        """
+        Повторяет журнал во внутренних репозиториях (не в WAL-обёртках).
+
+        Задачи и проекты передаются в restore_* пакетно: из нескольких
+        записей об одном ID применяется последняя.
+
+        Args:
+            task_repo (Optional[TaskRepository]): Куда восстанавливать задачи.
+            project_repo (Optional[ProjectRepository]): Куда восстанавливать проекты.
+
+        Returns:
+            int: Количество применённых записей.
+        """
+        tasks = {}
+        projects = {}
+        applied = 0
+        for op, item in self.read_records():
+            applied += 1
+            if op == OP_PUT_TASK:
+                tasks[item.id] = item
+            elif op == OP_PUT_PROJECT:
+                projects[item.id] = item
+            elif op == OP_CLEAR_TASKS:
+                tasks.clear()
+                if task_repo is not None:
+                    task_repo.clear()
+            elif op == OP_CLEAR_PROJECTS:
+                projects.clear()
+                if project_repo is not None:
+                    project_repo.clear()
+        if task_repo is not None:
+            task_repo.restore_tasks(tasks.values())
+        if project_repo is not None:
+            project_repo.restore_projects(projects.values())
+        return applied
+
+    def read_records(self) -> Iterator[Tuple[int, object]]:
+        """
+        Перебирает целые записи журнала; повреждённый хвост обрезается.
+
+        Returns:
+            Iterator[Tuple[int, object]]: Пары (код операции, Task | Project | None).
+        """
+        with self._cond:
+            self._file.flush()
+            with open(self.path, "rb") as f:
+                data = f.read()
+        position = 0
+        while position + _RECORD_HEADER.size <= len(data):
+            size, crc = _RECORD_HEADER.unpack_from(data, position)
+            start = position + _RECORD_HEADER.size
+            payload = data[start:start + size]
+            if len(payload) < size or zlib.crc32(payload) != crc:
+                break
+            yield _decode(payload)
+            position = start + size
+        if position < len(data):
+            self._truncate(position)
+
+    def _truncate(self, size: int) -> None:
+        with self._cond:
+            self._file.flush()
+            os.ftruncate(self._file.fileno(), size)
+            os.fsync(self._file.fileno())
+
+    def recover(self, task_repo: TaskRepository, project_repo: ProjectRepository,
+                tasks_snapshot: Optional[str] = None,
+                projects_snapshot: Optional[str] = None) -> int:
+        """
+        Восстановление при запуске: загружает снимки (если файлы есть)
+        и повторяет журнал поверх них.
+
+        Returns:
+            int: Количество применённых записей журнала.
+        """
+        if tasks_snapshot is not None and os.path.exists(tasks_snapshot):
+            load_tasks(tasks_snapshot, task_repo)
+        if projects_snapshot is not None and os.path.exists(projects_snapshot):
+            load_projects(projects_snapshot, project_repo)
+        return self.replay(task_repo, project_repo)
+
+    def compact(self, task_repo: TaskRepository, project_repo: ProjectRepository,
+                tasks_snapshot: str, projects_snapshot: str) -> None:
+        """
+        Сохраняет снимки внутренних репозиториев и очищает журнал.
+
+        Пока идёт сжатие, новые записи ждут. Если процесс упадёт между
+        сохранением снимков и очисткой журнала, повтор старого журнала
+        поверх новых снимков даст то же состояние.
+
+        Args:
+            task_repo (TaskRepository): Внутренний репозиторий задач.
+            project_repo (ProjectRepository): Внутренний репозиторий проектов.
+            tasks_snapshot (str): Путь к снимку задач.
+            projects_snapshot (str): Путь к снимку проектов.
+        """
+        with self._cond:
+            self._check_usable()
+            save_tasks(task_repo, tasks_snapshot)
+            save_projects(project_repo, projects_snapshot)
+            self._file.flush()
+            os.ftruncate(self._file.fileno(), 0)
+            os.fsync(self._file.fileno())
+            self._synced = self._written
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Подтверждает оставшиеся записи и закрывает файл."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class WALTaskRepository(TaskRepository):
+    """
+    Обёртка TaskRepository, записывающая каждое изменение в журнал.
+
+    Операция выполняется во внутреннем репозитории и записывается в журнал
+    под одной блокировкой, поэтому порядок записей совпадает с порядком
+    изменений; подтверждения fsync вызов ждёт уже вне блокировки, так что
+    записи параллельных потоков фиксируются одним fsync. Чтение обращается
+    к внутреннему репозиторию напрямую.
+
+    Записи кодируются, а журнал проверяется до изменения внутреннего
+    репозитория: ошибка кодирования или закрытый журнал не оставляют
+    изменений, которых нет в журнале.
+    """
+
+    def __init__(self, inner: TaskRepository, wal: WriteAheadLog):
+        """
+        Args:
+            inner (TaskRepository): Репозиторий, в котором хранятся задачи.
+            wal (WriteAheadLog): Журнал.
+        """
+        self.inner = inner
+        self._wal = wal
+        self._lock = threading.RLock()
+
+    def add_task(self, task: Task) -> int:
+        payload = _encode_task(task)
+        with self._lock:
+            self._wal.check()
+            new_id = self.inner.add_task(task)
+            seq = self._wal.write(_with_id(payload, new_id))
+        self._wal.commit(seq)
+        return new_id
+
+    def add_tasks(self, tasks: Iterable[Task]) -> List[int]:
+        tasks = list(tasks)
+        payloads = [_encode_task(task) for task in tasks]
+        with self._lock:
+            self._wal.check()
+            new_ids = self.inner.add_tasks(tasks)
+            seq = self._write_all(
+                [_with_id(payload, new_id) for payload, new_id in zip(payloads, new_ids)]
+            )
+        self._wal.commit(seq)
+        return new_ids
+
+    def get_task(self, task_id: int) -> Task:
+        return self.inner.get_task(task_id)
+
+    def update_task(self, task: Task) -> None:
+        payload = _encode_task(task)
+        with self._lock:
+            self._wal.check()
+            self.inner.update_task(task)
+            seq = self._wal.write(payload)
+        self._wal.commit(seq)
+
+    def list_by_project(self, project_id: int) -> List[Task]:
+        return self.inner.list_by_project(project_id)
+
+    def list_due_before(self, moment: datetime) -> List[Task]:
+        return self.inner.list_due_before(moment)
+
+    def iter_tasks(self) -> Iterator[Task]:
+        return self.inner.iter_tasks()
+
+    def restore_tasks(self, tasks: Iterable[Task]) -> None:
+        tasks = list(tasks)
+        payloads = [_encode_task(task) for task in tasks]
+        with self._lock:
+            self._wal.check()
+            self.inner.restore_tasks(tasks)
+            seq = self._write_all(payloads)
+        self._wal.commit(seq)
+
+    def _write_all(self, payloads: List[bytes]) -> int:
+        seq = 0
+        for payload in payloads:
+            seq = self._wal.write(payload)
+        return seq
+
+    def clear(self):
+        with self._lock:
+            self._wal.check()
+            self.inner.clear()
+            seq = self._wal.write(bytes((OP_CLEAR_TASKS,)))
+        self._wal.commit(seq)
+
+
+class WALProjectRepository(ProjectRepository):
+    """
+    Обёртка ProjectRepository, записывающая каждое изменение в журнал.
+    """
+
+    def __init__(self, inner: ProjectRepository, wal: WriteAheadLog):
+        """
+        Args:
+            inner (ProjectRepository): Репозиторий, в котором хранятся проекты.
+            wal (WriteAheadLog): Журнал.
+        """
+        self.inner = inner
+        self._wal = wal
+        self._lock = threading.RLock()
+
+    def add_project(self, project: Project) -> int:
+        payload = _encode_project(project)
+        with self._lock:
+            self._wal.check()
+            new_id = self.inner.add_project(project)
+            seq = self._wal.write(_with_id(payload, new_id))
+        self._wal.commit(seq)
+        return new_id
+
+    def get_project(self, project_id: int) -> Project:
+        return self.inner.get_project(project_id)
+
+    def iter_projects(self) -> Iterator[Project]:
+        return self.inner.iter_projects()
+
+    def restore_projects(self, projects: Iterable[Project]) -> None:
+        projects = list(projects)
+        payloads = [_encode_project(project) for project in projects]
+        with self._lock:
+            self._wal.check()
+            self.inner.restore_projects(projects)
+            seq = 0
+            for payload in payloads:
+                seq = self._wal.write(payload)
+        self._wal.commit(seq)
+
+    def clear(self):
+        with self._lock:
+            self._wal.check()
+            self.inner.clear()
+            seq = self._wal.write(bytes((OP_CLEAR_PROJECTS,)))
+        self._wal.commit(seq)
@@ -1,8 +1,10 @@
+import hashlib
 import io
 import re
 import time
 import pytest
-import matplotlib.pyplot as plt
+
+from benchmarks import regression
 
 # Глобальная сводка по результатам тестов
 results_summary = {
@@ -17,14 +19,13 @@ results_summary = {
 }
 
 
-@pytest.hookimpl(hookwrapper=True)
-def pytest_runtest_makereport(item, call):
+def pytest_runtest_logreport(report):
     """
     Хук для сбора статистики по результатам тестов.
-    """
-    outcome = yield
-    report = outcome.get_result()
 
+    Вызывается в основном процессе и для отчётов рабочих процессов
+    pytest-xdist, поэтому сводка полна и при параллельном запуске.
+    """
     if report.when == "call":
         results_summary["total"] += 1
         results_summary["total_duration"] += getattr(report, "duration", 0)
@@ -45,12 +46,128 @@ def pytest_runtest_makereport(item, call):
         results_summary["errors"] += 1
 
 
+def _figure_to_svg(plt):
+    """SVG текущего графика matplotlib без XML-заголовка; график закрывается."""
+    buf = io.StringIO()
+    plt.savefig(buf, format='svg')
+    plt.close()
+    svg_data = buf.getvalue()
+    svg_start = svg_data.find("<svg")
+    svg_end = svg_data.rfind("</svg>")
+    if svg_start == -1 or svg_end == -1:
+        return ""
+    return svg_data[svg_start:svg_end + 6]
+
+
+def _render_chart(cache, name, spec, draw):
+    """
+    SVG графика name. Если данные spec не изменились с прошлого запуска,
+    SVG берётся из кэша pytest; иначе matplotlib импортируется (только
+    сейчас — импорт занимает заметную часть секунды) и draw(plt) рисует график.
+    """
+    key = f"report/charts/{name}"
+    digest = hashlib.sha256(repr(spec).encode("utf-8")).hexdigest()
+    if cache is not None:
+        cached = cache.get(key, None)
+        if cached and cached.get("digest") == digest:
+            return cached["svg"]
+
+    import matplotlib.pyplot as plt
+
+    draw(plt)
+    svg = _figure_to_svg(plt)
+    if cache is not None:
+        cache.set(key, {"digest": digest, "svg": svg})
+    return svg
+
+
+def _pie_chart(cache, name, sizes, labels, colors, title):
+    def draw(plt):
+        plt.figure(figsize=(4, 4))
+        plt.pie(sizes, labels=labels, colors=colors, autopct='%1.0f%%')
+        plt.title(title)
+
+    return _render_chart(cache, name, (sizes, labels, colors, title), draw)
+
+
+def _trend_chart(cache, history, baseline, metric, title, threshold, higher_is_better):
+    """Линии «% от базовой линии» по прогонам для каждой операции и масштаба."""
+    series = regression.trend(history, baseline, metric)
+    if not series:
+        return ""
+    limit = 100 * (1 - threshold) if higher_is_better else 100 * (1 + threshold)
+
+    def draw(plt):
+        plt.figure(figsize=(7, 4))
+        for label, points in series.items():
+            plt.plot(range(1, len(points) + 1), points, marker="o", label=label)
+        plt.axhline(100, color="#9E9E9E", linestyle="--")
+        plt.axhline(limit, color="#f44336", linestyle=":")
+        plt.title(title)
+        plt.xlabel("Run")
+        plt.ylabel("% of baseline")
+        plt.legend(fontsize="x-small")
+        plt.tight_layout()
+
+    return _render_chart(cache, f"trend_{metric}", (series, limit, title), draw)
+
+
+def performance_section(cache=None):
+    """
+    Раздел производительности: таблица сравнения с базовой линией
+    (регрессии выделены) и графики тренда по истории прогонов.
+
+    Данные готовит run_report.py (benchmarks.regression); без них раздел пуст.
+    """
+    comparison = regression.load_comparison(regression.COMPARISON_FILE)
+    if comparison is None:
+        return []
+    threshold, changes = comparison
+
+    rows = []
+    for change in changes:
+        style = " style='background: #ffcdd2;'" if change.regressed else ""
+        rows.append(
+            f"<tr{style}><td>{change.name}</td><td>{change.scale}</td>"
+            f"<td>{change.metric}{'' if change.gated else ' *'}</td>"
+            f"<td>{change.baseline:.1f}</td><td>{change.current:.1f}</td>"
+            f"<td>{change.change:+.1%}</td></tr>"
+        )
+    failed = regression.regressions(changes)
+    status = (f"<p style='color:red;'><b>Регрессий: {len(failed)}</b></p>" if failed
+              else "<p style='color:green;'>Регрессий нет.</p>")
+    parts = [
+        "<hr><h2>Производительность</h2>",
+        f"<p>Порог регрессии: {threshold:.0%}. * — метрика не блокирует сборку.</p>",
+        status,
+        "<table style='border-collapse: collapse; text-align: center;'>"
+        "<tr style='background: #f2f2f2;'><th>Операция</th><th>Масштаб</th><th>Метрика</th>"
+        "<th>Базовая линия</th><th>Сейчас</th><th>Изменение</th></tr>"
+        + "".join(rows) + "</table>",
+    ]
+
+    baseline = regression.load_results(regression.BASELINE_FILE)
+    history = regression.load_history(regression.HISTORY_FILE)
+    if baseline is not None and history:
+        for metric, title, higher_is_better in [
+            ("ops_per_sec", "Throughput", True),
+            ("latency_p50", "Latency p50", False),
+        ]:
+            svg = _trend_chart(cache, history, baseline, metric, title, threshold,
+                               higher_is_better)
+            if svg:
+                parts.append(f"<div>{svg}</div>")
+    return parts
+
+
 @pytest.hookimpl(trylast=True)
 def pytest_html_results_summary(prefix, summary, postfix, session):
     """
     Хук генерации раздела Summary HTML-отчёта pytest-html.
     Вставляет графики, таблицу итогов и README.
     """
+    cache = getattr(session.config, "cache", None)
+
     # Чтение покрытия кода из htmlcov/index.html
     cov_percent = None
     cov_covered = None
@@ -79,18 +196,8 @@ def pytest_html_results_summary(prefix, summary, postfix, session):
         labels = [f"Covered ({cov_covered})", f"Missed ({cov_missing})"]
         sizes = [cov_covered, cov_missing]
         colors = ["#4caf50", "#f44336"]
-
-        plt.figure(figsize=(4, 4))
-        plt.pie(sizes, labels=labels, colors=colors, autopct='%1.0f%%')
-        plt.title(f"Coverage: {cov_percent}%")
-        buf = io.StringIO()
-        plt.savefig(buf, format='svg')
-        plt.close()
-        svg_data = buf.getvalue()
-        svg_start = svg_data.find("<svg")
-        svg_end = svg_data.rfind("</svg>")
-        if svg_start != -1 and svg_end != -1:
-            svg_cov_chart = svg_data[svg_start:svg_end + 6]
+        svg_cov_chart = _pie_chart(cache, "coverage", sizes, labels, colors,
+                                   f"Coverage: {cov_percent}%")
 
     # Генерация SVG-графика по тестам
     svg_result_chart = ""
@@ -112,17 +219,8 @@ def pytest_html_results_summary(prefix, summary, postfix, session):
             colors.append(color)
 
     if sizes:
-        plt.figure(figsize=(4, 4))
-        plt.pie(sizes, labels=result_labels, colors=colors, autopct='%1.0f%%')
-        plt.title("Test Results")
-        buf = io.StringIO()
-        plt.savefig(buf, format='svg')
-        plt.close()
-        svg_data = buf.getvalue()
-        svg_start = svg_data.find("<svg")
-        svg_end = svg_data.rfind("</svg>")
-        if svg_start != -1 and svg_end != -1:
-            svg_result_chart = svg_data[svg_start:svg_end + 6]
+        svg_result_chart = _pie_chart(cache, "results", sizes, result_labels, colors,
+                                      "Test Results")
 
     # Таблица итогов
     avg_time_ms = int((results_summary["total_duration"] / results_summary["total"]) * 1000) if results_summary["total"] else 0
@@ -158,5 +256,6 @@ def pytest_html_results_summary(prefix, summary, postfix, session):
         html_parts.append(f"<div>{svg_result_chart}</div>")
 
     html_parts.append(table_html)
+    html_parts.extend(performance_section(cache))
 
     prefix.extend(html_parts)
@@ -0,0 +1,148 @@
+import asyncio
+import smtplib
+import threading
+import time
+from aiosmtpd.controller import Controller
+
+from task_manager.async_notifications import AsyncNotificationService
+from task_manager.notifications import NotificationService
+
+
+class CaptureHandler:
+    """
+    Обработчик писем для встроенного SMTP-сервера: запоминает получателей.
+    """
+
+    def __init__(self):
+        self.recipients = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.recipients.extend(envelope.rcpt_tos)
+        return '250 OK'
+
+
+def test_async_notifications_delivered():
+    """
+    Проверяет доставку писем через асинхронную очередь на локальный SMTP-сервер.
+    """
+    handler = CaptureHandler()
+    controller = Controller(handler, hostname='localhost', port=8027)
+    controller.start()
+    time.sleep(0.2)  # Дать серверу подняться
+
+    async def scenario():
+        service = NotificationService(smtp_host='localhost', smtp_port=8027)
+        async with AsyncNotificationService(service, concurrency=2) as notifier:
+            futures = [
+                await notifier.enqueue(f"user{i}@example.com", {"title": f"Task {i}"})
+                for i in range(5)
+            ]
+            invalid = await notifier.enqueue("bad-email", {"title": "Bad"})
+            await notifier.drain()
+        return [f.result() for f in futures], invalid.result()
+
+    try:
+        results, invalid = asyncio.run(scenario())
+    finally:
+        controller.stop()
+
+    assert results == [True] * 5
+    assert invalid is False
+    assert sorted(handler.recipients) == [
+        f"user{i}@example.com" for i in range(5)
+    ]
+
+
+def test_async_notifications_bounded_concurrency():
+    """
+    Проверяет, что одновременно выполняется не больше concurrency отправок.
+    """
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    class SlowSMTP:
+        def __init__(self, host, port):
+            pass
+
+        def sendmail(self, sender, recipients, message):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+
+        def __exit__(self, *exc_info):
+            pass
+
+    async def scenario():
+        service = NotificationService(mailer=SlowSMTP)
+        async with AsyncNotificationService(service, concurrency=3, queue_size=4) as notifier:
+            futures = [
+                await notifier.enqueue(f"user{i}@example.com", {"title": "T"})
+                for i in range(12)
+            ]
+        return [f.result() for f in futures]
+
+    assert asyncio.run(scenario()) == [True] * 12
+    assert state["peak"] == 3
+
+
+def test_async_notifications_retry_and_give_up():
+    """
+    Проверяет повтор с задержкой при временных сбоях и отказ без повтора при 5xx.
+    """
+    attempts = {"connect": 0}
+
+    class FlakySMTP:
+        def __init__(self, host, port):
+            attempts["connect"] += 1
+            if attempts["connect"] <= 2:
+                raise ConnectionRefusedError("busy")
+
+        def sendmail(self, sender, recipients, message):
+            if recipients[0].startswith("rejected"):
+                raise smtplib.SMTPDataError(554, b"rejected")
+
+        def __exit__(self, *exc_info):
+            pass
+
+    async def scenario():
+        service = NotificationService(mailer=FlakySMTP)
+        notifier = AsyncNotificationService(service, concurrency=1, max_retries=3, backoff=0.001)
+        ok = await notifier.enqueue("ok@example.com", {"title": "T"})
+        rejected = await notifier.enqueue("rejected@example.com", {"title": "T"})
+        await notifier.close()
+        return ok.result(), rejected.result()
+
+    assert asyncio.run(scenario()) == (True, False)
+    assert attempts["connect"] == 3
+
+
+def test_async_notifications_bad_payload_does_not_stop_worker():
+    """
+    Проверяет, что некорректный task_info завершает future с False,
+    а единственный воркер продолжает отправку.
+    """
+    sent = []
+
+    class RecordingSMTP:
+        def __init__(self, host, port):
+            pass
+
+        def sendmail(self, sender, recipients, message):
+            sent.append(recipients[0])
+
+        def __exit__(self, *exc_info):
+            pass
+
+    async def scenario():
+        service = NotificationService(mailer=RecordingSMTP)
+        async with AsyncNotificationService(service, concurrency=1) as notifier:
+            broken = await notifier.enqueue("broken@example.com", None)
+            ok = await notifier.enqueue("ok@example.com", {"title": "T"})
+            results = await asyncio.wait_for(asyncio.gather(broken, ok), timeout=5)
+        return results
+
+    assert asyncio.run(scenario()) == [False, True]
+    assert sent == ["ok@example.com"]
@@ -0,0 +1,81 @@
+import pytest
+
+from benchmarks import regression
+
+
+def make_results(ops_per_sec=1000.0, p50=10.0, p99=50.0, memory=1_000_000, ops=1000):
+    """Результаты benchmarks.suite с одной записью track_time."""
+    return {
+        "meta": {},
+        "results": [{
+            "name": "track_time", "scale": 1000, "ops": ops,
+            "ops_per_sec": ops_per_sec,
+            "latency_us": {"p50": p50, "p90": p50, "p99": p99, "max": p99},
+            "peak_memory_bytes": memory,
+        }],
+    }
+
+
+def by_metric(changes):
+    return {change.metric: change for change in changes}
+
+
+def test_no_regression_within_threshold():
+    """Ухудшение в пределах порога не считается регрессией."""
+    changes = regression.compare(make_results(ops_per_sec=900.0, p50=11.0),
+                                 make_results(), threshold=0.25)
+
+    assert regression.regressions(changes) == []
+    assert by_metric(changes)["ops_per_sec"].change == pytest.approx(-0.1)
+
+
+def test_throughput_and_latency_regressions():
+    """Трёхкратное замедление — регрессия пропускной способности и задержки."""
+    changes = by_metric(regression.compare(make_results(ops_per_sec=333.0, p50=30.0),
+                                           make_results(), threshold=0.25))
+
+    assert changes["ops_per_sec"].regressed
+    assert changes["latency_p50"].regressed
+    assert not changes["peak_memory_bytes"].regressed
+
+
+def test_p99_is_reported_but_not_gated():
+    """p99 попадает в сравнение, но не блокирует сборку."""
+    changes = by_metric(regression.compare(make_results(p99=500.0), make_results()))
+
+    assert changes["latency_p99"].change == pytest.approx(9.0)
+    assert not changes["latency_p99"].gated
+    assert not changes["latency_p99"].regressed
+
+
+def test_small_memory_growth_is_ignored():
+    """Рост пика памяти на несколько килобайт — шум, даже если это много процентов."""
+    changes = by_metric(regression.compare(make_results(memory=3000), make_results(memory=1000)))
+    assert not changes["peak_memory_bytes"].regressed
+
+    changes = by_metric(regression.compare(make_results(memory=3_000_000), make_results()))
+    assert changes["peak_memory_bytes"].regressed
+
+
+def test_entries_with_different_ops_are_not_compared():
+    """Записи с другим числом вызовов (например, другой --max-smtp) не сравниваются."""
+    assert regression.compare(make_results(ops=500), make_results(ops=1000)) == []
+
+
+def test_comparison_and_history_roundtrip(tmp_path):
+    """Сравнение и история сохраняются и читаются обратно; тренд — в % от базовой линии."""
+    baseline = make_results()
+    changes = regression.compare(make_results(ops_per_sec=500.0), baseline)
+    path = str(tmp_path / "comparison.json")
+    regression.write_comparison(path, changes, 0.1)
+
+    assert regression.load_comparison(path) == (0.1, changes)
+    assert regression.load_comparison(str(tmp_path / "missing.json")) is None
+
+    history = str(tmp_path / "history.jsonl")
+    for ops_per_sec in (1000.0, 800.0, 500.0):
+        regression.append_history(history, make_results(ops_per_sec=ops_per_sec))
+    runs = regression.load_history(history, limit=2)
+
+    assert len(runs) == 2
+    assert regression.trend(runs, baseline, "ops_per_sec") == {"track_time@1000": [80.0, 50.0]}
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+import task_manager
+from benchmarks import suite
+
+
+def test_parse_scale():
+    """Масштабы с суффиксами k и m."""
+    assert suite.parse_scale("1k") == 1000
+    assert suite.parse_scale("100K") == 100_000
+    assert suite.parse_scale("1m") == 1_000_000
+    assert suite.parse_scale("250") == 250
+
+
+def test_run_suite_produces_json_report():
+    """Маленький прогон всех операций даёт полный JSON-отчёт и восстанавливает настройки SMTP."""
+    port_before = task_manager.notification_service.smtp_port
+
+    report = suite.run_suite([20], max_smtp=3, smtp_port=8031)
+
+    assert task_manager.notification_service.smtp_port == port_before
+    assert report["meta"]["scales"] == [20]
+    assert [entry["name"] for entry in report["results"]] == list(suite.OPERATIONS)
+    for entry in report["results"]:
+        expected_ops = 3 if entry["name"] == "send_task_notification" else 20
+        assert entry["ops"] == expected_ops
+        assert entry["ops_per_sec"] > 0
+        latency = entry["latency_us"]
+        assert latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"]
+        assert entry["peak_memory_bytes"] >= 0
+    json.loads(json.dumps(report))
+
+
+def test_run_suite_rejects_unknown_operation():
+    """Неизвестная операция — ValueError до запуска замеров."""
+    with pytest.raises(ValueError):
+        suite.run_suite([10], operations=["delete_everything"])
@@ -0,0 +1,87 @@
+import pytest
+from datetime import datetime, timedelta
+
+from task_manager.caching import CachingProjectRepository, CachingTaskRepository
+from task_manager.models import Project
+from task_manager.services import TaskService
+from task_manager.sqlite_repositories import SQLiteProjectRepository, SQLiteTaskRepository, connect
+
+
+class CountingProjectRepository(SQLiteProjectRepository):
+    """SQLite-репозиторий, считающий обращения get_project."""
+
+    def __init__(self, connection):
+        SQLiteProjectRepository.__init__(self, connection)
+        self.calls = 0
+
+    def get_project(self, project_id):
+        self.calls += 1
+        return SQLiteProjectRepository.get_project(self, project_id)
+
+
+def test_project_cache_hits_and_negative_caching():
+    """
+    Проверяет, что create_task обращается к хранилищу проектов один раз,
+    а отсутствующий ID кэшируется до add_project.
+    """
+    inner = CountingProjectRepository(connect())
+    projects = CachingProjectRepository(inner)
+    service = TaskService(SQLiteTaskRepository(connect()), projects)
+    pid = projects.add_project(Project(name="Cached"))
+    deadline = datetime.now() + timedelta(days=1)
+
+    for i in range(5):
+        service.create_task(pid, f"T{i}", deadline)
+    assert not service.check_project_deadline(pid)
+    assert inner.calls == 1
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            service.create_task(pid + 1, "Missing", deadline)
+    assert inner.calls == 2
+    assert projects.add_project(Project(name="Now exists")) == pid + 1
+    assert projects.get_project(pid + 1).name == "Now exists"
+
+    stats = projects.stats
+    assert (stats.hits, stats.negative_hits, stats.misses) == (7, 2, 3)
+
+
+def test_task_cache_write_through_and_clear():
+    """
+    Проверяет, что track_time обновляет кэш задачи, а clear его сбрасывает.
+    """
+    tasks = CachingTaskRepository(SQLiteTaskRepository(connect()))
+    projects = CachingProjectRepository(SQLiteProjectRepository(connect()))
+    service = TaskService(tasks, projects)
+    pid = projects.add_project(Project(name="P"))
+    tid = service.create_task(pid, "Work", datetime.now() + timedelta(days=1))
+
+    service.track_time(tid, 1.5)
+    service.track_time(tid, 2.0)
+    assert tasks.get_task(tid).hours_spent == 3.5
+    assert tasks.inner.get_task(tid).hours_spent == 3.5
+
+    tasks.clear()
+    with pytest.raises(KeyError):
+        tasks.get_task(tid)
+    assert tasks.stats.size == 1
+
+
+def test_cache_lru_and_ttl():
+    """
+    Проверяет вытеснение по размеру и устаревание по TTL.
+    """
+    now = [0.0]
+    inner = CountingProjectRepository(connect())
+    projects = CachingProjectRepository(inner, max_size=2, ttl=10, clock=lambda: now[0])
+    ids = [projects.add_project(Project(name=f"P{i}")) for i in range(3)]
+
+    for pid in ids:
+        projects.get_project(pid)
+    assert projects.stats.evictions == 1
+    projects.get_project(ids[0])
+    assert inner.calls == 4
+
+    now[0] = 11.0
+    projects.get_project(ids[0])
+    assert inner.calls == 5
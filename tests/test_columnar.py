@@ -0,0 +1,109 @@
+import pytest
+from datetime import datetime, timedelta
+
+from task_manager.columnar import ColumnarTaskRepository, TaskView
+from task_manager.models import Project, Task, datetime_to_micros, micros_to_datetime
+from task_manager.repositories import InMemoryProjectRepository
+from task_manager.services import TaskService
+
+
+def test_models_are_slotted():
+    """
+    Проверяет, что Task и Project не имеют __dict__ (используют __slots__).
+    """
+    task = Task(project_id=1, title="Slots", deadline=datetime.now())
+    project = Project(name="Slots")
+    assert not hasattr(task, "__dict__")
+    assert not hasattr(project, "__dict__")
+
+
+def test_micros_roundtrip():
+    """
+    Проверяет точное преобразование datetime <-> микросекунды.
+    """
+    value = datetime(2031, 5, 17, 13, 45, 7, 123456)
+    assert micros_to_datetime(datetime_to_micros(value)) == value
+    with pytest.raises(ValueError):
+        datetime_to_micros(datetime.now().astimezone())
+
+
+def test_columnar_add_and_get_view():
+    """
+    Проверяет, что колоночное хранилище возвращает TaskView с исходными полями.
+    """
+    repo = ColumnarTaskRepository()
+    deadline = datetime(2031, 1, 1, 9, 30)
+    task = Task(project_id=7, title="Column", deadline=deadline, hours_spent=1.5)
+
+    tid = repo.add_task(task)
+    view = repo.get_task(tid)
+
+    assert isinstance(view, TaskView)
+    assert task.id == tid
+    assert (view.id, view.project_id, view.title, view.deadline, view.hours_spent) == (
+        tid, 7, "Column", deadline, 1.5
+    )
+    assert view.to_task() == task
+    with pytest.raises(KeyError):
+        repo.get_task(tid + 1)
+
+
+def test_columnar_rejected_task_leaves_columns_intact():
+    """
+    Проверяет, что задача с дедлайном с часовым поясом не попадает
+    ни в одну колонку и не ломает следующие добавления.
+    """
+    repo = ColumnarTaskRepository()
+    aware = Task(project_id=1, title="Aware", deadline=datetime.now().astimezone())
+    with pytest.raises(ValueError):
+        repo.add_task(aware)
+
+    tid = repo.add_task(Task(project_id=1, title="Naive", deadline=datetime(2031, 1, 1)))
+
+    assert len(repo) == 1
+    assert repo.get_task(tid).title == "Naive"
+
+
+def test_columnar_queries_and_update():
+    """
+    Проверяет выборки по проекту и дедлайну и их обновление после update_task.
+    """
+    repo = ColumnarTaskRepository()
+    now = datetime(2031, 1, 10)
+    ids = repo.add_tasks([
+        Task(project_id=1, title="Late", deadline=now + timedelta(days=1)),
+        Task(project_id=2, title="Early", deadline=now - timedelta(days=2)),
+        Task(project_id=1, title="Middle", deadline=now - timedelta(days=1)),
+    ])
+
+    assert [v.id for v in repo.list_by_project(1)] == [ids[0], ids[2]]
+    assert [v.id for v in repo.list_overdue(now)] == [ids[1], ids[2]]
+
+    moved = repo.get_task(ids[0]).to_task()
+    moved.project_id = 2
+    moved.deadline = now - timedelta(days=3)
+    repo.update_task(moved)
+
+    assert [v.id for v in repo.list_by_project(1)] == [ids[2]]
+    assert [v.id for v in repo.list_overdue(now)] == [ids[0], ids[1], ids[2]]
+
+    repo.clear()
+    assert len(repo) == 0
+    assert repo.list_by_project(2) == []
+
+
+def test_columnar_with_task_service():
+    """
+    Проверяет работу TaskService поверх колоночного хранилища.
+
+    Ожидается: track_time изменяет hours_spent в колонке.
+    """
+    task_repo = ColumnarTaskRepository()
+    project_repo = InMemoryProjectRepository()
+    service = TaskService(task_repo, project_repo)
+    pid = project_repo.add_project(Project(name="Columnar"))
+    tid = service.create_task(pid, "Work", datetime.now() + timedelta(days=1))
+
+    assert service.track_time(tid, 2.0) == 2.0
+    assert service.track_time(tid, 0.5) == 2.5
+    assert task_repo.get_task(tid).hours_spent == 2.5
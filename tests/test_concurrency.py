@@ -0,0 +1,90 @@
+import pytest
+import sys
+import threading
+from datetime import datetime, timedelta
+
+from task_manager.columnar import ColumnarTaskRepository
+from task_manager.concurrency import StripedLock
+from task_manager.models import Project
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+from task_manager.services import TaskService
+from task_manager.sqlite_repositories import SQLiteTaskRepository, connect
+
+
+@pytest.fixture
+def frequent_switches():
+    """
+    Учащает переключение потоков, чтобы гонки проявлялись чаще.
+    """
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous)
+
+
+def run_threads(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+@pytest.mark.parametrize("make_repo", [
+    InMemoryTaskRepository,
+    ColumnarTaskRepository,
+    lambda: SQLiteTaskRepository(connect()),
+], ids=["inmemory", "columnar", "sqlite"])
+def test_track_time_parallel_no_lost_updates(make_repo, frequent_switches):
+    """
+    Проверяет, что параллельные track_time по одним и тем же задачам не теряют часы.
+    """
+    project_repo = InMemoryProjectRepository()
+    service = TaskService(make_repo(), project_repo)
+    pid = project_repo.add_project(Project(name="Parallel"))
+    deadline = datetime.now() + timedelta(days=1)
+    task_ids = [service.create_task(pid, f"T{i}", deadline) for i in range(3)]
+
+    def worker():
+        for i in range(300):
+            service.track_time(task_ids[i % 3], 1.0)
+
+    run_threads(8, worker)
+
+    assert [service.track_time(tid, 0.5) for tid in task_ids] == [800.5] * 3
+
+
+def test_parallel_add_tasks_keeps_index(frequent_switches):
+    """
+    Проверяет согласованность индексов при параллельной вставке.
+    """
+    repo = InMemoryTaskRepository()
+    project_repo = InMemoryProjectRepository()
+    service = TaskService(repo, project_repo)
+    pid = project_repo.add_project(Project(name="Inserts"))
+    deadline = datetime.now() + timedelta(days=1)
+
+    def worker():
+        service.create_tasks([(pid, "T", deadline)] * 200)
+        for _ in range(50):
+            service.create_task(pid, "T", deadline)
+
+    run_threads(6, worker)
+
+    tasks = repo.list_by_project(pid)
+    assert len(tasks) == 1500
+    assert len({t.id for t in tasks}) == 1500
+    assert len(repo.list_due_before(datetime.max)) == 1500
+
+
+def test_striped_lock():
+    """
+    Проверяет выбор блокировки по ключу и отключённый режим.
+    """
+    locks = StripedLock(4)
+    assert locks.for_key(1) is locks.for_key(5)
+    assert locks.for_key(1) is not locks.for_key(2)
+    with StripedLock(0).for_key(1):
+        pass
+    with pytest.raises(ValueError):
+        StripedLock(-1)
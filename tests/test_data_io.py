@@ -0,0 +1,107 @@
+import csv
+import io
+import pytest
+from datetime import datetime, timedelta
+
+import task_manager
+from task_manager.data_io import export_projects, export_tasks, import_projects, import_tasks
+from task_manager.models import Project
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+from task_manager.services import TaskService
+
+
+def make_service():
+    task_repo, project_repo = InMemoryTaskRepository(), InMemoryProjectRepository()
+    return TaskService(task_repo, project_repo), task_repo, project_repo
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_export_import_roundtrip(tmp_path, suffix):
+    """
+    Проверяет, что выгруженные проекты и задачи загружаются обратно
+    с теми же полями (кроме ID и часов, которые выдаёт сервис).
+    """
+    service, task_repo, project_repo = make_service()
+    pid = project_repo.add_project(Project(name="Экспорт, \"кавычки\""))
+    project_repo.add_project(Project(name="Dated", deadline=datetime(2031, 1, 1)))
+    deadline = datetime.now() + timedelta(days=1)
+    service.create_tasks([(pid, f"Задача\n{i}", deadline) for i in range(5)])
+
+    assert export_projects(project_repo, tmp_path / f"projects{suffix}") == 2
+    assert export_tasks(task_repo, tmp_path / f"tasks{suffix}") == 5
+
+    target, target_tasks, target_projects = make_service()
+    report = import_projects(tmp_path / f"projects{suffix}", target_projects)
+    assert (report.rows, report.created, report.failed) == (2, 2, 0)
+    report = import_tasks(tmp_path / f"tasks{suffix}", target, batch_size=2)
+    assert (report.rows, report.created, report.failed) == (5, 5, 0)
+
+    assert [(p.name, p.deadline) for p in target_projects.iter_projects()] == [
+        (p.name, p.deadline) for p in project_repo.iter_projects()
+    ]
+    assert [(t.project_id, t.title, t.deadline) for t in target_tasks.iter_tasks()] == [
+        (t.project_id, t.title, t.deadline) for t in task_repo.iter_tasks()
+    ]
+
+
+def test_import_reports_bad_rows_and_continues():
+    """
+    Проверяет, что ошибочные строки попадают в отчёт с номерами записей,
+    а корректные строки импортируются.
+    """
+    service, task_repo, project_repo = make_service()
+    pid = project_repo.add_project(Project(name="P"))
+    future = (datetime.now() + timedelta(days=1)).isoformat()
+    lines = [
+        f'{{"project_id": {pid}, "title": "Ok", "deadline": "{future}"}}',
+        "{not json",
+        f'{{"project_id": {pid}, "title": "No deadline"}}',
+        f'{{"project_id": 999, "title": "No project", "deadline": "{future}"}}',
+        "",
+        f'{{"project_id": {pid}, "title": "   ", "deadline": "{future}"}}',
+        f'{{"project_id": {pid}, "title": "Bad date", "deadline": "завтра"}}',
+        f'{{"project_id": "{pid}", "title": "Also ok", "deadline": "{future}"}}',
+    ]
+
+    report = import_tasks(io.StringIO("\n".join(lines)), service, fmt="jsonl", batch_size=3)
+
+    assert (report.rows, report.created, report.failed) == (7, 2, 5)
+    assert sorted(report.errors) == [2, 3, 4, 5, 6]
+    assert [t.title for t in task_repo.iter_tasks()] == ["Ok", "Also ok"]
+
+
+def test_import_csv_oversized_field_reported():
+    """
+    Проверяет, что поле длиннее лимита модуля csv даёт ошибку одной записи,
+    а остальные строки импортируются.
+    """
+    service, task_repo, project_repo = make_service()
+    pid = project_repo.add_project(Project(name="P"))
+    future = (datetime.now() + timedelta(days=1)).isoformat()
+    text = (f"project_id,title,deadline\n{pid},Before,{future}\n"
+            f"{pid},{'x' * (csv.field_size_limit() + 1)},{future}\n"
+            f"{pid},After,{future}\n")
+
+    report = import_tasks(io.StringIO(text), service, fmt="csv")
+
+    assert (report.rows, report.created, report.failed) == (3, 2, 1)
+    assert "CSV" in str(report.errors[2])
+    assert [t.title for t in task_repo.iter_tasks()] == ["Before", "After"]
+
+
+def test_import_tasks_wrapper(tmp_path):
+    """
+    Проверяет обёртки task_manager.import_tasks / export_tasks.
+    """
+    pid = task_manager.project_repo.add_project(Project(name="IO"))
+    path = tmp_path / "tasks.csv"
+    deadline = (datetime.now() + timedelta(days=1)).isoformat()
+    path.write_text(f"project_id,title,deadline\n{pid},Wrapped,{deadline}\n{pid},,{deadline}\n",
+                    encoding="utf-8")
+
+    report = task_manager.import_tasks(path)
+
+    assert (report.created, sorted(report.errors)) == (1, [2])
+    assert task_manager.export_tasks(tmp_path / "out.jsonl") >= 1
+    with pytest.raises(ValueError):
+        task_manager.export_tasks(tmp_path / "out.txt")
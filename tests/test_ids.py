@@ -0,0 +1,95 @@
+import pytest
+import threading
+from datetime import datetime, timedelta
+
+from task_manager.ids import (
+    BlockIdAllocator,
+    SequentialIdAllocator,
+    SnowflakeIdAllocator,
+)
+from task_manager.models import Project, Task
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+
+
+def test_sequential_allocator():
+    """
+    Проверяет последовательную выдачу и резервирование диапазона.
+    """
+    ids = SequentialIdAllocator(start=10)
+    assert ids.next_id() == 10
+    assert list(ids.reserve(3)) == [11, 12, 13]
+    assert ids.next_id() == 14
+
+
+def test_sequential_allocator_threads_unique():
+    """
+    Проверяет отсутствие дубликатов при выдаче ID из нескольких потоков.
+    """
+    ids = SequentialIdAllocator()
+    issued = []
+
+    def worker():
+        issued.extend(ids.next_id() for _ in range(1000))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(issued) == list(range(1, 4001))
+
+
+def test_block_allocator_reserves_blocks():
+    """
+    Проверяет, что блочный генератор обращается к источнику раз в блок.
+    """
+    source = SequentialIdAllocator()
+    first = BlockIdAllocator(source, block_size=4)
+    second = BlockIdAllocator(source, block_size=4)
+
+    assert [first.next_id() for _ in range(3)] == [1, 2, 3]
+    assert second.next_id() == 5
+    assert first.next_id() == 4
+    assert first.next_id() == 9
+
+    with pytest.raises(ValueError):
+        BlockIdAllocator(source, block_size=0)
+
+
+def test_snowflake_allocator_layout():
+    """
+    Проверяет раскладку snowflake-ID: время, шард и счётчик.
+
+    Ожидается: ID строго возрастают, шарды не пересекаются,
+    переполнение счётчика ждёт следующую миллисекунду.
+    """
+    ticks = iter([1_800_000_000.000] * 4097 + [1_800_000_000.001] * 2)
+    ids = SnowflakeIdAllocator(shard_id=3, clock=lambda: next(ticks))
+
+    issued = [ids.next_id() for _ in range(4097)]
+
+    assert issued == sorted(set(issued))
+    assert all((value >> 12) & 0x3FF == 3 for value in issued)
+    assert issued[-1] & 0xFFF == 0
+    assert issued[-1] >> 22 == (issued[0] >> 22) + 1
+    assert all(value < 2 ** 63 for value in issued)
+
+    with pytest.raises(ValueError):
+        SnowflakeIdAllocator(shard_id=1024)
+
+
+def test_repositories_use_allocator():
+    """
+    Проверяет, что репозитории выдают ID через переданный генератор.
+    """
+    task_repo = InMemoryTaskRepository(id_allocator=SequentialIdAllocator(start=100))
+    project_repo = InMemoryProjectRepository()
+    deadline = datetime.now() + timedelta(days=1)
+
+    assert project_repo.add_project(Project(name="First")) == 1
+    assert task_repo.add_task(Task(project_id=1, title="A", deadline=deadline)) == 100
+    assert task_repo.add_tasks([
+        Task(project_id=1, title="B", deadline=deadline),
+        Task(project_id=1, title="C", deadline=deadline),
+    ]) == [101, 102]
@@ -0,0 +1,184 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from task_manager import instrumentation
+from task_manager.caching import CachingProjectRepository
+from task_manager.models import Project
+from task_manager.notifications import NotificationService, SMTPSession
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+from task_manager.services import InvoiceService, TaskService
+
+
+class FakeSMTP:
+    """SMTP-клиент без сети: запоминает письма."""
+
+    def __init__(self, host, port):
+        self.sent = []
+
+    def sendmail(self, sender, recipients, message):
+        self.sent.append(recipients)
+
+    def __exit__(self, *args):
+        pass
+
+
+class RefusingSMTP:
+    """SMTP-клиент, к которому нельзя подключиться."""
+
+    def __init__(self, host, port):
+        raise ConnectionRefusedError("нет сервера")
+
+
+def counter(snapshot, name, **labels):
+    for item in snapshot["counters"].get(name, []):
+        if item["labels"] == labels:
+            return item["value"]
+    return 0
+
+
+def histogram(snapshot, name, **labels):
+    for item in snapshot["histograms"].get(name, []):
+        if item["labels"] == labels:
+            return item
+    return None
+
+
+@pytest.fixture
+def service():
+    projects = InMemoryProjectRepository()
+    project_id = projects.add_project(Project(name="Проект"))
+    return TaskService(InMemoryTaskRepository(), projects), project_id
+
+
+def test_disabled_by_default_and_restored_after_disable():
+    """Без enable() методы не обёрнуты; после disable() возвращаются исходные."""
+    original = TaskService.__dict__["create_task"]
+    assert not instrumentation.is_enabled()
+
+    with instrumentation.instrumented(instrumentation.MetricsRegistry()):
+        assert instrumentation.is_enabled()
+        assert TaskService.__dict__["create_task"] is not original
+
+    assert not instrumentation.is_enabled()
+    assert TaskService.__dict__["create_task"] is original
+    assert SMTPSession.__dict__["sendmail"].__qualname__ == "SMTPSession.sendmail"
+
+
+def test_nested_blocks_restore_outer_registry(service):
+    """Вложенный блок пишет в свой реестр, после выхода запись идёт во внешний."""
+    task_service, project_id = service
+    deadline = datetime.now() + timedelta(days=1)
+    create = dict(method="TaskService.create_task", outcome="ok")
+
+    with instrumentation.instrumented(instrumentation.MetricsRegistry()) as outer:
+        task_service.create_task(project_id, "Внешняя", deadline)
+        with instrumentation.instrumented(instrumentation.MetricsRegistry()) as inner:
+            task_service.create_task(project_id, "Внутренняя", deadline)
+        assert instrumentation.is_enabled()
+        task_service.create_task(project_id, "Снова внешняя", deadline)
+
+    assert not instrumentation.is_enabled()
+    assert counter(outer.snapshot(), instrumentation.CALLS, **create) == 2
+    assert counter(inner.snapshot(), instrumentation.CALLS, **create) == 1
+
+
+def test_service_calls_durations_and_misses(service):
+    """Вызовы считаются по исходу, время попадает в гистограмму, промахи — по репозиторию."""
+    task_service, project_id = service
+    deadline = datetime.now() + timedelta(days=1)
+
+    with instrumentation.instrumented(instrumentation.MetricsRegistry()) as metrics:
+        task_id = task_service.create_task(project_id, "Задача", deadline)
+        task_service.track_time(task_id, 1.5)
+        task_service.track_time(task_id, 0.5)
+        with pytest.raises(ValueError):
+            task_service.track_time(999, 1.0)
+        with pytest.raises(ValueError):
+            task_service.check_project_deadline(999)
+        InvoiceService().calculate_invoice(2.0, 10.0, "USD")
+    snapshot = metrics.snapshot()
+
+    assert counter(snapshot, instrumentation.CALLS,
+                   method="TaskService.track_time", outcome="ok") == 2
+    assert counter(snapshot, instrumentation.CALLS,
+                   method="TaskService.track_time", outcome="error") == 1
+    assert counter(snapshot, instrumentation.CALLS,
+                   method="InvoiceService.calculate_invoice", outcome="ok") == 1
+    durations = histogram(snapshot, instrumentation.CALL_DURATION, method="TaskService.track_time")
+    assert durations["count"] == 3
+    assert durations["buckets"]["+Inf"] == 3
+    assert counter(snapshot, instrumentation.REPOSITORY_MISSES,
+                   method="get_task", repository="InMemoryTaskRepository") == 1
+    assert counter(snapshot, instrumentation.REPOSITORY_MISSES,
+                   method="get_project", repository="InMemoryProjectRepository") == 1
+    json.dumps(snapshot)
+
+
+def test_wrapper_repositories_count_misses_separately():
+    """Промах через кэширующую обёртку учитывается и у обёртки, и у хранилища."""
+    projects = CachingProjectRepository(InMemoryProjectRepository())
+
+    with instrumentation.instrumented(instrumentation.MetricsRegistry()) as metrics:
+        for _ in range(3):
+            with pytest.raises(KeyError):
+                projects.get_project(42)
+    snapshot = metrics.snapshot()
+
+    assert counter(snapshot, instrumentation.REPOSITORY_MISSES,
+                   method="get_project", repository="CachingProjectRepository") == 3
+    # Остальные два промаха обслужил отрицательный кэш.
+    assert counter(snapshot, instrumentation.REPOSITORY_MISSES,
+                   method="get_project", repository="InMemoryProjectRepository") == 1
+
+
+def test_smtp_connect_and_send_durations():
+    """Подключение и отправка SMTP измеряются с исходом ok / error."""
+    task_info = {"title": "Отчёт", "deadline": datetime.now() + timedelta(days=1)}
+
+    with instrumentation.instrumented(instrumentation.MetricsRegistry()) as metrics:
+        assert NotificationService(mailer=FakeSMTP).send_task_notifications(
+            [("a@example.com", task_info), ("b@example.com", task_info)]
+        ) == [True, True]
+        assert not NotificationService(mailer=RefusingSMTP).send_task_notification(
+            "a@example.com", task_info
+        )
+    snapshot = metrics.snapshot()
+
+    assert histogram(snapshot, instrumentation.SMTP_CONNECT, outcome="ok")["count"] == 1
+    assert histogram(snapshot, instrumentation.SMTP_CONNECT, outcome="error")["count"] == 1
+    assert histogram(snapshot, instrumentation.SMTP_SEND, outcome="ok")["count"] == 2
+    assert histogram(snapshot, instrumentation.SMTP_SEND, outcome="error")["count"] == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    """Корзины накопительные: le — число значений не больше границы."""
+    hist = instrumentation.Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value)
+
+    assert hist.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert hist.sum == pytest.approx(3.65)
+
+
+def test_prometheus_text_format():
+    """Текстовый формат: HELP/TYPE, корзины _bucket, _sum, _count, экранирование меток."""
+    metrics = instrumentation.MetricsRegistry(buckets=(0.5,))
+    metrics.inc(instrumentation.CALLS, (("method", 'a"b'), ("outcome", "ok")), 2)
+    metrics.observe(instrumentation.SMTP_SEND, (("outcome", "ok"),), 0.25)
+
+    text = metrics.to_prometheus()
+
+    assert "# TYPE task_manager_calls_total counter\n" in text
+    assert 'task_manager_calls_total{method="a\\"b",outcome="ok"} 2\n' in text
+    assert "# TYPE task_manager_smtp_send_seconds histogram\n" in text
+    assert 'task_manager_smtp_send_seconds_bucket{outcome="ok",le="0.5"} 1\n' in text
+    assert 'task_manager_smtp_send_seconds_bucket{outcome="ok",le="+Inf"} 1\n' in text
+    assert 'task_manager_smtp_send_seconds_sum{outcome="ok"} 0.25\n' in text
+    assert 'task_manager_smtp_send_seconds_count{outcome="ok"} 1\n' in text
+
+    metrics.reset()
+    snapshot = metrics.snapshot()
+    assert counter(snapshot, instrumentation.CALLS, method='a"b', outcome="ok") == 0
+    assert histogram(snapshot, instrumentation.SMTP_SEND, outcome="ok")["count"] == 0
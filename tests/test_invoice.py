@@ -63,3 +63,66 @@ def test_calculate_invoice_property(hours, rate, currency):
     result = task_manager.calculate_invoice(hours, rate, currency)
     expected = hours * rate
     assert isclose(result, expected, rel_tol=1e-7)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def invoice_backend(request, monkeypatch):
+    """
+    Запускает пакетные тесты с numpy и без него (чистый Python).
+    """
+    if request.param == "python":
+        monkeypatch.setattr(task_manager.services, "np", None)
+    elif task_manager.services.np is None:
+        pytest.skip("numpy не установлен")
+    return request.param
+
+
+def test_calculate_invoices_batch(invoice_backend):
+    """
+    Проверяет пакетный расчёт: суммы по строкам и итоги по валютам.
+    """
+    batch = task_manager.calculate_invoices(
+        [10, 2.5, 3, 0], [20, 100, 10, 50], ["USD", "EUR", "USD", "RUB"]
+    )
+
+    assert list(batch.amounts) == [200, 250, 30, 0]
+    assert batch.totals == {"USD": 230, "EUR": 250, "RUB": 0}
+
+
+def test_calculate_invoices_reports_all_errors(invoice_backend):
+    """
+    Проверяет, что все некорректные строки сообщаются одной ошибкой.
+    """
+    with pytest.raises(task_manager.services.InvoiceBatchError) as exc_info:
+        task_manager.calculate_invoices(
+            [1, -1, 2, 3], [10, 10, -5, 1], ["USD", "USD", "EUR", "XXX"]
+        )
+
+    errors = exc_info.value.errors
+    assert sorted(errors) == [1, 2, 3]
+    assert "XXX" in errors[3]
+    assert isinstance(exc_info.value, ValueError)
+
+
+def test_calculate_invoices_length_mismatch():
+    """
+    Проверяет, что последовательности разной длины отклоняются.
+    """
+    with pytest.raises(ValueError):
+        task_manager.calculate_invoices([1, 2], [1], ["USD", "USD"])
+
+
+def test_calculate_invoices_non_numeric(invoice_backend):
+    """
+    Проверяет, что нечисловые часы и ставки дают InvoiceBatchError
+    по строкам одинаково с numpy и без него.
+    """
+    with pytest.raises(task_manager.services.InvoiceBatchError) as exc_info:
+        task_manager.calculate_invoices(
+            [1, "2", None, 3], [10, 10, 10, "x"], ["USD", "USD", "EUR", "USD"]
+        )
+
+    errors = exc_info.value.errors
+    assert sorted(errors) == [1, 2, 3]
+    assert "часов" in errors[1] and "часов" in errors[2]
+    assert "Ставка" in errors[3]
@@ -0,0 +1,110 @@
+import pytest
+import sys
+import threading
+from datetime import date, datetime, timedelta
+
+from task_manager.ledger import TimeEntry, TimeLedger
+from task_manager.models import Project
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+from task_manager.services import InvoiceService, TaskService
+
+
+def test_ledger_rollups():
+    """
+    Проверяет итоги журнала по задаче, проекту и дням.
+    """
+    ledger = TimeLedger()
+    ledger.record(1, 10, 2.0, datetime(2031, 3, 1, 9))
+    ledger.record(1, 10, 1.5, datetime(2031, 3, 1, 18))
+    ledger.record(2, 10, 4.0, datetime(2031, 3, 15))
+    ledger.record(3, 20, 3.0, datetime(2031, 4, 2))
+
+    assert len(ledger) == 4
+    assert ledger.hours_for_task(1) == 3.5
+    assert ledger.hours_for_task(99) == 0.0
+    assert ledger.hours_for_project(10) == 7.5
+    assert ledger.hours_by_day(10) == {date(2031, 3, 1): 3.5, date(2031, 3, 15): 4.0}
+    assert ledger.hours_for_project(10, date(2031, 3, 2), date(2031, 3, 31)) == 4.0
+    assert ledger.hours_by_project(date(2031, 3, 1), date(2031, 3, 31)) == {10: 7.5, 20: 0}
+    assert ledger.hours_by_project() == {10: 7.5, 20: 3.0}
+    assert next(ledger.entries()) == TimeEntry(1, 10, 2.0, datetime(2031, 3, 1, 9))
+
+
+def test_ledger_rejected_record_leaves_columns_intact():
+    """
+    Проверяет, что запись с моментом с часовым поясом не меняет журнал.
+    """
+    ledger = TimeLedger()
+    with pytest.raises(ValueError):
+        ledger.record(1, 10, 2.0, datetime.now().astimezone())
+    ledger.record(1, 10, 1.0, datetime(2031, 3, 1))
+
+    assert len(ledger) == 1
+    assert list(ledger.entries()) == [TimeEntry(1, 10, 1.0, datetime(2031, 3, 1))]
+    assert ledger.hours_for_task(1) == 1.0
+
+
+def test_ledger_reads_while_recording():
+    """
+    Проверяет, что дневные итоги можно читать, пока другой поток
+    добавляет записи за новые дни и проекты.
+    """
+    ledger = TimeLedger()
+    start = datetime(2031, 1, 1)
+    errors = []
+    done = threading.Event()
+
+    def write():
+        for i in range(20000):
+            ledger.record(i, i % 50, 1.0, start + timedelta(hours=i))
+        done.set()
+
+    def read():
+        try:
+            while not done.is_set():
+                ledger.hours_by_day(1)
+                ledger.hours_by_project(date(2031, 1, 1), date(2034, 1, 1))
+        except Exception as exc:
+            errors.append(exc)
+
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=write), threading.Thread(target=read)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch)
+
+    assert errors == []
+    assert sum(ledger.hours_by_project(date(2031, 1, 1), date(2034, 1, 1)).values()) == 20000
+
+
+def test_track_time_writes_ledger_and_invoice():
+    """
+    Проверяет, что track_time пишет в журнал, а InvoiceService считает счёт по итогам.
+    """
+    ledger = TimeLedger()
+    project_repo = InMemoryProjectRepository()
+    service = TaskService(InMemoryTaskRepository(), project_repo, ledger=ledger)
+    first = project_repo.add_project(Project(name="Billed"))
+    second = project_repo.add_project(Project(name="Other"))
+    deadline = datetime.now() + timedelta(days=1)
+    tid = service.create_task(first, "Work", deadline)
+    other = service.create_task(second, "Side", deadline)
+
+    service.track_time(tid, 2.0)
+    service.track_time(tid, 3.0)
+    service.track_time(other, 1.0)
+
+    today = date.today()
+    invoices = InvoiceService()
+    assert ledger.hours_for_task(tid) == 5.0
+    assert invoices.invoice_from_ledger(ledger, first, 100, "USD", today, today) == 500
+    batch = invoices.invoices_from_ledger(ledger, {first: (100, "USD"), second: (50, "EUR")})
+    assert list(batch.amounts) == [500, 50]
+    assert batch.totals == {"USD": 500, "EUR": 50}
+    with pytest.raises(ValueError):
+        invoices.invoice_from_ledger(ledger, first, 100, "XXX")
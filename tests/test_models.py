@@ -0,0 +1,52 @@
+import pytest
+from datetime import datetime
+
+from task_manager.models import Project, Task, validate_task_columns
+
+
+def test_task_from_trusted_matches_constructor():
+    """
+    Проверяет, что Task.from_trusted и Task.from_rows дают те же объекты,
+    что и обычный конструктор.
+    """
+    deadline = datetime(2031, 1, 1)
+    task = Task(project_id=2, title="Trusted", deadline=deadline, hours_spent=1.5)
+    task.id = 7
+
+    assert Task.from_trusted(7, 2, "Trusted", deadline, 1.5) == task
+    assert Task.from_rows([(7, 2, "Trusted", deadline, 1.5)]) == [task]
+    project = Project(name="P", deadline=deadline)
+    project.id = 3
+    assert Project.from_trusted(3, "P", deadline) == project
+    assert Project.from_rows([(3, "P", deadline)]) == [project]
+
+
+def test_validate_task_columns_matches_post_init():
+    """
+    Проверяет, что пакетная проверка находит те же ошибки, что и __post_init__,
+    по одной (первой) на строку.
+    """
+    deadline = datetime(2031, 1, 1)
+    rows = [
+        (1, "Ok", deadline, 0.0),
+        ("1", "Bad project", deadline, 0.0),
+        (1, 5, deadline, 0.0),
+        (1, "   ", deadline, 0.0),
+        (1, "No deadline", "2031-01-01", 0.0),
+        (1, "Bad hours", deadline, "1"),
+        (1, "Negative", deadline, -1.0),
+        (1, "", None, -1.0),
+    ]
+    columns = [list(column) for column in zip(*rows)]
+
+    errors = validate_task_columns(*columns)
+
+    assert sorted(errors) == list(range(1, len(rows)))
+    for row, error in errors.items():
+        project_id, title, row_deadline, hours = rows[row]
+        with pytest.raises(type(error)) as expected:
+            Task(project_id=project_id, title=title, deadline=row_deadline, hours_spent=hours)
+        assert str(expected.value) == str(error)
+    assert validate_task_columns([1], ["Ok"], [deadline]) == {}
+    with pytest.raises(ValueError):
+        validate_task_columns([1, 2], ["Ok"], [deadline])
@@ -1,10 +1,11 @@
 import pytest
 import smtplib
+import threading
 import time
 from datetime import datetime, timedelta
 from aiosmtpd.controller import Controller
 
-from task_manager.notifications import NotificationService
+from task_manager.notifications import MessageTemplates, NotificationService
 
 
 class CaptureHandler:
@@ -89,3 +90,242 @@ def test_send_task_notification_smtp_failure(monkeypatch):
     task_info = {"title": "Error Test"}
     result = service.send_task_notification("test@example.com", task_info)
     assert result is False
+
+
+def test_send_task_notification_malformed_task_info():
+    """
+    Проверяет, что некорректный task_info даёт False, а не исключение.
+    """
+    service = NotificationService()
+    assert service.send_task_notification("test@example.com", None) is False
+
+
+class CountingSMTP(smtplib.SMTP):
+    """
+    SMTP-клиент, считающий открытые соединения.
+    """
+    connections = 0
+
+    def __init__(self, host, port):
+        type(self).connections += 1
+        super().__init__(host, port)
+
+
+@pytest.fixture
+def smtp_server():
+    """
+    Поднимает локальный SMTP-сервер aiosmtpd на время теста.
+    """
+    handler = CaptureHandler()
+    controller = Controller(handler, hostname='localhost', port=8026)
+    controller.start()
+    time.sleep(0.2)  # Дать серверу подняться
+    try:
+        yield handler
+    finally:
+        controller.stop()
+
+
+def test_send_task_notifications_reuses_connection(smtp_server):
+    """
+    Проверяет пакетную отправку через одно SMTP-соединение.
+
+    Ожидается: все корректные письма доставлены, некорректный адрес
+    отмечен False, соединение открыто один раз.
+    """
+    CountingSMTP.connections = 0
+    service = NotificationService(smtp_host='localhost', smtp_port=8026, mailer=CountingSMTP)
+    batch = [
+        ("first@example.com", {"title": "One"}),
+        ("bad-email", {"title": "Two"}),
+        ("second@example.com", {"title": "Three", "completed": True}),
+        ("third@example.com", {"title": "Four", "deadline": datetime.now() - timedelta(days=1)}),
+    ]
+
+    results = service.send_task_notifications(batch)
+
+    assert results == [True, False, True, True]
+    assert CountingSMTP.connections == 1
+    assert [m["to"] for m in smtp_server.messages] == [
+        ["first@example.com"], ["second@example.com"], ["third@example.com"]
+    ]
+    assert "завершена" in smtp_server.messages[1]["data"]
+    assert "просрочена" in smtp_server.messages[2]["data"]
+
+
+def test_send_task_notifications_reconnects():
+    """
+    Проверяет переподключение после обрыва соединения посреди пакета.
+
+    Первое соединение обрывается на втором письме; ожидается, что письмо
+    будет отправлено повторно через новое соединение.
+    """
+    sent = []
+
+    class FlakySMTP:
+        instances = 0
+
+        def __init__(self, host, port):
+            FlakySMTP.instances += 1
+            self.number = FlakySMTP.instances
+
+        def sendmail(self, sender, recipients, message):
+            if self.number == 1 and sent:
+                raise smtplib.SMTPServerDisconnected("connection lost")
+            sent.append(recipients[0])
+
+        def __exit__(self, *exc_info):
+            pass
+
+    service = NotificationService(mailer=FlakySMTP)
+    results = service.send_task_notifications(
+        [(f"user{i}@example.com", {"title": "T"}) for i in range(3)]
+    )
+
+    assert results == [True, True, True]
+    assert sent == ["user0@example.com", "user1@example.com", "user2@example.com"]
+    assert FlakySMTP.instances == 2
+
+
+def test_send_task_notifications_rejected_recipient():
+    """
+    Проверяет, что отказ сервера по одному письму не прерывает пакет и не вызывает переподключения.
+    """
+    class RejectingSMTP:
+        instances = 0
+
+        def __init__(self, host, port):
+            RejectingSMTP.instances += 1
+
+        def sendmail(self, sender, recipients, message):
+            if recipients[0].startswith("blocked"):
+                raise smtplib.SMTPRecipientsRefused({recipients[0]: (550, b"no")})
+
+        def __exit__(self, *exc_info):
+            pass
+
+    service = NotificationService(mailer=RejectingSMTP)
+    results = service.send_task_notifications([
+        ("blocked@example.com", {"title": "T"}),
+        ("ok@example.com", {"title": "T"}),
+    ])
+
+    assert results == [False, True]
+    assert RejectingSMTP.instances == 1
+
+
+def test_validate_emails_filters_in_one_pass():
+    """
+    Проверяет отбор корректных адресов с сохранением порядка.
+    """
+    service = NotificationService()
+    emails = ["a@example.com", "bad-email", "b@example.org", "no@tld", "a@example.com"]
+
+    assert service.validate_emails(emails) == ["a@example.com", "b@example.org", "a@example.com"]
+    assert service.validate_emails([]) == []
+
+
+def test_message_templates_cache_encoded_body():
+    """
+    Проверяет, что письмо из кэша шаблонов совпадает с собранным вручную,
+    а повторная отправка той же задачи берёт тело из кэша.
+    """
+    service = NotificationService()
+    now = datetime.now()
+    task_info = {"title": "Кэш", "deadline": now + timedelta(days=1)}
+
+    first = service._build_message("a@example.com", task_info, now)
+    second = service._build_message("b@example.com", task_info, now)
+
+    assert first == (
+        "From: no-reply@example.com\r\nTo: a@example.com\r\n"
+        "Subject: Notification: Task Update\r\n\r\n"
+        'Задача "Кэш" создана.'
+    ).encode("utf-8")
+    assert second == first.replace(b"a@example.com", b"b@example.com")
+    assert (len(service.templates), service.templates.misses) == (1, 1)
+
+
+def test_message_templates_eviction_from_threads():
+    """
+    Проверяет, что одновременное заполнение маленького кэша шаблонов
+    из нескольких потоков не ломает вытеснение.
+    """
+    templates = MessageTemplates(max_size=8)
+    errors = []
+
+    def render(offset):
+        try:
+            for i in range(2000):
+                templates.render("a@example.com", f"Задача {offset + i}", "создана")
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=render, args=(n * 10000,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(templates) <= 8
+
+
+def test_send_task_digest_one_email_per_recipient(smtp_server):
+    """
+    Проверяет дайджест: одно письмо на получателя со всеми его задачами.
+    """
+    service = NotificationService(smtp_host='localhost', smtp_port=8026)
+    overdue = {"title": "Old", "deadline": datetime.now() - timedelta(days=1)}
+    updates = [
+        ("a@example.com", {"title": "One"}),
+        ("b@example.com", {"title": "One"}),
+        ("a@example.com", overdue),
+        ("bad-email", {"title": "One"}),
+        ("a@example.com", {"title": "Done", "completed": True}),
+    ]
+
+    results = service.send_task_digest(updates)
+
+    assert results == {"a@example.com": True, "b@example.com": True, "bad-email": False}
+    assert len(smtp_server.messages) == 2
+    digest = next(m["data"] for m in smtp_server.messages if m["to"] == ["a@example.com"])
+    assert "Task Digest (3)" in digest
+    assert 'Задача "One" создана.' in digest
+    assert 'Задача "Old" просрочена.' in digest
+    assert 'Задача "Done" завершена.' in digest
+
+
+class MemorySMTP:
+    """
+    SMTP-клиент без сети: запоминает получателей.
+    """
+    sent = []
+
+    def __init__(self, host, port):
+        pass
+
+    def sendmail(self, sender, recipients, message):
+        type(self).sent.append(recipients[0])
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+def test_malformed_items_do_not_abort_batches():
+    """
+    Проверяет, что некорректный адрес или task_info в пакете и в дайджесте
+    даёт False только для своего получателя.
+    """
+    MemorySMTP.sent = []
+    service = NotificationService(mailer=MemorySMTP)
+
+    assert service.send_task_notification(42, {"title": "T"}) is False
+    assert service.send_task_notifications(
+        [(42, {"title": "T"}), ("a@example.com", None), ("b@example.com", {"title": "T"})]
+    ) == [False, False, True]
+    assert service.send_task_digest(
+        [("a@example.com", {"title": "T"}), ("a@example.com", None),
+         ("b@example.com", {"title": "T"})]
+    ) == {"a@example.com": False, "b@example.com": True}
+    assert MemorySMTP.sent == ["b@example.com", "b@example.com"]
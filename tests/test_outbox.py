@@ -0,0 +1,184 @@
+import smtplib
+import time
+from datetime import datetime, timedelta
+
+from task_manager.notifications import NotificationService
+from task_manager.outbox import NotificationOutbox
+
+
+class RecordingSMTP:
+    """
+    SMTP-клиент для тестов: записывает письма, а адреса из failures
+    отклоняет заданной ошибкой (по одному разу на каждый элемент списка).
+    """
+    sent = []
+    failures = {}
+
+    def __init__(self, host, port):
+        pass
+
+    def sendmail(self, sender, recipients, message):
+        errors = type(self).failures.get(recipients[0])
+        if errors:
+            raise errors.pop(0)
+        type(self).sent.append((recipients[0], message))
+        return {}
+
+    def __exit__(self, *exc):
+        pass
+
+
+def make_outbox(path=":memory:", clock=None, **kwargs):
+    RecordingSMTP.sent = []
+    RecordingSMTP.failures = {}
+    service = NotificationService(mailer=RecordingSMTP)
+    if clock is not None:
+        kwargs["clock"] = clock
+    return NotificationOutbox(service, path, **kwargs)
+
+
+TASK = {"title": "Outbox", "deadline": datetime.now() + timedelta(days=1)}
+
+
+def test_outbox_survives_restart_and_worker_drains(tmp_path):
+    """
+    Проверяет, что письма сохраняются в базе до отправки,
+    а фоновый воркер после перезапуска доставляет их все.
+    """
+    path = str(tmp_path / "outbox.db")
+    outbox = make_outbox(path)
+    ids = outbox.enqueue_many([("a@example.com", TASK), ("bad-email", TASK),
+                               ("b@example.com", TASK)])
+    outbox.close()
+    assert ids[1] is None and None not in (ids[0], ids[2])
+    assert RecordingSMTP.sent == []
+
+    with NotificationOutbox(NotificationService(mailer=RecordingSMTP), path,
+                            poll_interval=0.05) as restarted:
+        deadline = time.monotonic() + 5
+        while restarted.metrics().depth and time.monotonic() < deadline:
+            time.sleep(0.01)
+        metrics = restarted.metrics()
+
+    assert [email for email, _ in RecordingSMTP.sent] == ["a@example.com", "b@example.com"]
+    assert 'Задача "Outbox" создана.'.encode() in RecordingSMTP.sent[0][1]
+    assert (metrics.depth, metrics.sent, metrics.dead) == (0, 2, 0)
+    assert metrics.latency_max >= metrics.latency_p50 >= 0
+
+
+def test_outbox_retries_then_dead_letters():
+    """
+    Проверяет повтор временной ошибки с задержкой, перенос в dead letters
+    после отказа 5xx и после исчерпания попыток, а также возврат в очередь.
+    """
+    now = [1000.0]
+    outbox = make_outbox(clock=lambda: now[0], max_attempts=3, backoff=10)
+    RecordingSMTP.failures = {
+        # SMTPSession сам повторяет обрыв соединения один раз,
+        # поэтому неудачная попытка очереди — это два обрыва подряд.
+        "flaky@example.com": [smtplib.SMTPServerDisconnected("drop")] * 2,
+        "rejected@example.com": [smtplib.SMTPResponseException(550, b"no such user")],
+        "down@example.com": [smtplib.SMTPServerDisconnected("down")] * 6,
+    }
+    outbox.enqueue_many([(email, TASK) for email in RecordingSMTP.failures])
+
+    assert outbox.drain() == 3
+    assert outbox.metrics().depth == 2
+    assert outbox.drain() == 0  # повторы ещё не наступили
+    now[0] += 10
+    outbox.drain()
+    now[0] += 20
+    outbox.drain()
+
+    metrics = outbox.metrics()
+    assert [email for email, _ in RecordingSMTP.sent] == ["flaky@example.com"]
+    assert (metrics.depth, metrics.dead, metrics.sent, metrics.retried) == (0, 2, 1, 3)
+    dead = {letter.email: letter for letter in outbox.dead_letters()}
+    assert dead["rejected@example.com"].attempts == 1
+    assert "550" in dead["rejected@example.com"].last_error
+    assert dead["down@example.com"].attempts == 3
+
+    assert outbox.requeue_dead_letters() == 2
+    outbox.drain()
+    assert len(RecordingSMTP.sent) == 3
+    assert outbox.metrics().dead == 0
+    outbox.close()
+
+
+def test_outbox_dead_letters_with_reused_ids():
+    """
+    Проверяет, что письма с повторно выданным ID очереди
+    оба попадают в dead letters.
+    """
+    outbox = make_outbox()
+    rejected = smtplib.SMTPResponseException(550, b"no such user")
+    RecordingSMTP.failures = {"a@example.com": [rejected], "b@example.com": [rejected]}
+
+    first = outbox.enqueue("a@example.com", TASK)
+    outbox.drain()
+    second = outbox.enqueue("b@example.com", TASK)
+    outbox.drain()
+
+    assert first == second
+    dead = outbox.dead_letters()
+    assert [letter.email for letter in dead] == ["a@example.com", "b@example.com"]
+    assert [letter.outbox_id for letter in dead] == [first, first]
+    assert outbox.metrics().depth == 0
+    outbox.close()
+
+
+def test_outbox_skips_malformed_task_info():
+    """
+    Проверяет, что письмо, которое не удалось собрать, получает None,
+    а остальные письма пакета сохраняются.
+    """
+    outbox = make_outbox()
+    ids = outbox.enqueue_many([("a@example.com", TASK), ("b@example.com", None),
+                               (42, TASK), ("c@example.com", TASK)])
+
+    assert ids[1] is None and ids[2] is None and None not in (ids[0], ids[3])
+    assert outbox.drain() == 2
+    assert [email for email, _ in RecordingSMTP.sent] == ["a@example.com", "c@example.com"]
+    outbox.close()
+
+
+def test_outbox_worker_survives_unexpected_error(caplog):
+    """
+    Проверяет, что неожиданная ошибка воркера записывается в лог,
+    а воркер продолжает доставлять письма.
+    """
+    outbox = make_outbox(poll_interval=0.05)
+    open_session = outbox._service.open_session
+    calls = []
+
+    def failing_once():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("сбой")
+        return open_session()
+
+    outbox._service.open_session = failing_once
+    outbox.enqueue("a@example.com", TASK)
+    with outbox:
+        deadline = time.monotonic() + 5
+        while outbox.metrics().depth and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert [email for email, _ in RecordingSMTP.sent] == ["a@example.com"]
+    assert "сбой" in caplog.text
+
+
+def test_outbox_rate_limit():
+    """
+    Проверяет ограничение скорости отправки.
+    """
+    outbox = make_outbox(rate_limit=50)
+    outbox.enqueue_many([(f"user{i}@example.com", TASK) for i in range(60)])
+
+    start = time.monotonic()
+    outbox.drain()
+    elapsed = time.monotonic() - start
+
+    assert len(RecordingSMTP.sent) == 60
+    assert elapsed >= 0.15
+    outbox.close()
@@ -0,0 +1,74 @@
+import pytest
+from datetime import datetime, timedelta
+from math import isclose
+
+from task_manager.columnar import ColumnarTaskRepository
+from task_manager.models import Task
+from task_manager.parallel_invoicing import ParallelInvoiceEngine
+from task_manager.repositories import InMemoryTaskRepository
+from task_manager.services import InvoiceBatchError
+
+
+@pytest.fixture
+def task_repo():
+    repo = InMemoryTaskRepository()
+    deadline = datetime.now() + timedelta(days=1)
+    for project_id in range(1, 6):
+        for i in range(project_id * 3):
+            repo.add_task(Task(project_id=project_id, title=f"T{i}",
+                               deadline=deadline, hours_spent=float(i % 4)))
+    return repo
+
+
+BILLING = {1: (10, "USD"), 2: (20, "EUR"), 3: (30, "USD"), 4: (5, "RUB"), 5: (0, "GBP")}
+
+
+def expected_totals(repo):
+    project_totals = {
+        pid: sum(t.hours_spent for t in repo.list_by_project(pid)) * rate
+        for pid, (rate, _) in BILLING.items()
+    }
+    totals = {}
+    for pid, (_, currency) in BILLING.items():
+        totals[currency] = totals.get(currency, 0.0) + project_totals[pid]
+    return project_totals, totals
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_invoices_match_sequential(task_repo, workers):
+    """
+    Проверяет, что параллельный расчёт совпадает с последовательным.
+    """
+    run = ParallelInvoiceEngine(max_workers=workers).run(task_repo, BILLING)
+    project_totals, totals = expected_totals(task_repo)
+
+    assert run.project_totals.keys() == project_totals.keys()
+    assert all(isclose(run.project_totals[p], project_totals[p]) for p in project_totals)
+    assert run.totals.keys() == totals.keys()
+    assert all(isclose(run.totals[c], totals[c]) for c in totals)
+
+
+def test_parallel_invoices_reject_invalid_billing(task_repo):
+    """
+    Проверяет, что некорректные ставки и валюты сообщаются по ID проекта до запуска пула.
+    """
+    with pytest.raises(InvoiceBatchError) as exc_info:
+        ParallelInvoiceEngine(max_workers=2).run(task_repo, {1: (-1, "USD"), 2: (1, "XXX")})
+    assert sorted(exc_info.value.errors) == [1, 2]
+
+
+def test_parallel_invoices_columnar_fast_path(task_repo):
+    """
+    Проверяет расчёт по колоночному хранилищу через project_hours.
+    """
+    columnar = ColumnarTaskRepository()
+    columnar.add_tasks(
+        Task(project_id=t.project_id, title=t.title, deadline=t.deadline, hours_spent=t.hours_spent)
+        for pid in BILLING for t in task_repo.list_by_project(pid)
+    )
+
+    run = ParallelInvoiceEngine(max_workers=2).run(columnar, BILLING)
+    project_totals, _ = expected_totals(task_repo)
+
+    assert list(columnar.project_hours(2)) == [t.hours_spent for t in task_repo.list_by_project(2)]
+    assert all(isclose(run.project_totals[p], project_totals[p]) for p in project_totals)
@@ -0,0 +1,120 @@
+import re
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from task_manager import profiling
+from task_manager.models import Project
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+from task_manager.services import TaskService
+
+COLLAPSED_LINE = re.compile(r"^[^;\n]+(;[^;\n]+)* \d+$")
+
+
+def workload(seconds=None, count=2000):
+    """Создание задач и учёт времени; с seconds — не меньше заданного времени."""
+    projects = InMemoryProjectRepository()
+    project_id = projects.add_project(Project(name="Проект"))
+    service = TaskService(InMemoryTaskRepository(), projects)
+    deadline = datetime.now() + timedelta(days=1)
+    stop_at = time.perf_counter() + (seconds or 0)
+    done = 0
+    while done < count or time.perf_counter() < stop_at:
+        task_id = service.create_task(project_id, f"Задача {done}", deadline)
+        service.track_time(task_id, 1.0)
+        done += 1
+
+
+def test_module_group():
+    """Подмодули task_manager группируются по имени, остальное — по пакету."""
+    assert profiling.module_group("task_manager.services:TaskService.create_task") == "services"
+    assert profiling.module_group("task_manager:create_task") == "task_manager"
+    assert profiling.module_group("sqlite3.dbapi2:connect") == "sqlite3"
+    assert profiling.module_group("<frozen importlib._bootstrap>:_find_and_load") == "importlib"
+    assert profiling.module_group("__main__:main", "load") == "load"
+    assert profiling.module_group("__main__:main") == "__main__"
+
+
+def test_cprofile_mode_aggregates_by_module(tmp_path):
+    """cProfile: время по модулям task_manager и стеки до TaskService.create_task."""
+    output = tmp_path / "stacks.txt"
+
+    with profiling.profile("cprofile", output=str(output)) as result:
+        workload()
+
+    modules = result.by_module()
+    assert {"services", "repositories", "models"} <= set(modules)
+    assert modules["services"].total_time >= modules["repositories"].self_time
+    assert result.stats is not None
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert lines and all(COLLAPSED_LINE.match(line) for line in lines)
+    assert any("task_manager.services:create_task" in line for line in lines)
+
+
+def test_sampling_mode_collects_stacks_of_calling_thread(tmp_path):
+    """Выборочный режим: стеки начинаются с вызывающего кода и доходят до сервисов."""
+    output = tmp_path / "stacks.txt"
+
+    with profiling.profile("sampling", interval=0.001, output=str(output)) as result:
+        workload(seconds=0.3)
+
+    assert result.samples > 0
+    assert result.duration >= 0.3
+    assert "services" in result.by_module()
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert all(COLLAPSED_LINE.match(line) for line in lines)
+    # Кадры над блоком with отрезаны: корень — эта тестовая функция.
+    assert all(line.startswith("test_profiling:test_sampling_mode") for line in lines)
+    assert "TaskService.create_task" in "".join(lines)
+
+
+def test_unknown_mode_rejected():
+    """Неизвестный режим — ValueError."""
+    with pytest.raises(ValueError):
+        with profiling.profile("perf"):
+            pass
+
+
+def test_cli_profiles_script(tmp_path, capsys):
+    """CLI запускает скрипт под профилировщиком и пишет стеки и отчёт по модулям."""
+    script = tmp_path / "load.py"
+    script.write_text(
+        "from datetime import datetime, timedelta\n"
+        "import task_manager\n"
+        "from task_manager.models import Project\n"
+        "pid = task_manager.project_repo.add_project(Project(name='P'))\n"
+        "for i in range(500):\n"
+        "    task_manager.create_task(pid, 'T', datetime.now() + timedelta(days=1))\n"
+        "task_manager.task_repo.clear()\n"
+        "task_manager.project_repo.clear()\n",
+        encoding="utf-8",
+    )
+    output = tmp_path / "stacks.txt"
+
+    profiling.main(["--mode", "cprofile", "--output", str(output), str(script)])
+
+    assert "services" in capsys.readouterr().out
+    assert output.read_text(encoding="utf-8").strip()
+
+
+def test_cli_groups_main_by_script_and_propagates_exit_code(tmp_path, capsys):
+    """Кадры __main__ учитываются под именем скрипта; ненулевой код выхода сохраняется."""
+    script = tmp_path / "failing.py"
+    script.write_text(
+        "import sys, time\n"
+        "stop = time.perf_counter() + 0.2\n"
+        "while time.perf_counter() < stop:\n"
+        "    sum(range(1000))\n"
+        "sys.exit(3)\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        profiling.main(["--interval", "0.001", "--output", str(tmp_path / "stacks.txt"),
+                        str(script)])
+
+    assert exit_info.value.code == 3
+    out = capsys.readouterr().out
+    assert "failing" in out and "__main__" not in out
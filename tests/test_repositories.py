@@ -0,0 +1,189 @@
+import pytest
+from datetime import datetime, timedelta
+
+from task_manager.models import Project, Task
+from task_manager.repositories import (
+    InMemoryProjectRepository,
+    InMemoryTaskRepository,
+    ProjectRepository,
+    TaskRepository,
+)
+from task_manager.services import TaskService
+
+
+def test_list_by_project_uses_index():
+    """
+    Проверяет выборку задач по проекту.
+
+    Ожидается: возвращаются только задачи нужного проекта в порядке добавления.
+    """
+    repo = InMemoryTaskRepository()
+    deadline = datetime.now() + timedelta(days=1)
+    first = repo.add_task(Task(project_id=1, title="A", deadline=deadline))
+    repo.add_task(Task(project_id=2, title="B", deadline=deadline))
+    third = repo.add_task(Task(project_id=1, title="C", deadline=deadline))
+
+    assert [t.id for t in repo.list_by_project(1)] == [first, third]
+    assert repo.list_by_project(42) == []
+
+
+def test_list_due_before_and_overdue():
+    """
+    Проверяет выборку по дедлайну и список просроченных задач.
+
+    Ожидается: задачи упорядочены по дедлайну, граница не включается.
+    """
+    repo = InMemoryTaskRepository()
+    now = datetime(2030, 1, 10, 12, 0)
+    late = repo.add_task(Task(project_id=1, title="Late", deadline=now + timedelta(days=2)))
+    early = repo.add_task(Task(project_id=1, title="Early", deadline=now - timedelta(days=2)))
+    middle = repo.add_task(Task(project_id=1, title="Middle", deadline=now - timedelta(hours=1)))
+    repo.add_task(Task(project_id=1, title="Exact", deadline=now))
+
+    assert [t.id for t in repo.list_due_before(now)] == [early, middle]
+    assert [t.id for t in repo.list_overdue(now)] == [early, middle]
+    assert late not in [t.id for t in repo.list_due_before(now + timedelta(days=1))]
+
+
+def test_update_task_keeps_indexes_consistent():
+    """
+    Проверяет, что update_task переносит задачу между индексами.
+
+    Ожидается: после смены проекта и дедлайна выборки отражают новые значения.
+    """
+    repo = InMemoryTaskRepository()
+    now = datetime(2030, 1, 10)
+    tid = repo.add_task(Task(project_id=1, title="Move", deadline=now + timedelta(days=1)))
+
+    task = repo.get_task(tid)
+    task.project_id = 2
+    task.deadline = now - timedelta(days=1)
+    repo.update_task(task)
+
+    assert repo.list_by_project(1) == []
+    assert [t.id for t in repo.list_by_project(2)] == [tid]
+    assert [t.id for t in repo.list_overdue(now)] == [tid]
+
+
+def test_update_task_not_found():
+    """
+    Проверяет, что update_task для неизвестной задачи бросает KeyError.
+    """
+    repo = InMemoryTaskRepository()
+    task = Task(project_id=1, title="Ghost", deadline=datetime.now())
+    task.id = 777
+    with pytest.raises(KeyError):
+        repo.update_task(task)
+
+
+def test_track_time_and_clear_keep_indexes():
+    """
+    Проверяет согласованность индексов после track_time и clear.
+
+    Ожидается: track_time не ломает выборку, clear очищает индексы.
+    """
+    task_repo = InMemoryTaskRepository()
+    project_repo = InMemoryProjectRepository()
+    service = TaskService(task_repo, project_repo)
+    pid = project_repo.add_project(Project(name="Indexed"))
+    tid = service.create_task(pid, "Work", datetime.now() + timedelta(days=1))
+
+    service.track_time(tid, 2.5)
+
+    tasks = task_repo.list_by_project(pid)
+    assert [t.id for t in tasks] == [tid]
+    assert tasks[0].hours_spent == 2.5
+
+    task_repo.clear()
+    assert task_repo.list_by_project(pid) == []
+    assert task_repo.list_due_before(datetime.max) == []
+
+
+class MinimalTaskRepository(TaskRepository):
+    """
+    Сторонний репозиторий, реализующий только исходные методы интерфейса.
+    """
+
+    def __init__(self):
+        self.tasks = {}
+
+    def add_task(self, task):
+        task.id = len(self.tasks) + 1
+        self.tasks[task.id] = task
+        return task.id
+
+    def get_task(self, task_id):
+        return self.tasks[task_id]
+
+    def clear(self):
+        self.tasks.clear()
+
+
+class MinimalProjectRepository(ProjectRepository):
+    def __init__(self):
+        self.projects = {}
+
+    def add_project(self, project):
+        project.id = len(self.projects) + 1
+        self.projects[project.id] = project
+        return project.id
+
+    def get_project(self, project_id):
+        return self.projects[project_id]
+
+    def clear(self):
+        self.projects.clear()
+
+
+def test_minimal_repositories_use_default_methods():
+    """
+    Проверяет, что репозитории только с add/get/clear создаются и работают
+    с TaskService, а перебор без реализации даёт NotImplementedError.
+    """
+    tasks, projects = MinimalTaskRepository(), MinimalProjectRepository()
+    service = TaskService(tasks, projects)
+    pid = projects.add_project(Project(name="P"))
+    tid = service.create_task(pid, "Old", datetime.now() + timedelta(days=1))
+
+    assert service.track_time(tid, 2.0) == 2.0
+    with pytest.raises(KeyError):
+        tasks.update_task(Task(project_id=pid, title="Ghost", deadline=datetime.now()))
+    with pytest.raises(NotImplementedError):
+        list(tasks.iter_tasks())
+    with pytest.raises(NotImplementedError):
+        tasks.list_by_project(pid)
+    with pytest.raises(NotImplementedError):
+        list(projects.iter_projects())
+
+    renamed = Project(name="Renamed")
+    renamed.id = pid
+    added = Project(name="Second")
+    added.id = pid + 1
+    projects.restore_projects([renamed, added])
+    assert [projects.get_project(i).name for i in (pid, pid + 1)] == ["Renamed", "Second"]
+
+
+def test_default_queries_and_restore_over_iter_tasks():
+    """
+    Проверяет выборки и восстановление по умолчанию поверх iter_tasks.
+    """
+    class IterableTaskRepository(MinimalTaskRepository):
+        def iter_tasks(self):
+            return iter(list(self.tasks.values()))
+
+    repo = IterableTaskRepository()
+    now = datetime(2031, 1, 10)
+    late = repo.add_task(Task(project_id=1, title="Late", deadline=now - timedelta(days=1)))
+    early = repo.add_task(Task(project_id=2, title="Early", deadline=now - timedelta(days=2)))
+    repo.add_task(Task(project_id=1, title="Future", deadline=now + timedelta(days=1)))
+
+    assert [t.title for t in repo.list_by_project(1)] == ["Late", "Future"]
+    assert [t.id for t in repo.list_due_before(now)] == [early, late]
+
+    restored = IterableTaskRepository()
+    restored.restore_tasks(repo.iter_tasks())
+    assert [t.title for t in restored.iter_tasks()] == ["Late", "Early", "Future"]
+    gap = Task(project_id=1, title="Gap", deadline=now)
+    gap.id = 10
+    with pytest.raises(ValueError):
+        restored.restore_tasks([gap])
@@ -0,0 +1,133 @@
+import run_report
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def make_tree(root):
+    """Маленький проект: пакет, два модуля и три теста с разными зависимостями."""
+    write(root / "task_manager" / "__init__.py", "from task_manager.services import Service\n")
+    write(root / "task_manager" / "models.py", "class Task: pass\n")
+    write(root / "task_manager" / "services.py", "from .models import Task\nclass Service: pass\n")
+    write(root / "task_manager" / "invoice.py", "def total(): return 0\n")
+    write(root / "tests" / "conftest.py", "")
+    write(root / "tests" / "test_models.py", "from task_manager.models import Task\n")
+    write(root / "tests" / "test_api.py", "import task_manager\n")
+    write(root / "tests" / "test_invoice.py", "from task_manager import invoice\n")
+
+
+def test_affected_tests_follow_imports_transitively(tmp_path, monkeypatch):
+    """Изменение модели задевает тесты, импортирующие её напрямую и через пакет."""
+    make_tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    hashes = run_report.source_hashes()
+
+    assert run_report.affected_tests({"task_manager/models.py"}, hashes) == [
+        "tests/test_api.py", "tests/test_models.py",
+    ]
+    assert run_report.affected_tests({"task_manager/invoice.py"}, hashes) == [
+        "tests/test_invoice.py",
+    ]
+    assert run_report.affected_tests({"tests/test_api.py"}, hashes) == ["tests/test_api.py"]
+
+
+def test_conftest_change_requires_full_run(tmp_path, monkeypatch):
+    """Изменённый conftest.py влияет на все тесты — выбирается полный прогон."""
+    make_tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    assert run_report.affected_tests({"tests/conftest.py"}, run_report.source_hashes()) is None
+
+
+def test_deleted_module_requires_full_run(tmp_path, monkeypatch):
+    """Удалённый модуль: импортёров по текущим исходникам не найти — полный прогон."""
+    make_tree(tmp_path)
+    (tmp_path / "task_manager" / "invoice.py").unlink()
+    monkeypatch.chdir(tmp_path)
+
+    assert run_report.affected_tests({"task_manager/invoice.py"},
+                                     run_report.source_hashes()) is None
+
+
+def test_partial_run_keeps_full_report(tmp_path, monkeypatch):
+    """Прогон части тестов пишет отдельный отчёт и покрытие, полный — основной."""
+    monkeypatch.setattr(run_report, "LOG", str(tmp_path / "log.txt"))
+    calls = []
+    monkeypatch.setattr(run_report, "run", lambda cmd: calls.append(cmd) or 0)
+
+    assert run_report.run_pytest("python", ["tests/test_api.py"])
+    assert run_report.run_pytest("python")
+
+    partial, full = calls
+    assert "--html=report_partial.html" in partial
+    assert "--cov-report=json:coverage_partial.json" in partial
+    assert partial[-1] == "tests/test_api.py"
+    assert "--html=report.html" in full
+    assert "--cov-report=json:coverage.json" in full
+
+
+def test_failing_tests_give_nonzero_exit_code(tmp_path, monkeypatch):
+    """Упавшие тесты — код выхода 1, состояние прогона не сохраняется."""
+    make_tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run_report, "LOG", str(tmp_path / "log.txt"))
+    monkeypatch.setattr(run_report, "install_requirements", lambda pip: True)
+    monkeypatch.setattr(run_report, "run_pytest", lambda python, tests=None: False)
+    monkeypatch.setattr(run_report.webbrowser, "open", lambda url: None)
+    write(tmp_path / "venv" / "bin" / "python", "")
+    args = run_report.argparse.Namespace(full=True, no_bench=True, update_baseline=False,
+                                         threshold=0.25)
+
+    assert run_report.build_report(args) == 1
+    assert not (tmp_path / run_report.STATE_FILE).exists()
+
+
+def test_update_baseline_runs_without_source_changes(tmp_path, monkeypatch):
+    """--update-baseline и новый порог перезапускают бенчмарки и без изменений исходников."""
+    make_tree(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run_report, "LOG", str(tmp_path / "log.txt"))
+    monkeypatch.setattr(run_report, "install_requirements", lambda pip: True)
+    monkeypatch.setattr(run_report, "run_pytest", lambda python, tests=None: True)
+    monkeypatch.setattr(run_report.webbrowser, "open", lambda url: None)
+    benchmarks = []
+    monkeypatch.setattr(run_report, "run_benchmarks",
+                        lambda python, scales: benchmarks.append(scales) or True)
+    monkeypatch.setattr(run_report, "check_performance",
+                        lambda threshold, update: benchmarks.append((threshold, update)) or True)
+    write(tmp_path / "venv" / "bin" / "python", "")
+    write(tmp_path / run_report.REPORT_FILE, "")
+    args = run_report.argparse.Namespace(full=False, no_bench=False, update_baseline=False,
+                                         threshold=0.25, bench_scales="1k")
+    run_report.save_state(run_report.source_hashes(), run_report.run_settings(args))
+
+    assert run_report.build_report(args) == 0
+    assert benchmarks == []
+
+    args.update_baseline = True
+    assert run_report.build_report(args) == 0
+    assert benchmarks == ["1k", (0.25, True)]
+
+    args.update_baseline, args.threshold = False, 0.1
+    assert run_report.build_report(args) == 0
+    assert benchmarks[-1] == (0.1, False)
+
+
+def test_requirements_install_skipped_when_hash_unchanged(tmp_path, monkeypatch):
+    """pip запускается только при изменении requirements.txt."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run_report, "LOG", str(tmp_path / "log.txt"))
+    (tmp_path / "venv").mkdir()
+    write(tmp_path / "requirements.txt", "pytest\n")
+    calls = []
+    monkeypatch.setattr(run_report, "run", lambda cmd: calls.append(cmd) or 0)
+
+    assert run_report.install_requirements("pip")
+    assert run_report.install_requirements("pip")
+    assert len(calls) == 1
+
+    write(tmp_path / "requirements.txt", "pytest\nhypothesis\n")
+    assert run_report.install_requirements("pip")
+    assert len(calls) == 2
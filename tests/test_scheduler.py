@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+
+from task_manager.models import Project, Task
+from task_manager.notifications import NotificationService
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+from task_manager.scheduler import DeadlineScheduler, OverdueItem
+from task_manager.services import TaskService
+
+
+class FakeSession:
+    """SMTP-сессия без сети: запоминает письма."""
+
+    def __init__(self, sent):
+        self.sent = sent
+
+    def sendmail(self, sender, recipients, message):
+        self.sent.append(message)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+def make_task(task_id, title, deadline):
+    task = Task(project_id=1, title=title, deadline=deadline)
+    task.id = task_id
+    return task
+
+
+def test_pop_newly_overdue_once():
+    """
+    Проверяет, что просроченные элементы возвращаются по одному разу и по порядку дедлайнов.
+    """
+    now = datetime(2031, 1, 10, 12, 0)
+    scheduler = DeadlineScheduler()
+    scheduler.schedule_task(make_task(1, "Later", now + timedelta(hours=1)))
+    scheduler.schedule_task(make_task(2, "Second", now - timedelta(minutes=5)))
+    scheduler.schedule_task(make_task(3, "First", now - timedelta(hours=1)))
+    project = Project(name="Proj", deadline=now - timedelta(minutes=30))
+    project.id = 1
+    scheduler.schedule_project(project)
+
+    overdue = scheduler.pop_newly_overdue(now)
+
+    assert [(i.kind, i.item_id) for i in overdue] == [("task", 3), ("project", 1), ("task", 2)]
+    assert scheduler.pop_newly_overdue(now) == []
+    assert len(scheduler) == 1
+    assert scheduler.next_deadline() == now + timedelta(hours=1)
+    assert [i.item_id for i in scheduler.pop_newly_overdue(now + timedelta(hours=2))] == [1]
+
+
+def test_reschedule_and_cancel():
+    """
+    Проверяет перенос дедлайна и снятие с расписания.
+    """
+    now = datetime(2031, 1, 10)
+    scheduler = DeadlineScheduler()
+    task = make_task(1, "Moved", now - timedelta(days=1))
+    scheduler.schedule_task(task)
+    task.deadline = now + timedelta(days=1)
+    scheduler.schedule_task(task)
+    scheduler.schedule_task(make_task(2, "Cancelled", now - timedelta(days=1)))
+    scheduler.cancel(DeadlineScheduler.TASK, 2)
+    project = Project(name="NoDeadline")
+    project.id = 5
+    scheduler.schedule_project(project)
+
+    assert scheduler.pop_newly_overdue(now) == []
+    assert scheduler.next_deadline() == now + timedelta(days=1)
+    assert len(scheduler) == 1
+
+
+def test_rescheduling_keeps_heap_compact():
+    """
+    Проверяет, что многократный перенос и снятие не раздувают кучу.
+    """
+    now = datetime(2031, 1, 10)
+    scheduler = DeadlineScheduler()
+    task = make_task(1, "Moving", now)
+    for minutes in range(10000):
+        task.deadline = now + timedelta(minutes=minutes)
+        scheduler.schedule_task(task)
+    for task_id in range(2, 1000):
+        scheduler.schedule_task(make_task(task_id, "Cancelled", now))
+        scheduler.cancel(DeadlineScheduler.TASK, task_id)
+
+    assert len(scheduler) == 1
+    assert len(scheduler._heap) <= max(DeadlineScheduler.COMPACT_MIN_SIZE, 2 * len(scheduler))
+    assert scheduler.next_deadline() == now + timedelta(minutes=9999)
+
+
+def test_notify_overdue_uses_given_now():
+    """
+    Проверяет, что статус письма считается относительно переданного now.
+    """
+    now = datetime.now() + timedelta(days=2)
+    scheduler = DeadlineScheduler()
+    scheduler.schedule_task(make_task(1, "Tomorrow", datetime.now() + timedelta(days=1)))
+    service = NotificationService()
+    sent = []
+    service.open_session = lambda: FakeSession(sent)
+
+    results = scheduler.notify_overdue(service, lambda item: ["a@example.com"], now)
+
+    assert [ok for _, _, ok in results] == [True]
+    assert 'Задача "Tomorrow" просрочена.'.encode() in sent[0]
+
+
+def test_notify_overdue_sends_only_new_items():
+    """
+    Проверяет, что уведомления уходят только по элементам, просроченным с прошлого тика.
+    """
+    sent = []
+
+    class FakeNotifications:
+        def send_task_notifications(self, notifications, now=None):
+            notifications = list(notifications)
+            sent.extend(notifications)
+            return [True] * len(notifications)
+
+    now = datetime(2031, 1, 10)
+    scheduler = DeadlineScheduler()
+    scheduler.schedule_task(make_task(1, "Due", now - timedelta(minutes=1)))
+    scheduler.schedule_task(make_task(2, "Future", now + timedelta(minutes=1)))
+    recipients = lambda item: [f"owner{item.item_id}@example.com"]
+
+    results = scheduler.notify_overdue(FakeNotifications(), recipients, now)
+
+    assert results == [
+        (OverdueItem("task", 1, "Due", now - timedelta(minutes=1)), "owner1@example.com", True)
+    ]
+    assert sent[0][1]["title"] == "Due"
+    assert scheduler.notify_overdue(FakeNotifications(), recipients, now) == []
+
+
+def test_task_service_schedules_new_tasks():
+    """
+    Проверяет, что TaskService ставит созданные задачи в расписание.
+    """
+    scheduler = DeadlineScheduler()
+    project_repo = InMemoryProjectRepository()
+    service = TaskService(InMemoryTaskRepository(), project_repo, scheduler=scheduler)
+    pid = project_repo.add_project(Project(name="Scheduled"))
+    deadline = datetime.now() + timedelta(hours=1)
+
+    tid = service.create_task(pid, "One", deadline)
+    service.create_tasks([(pid, "Two", deadline + timedelta(hours=1))])
+
+    assert len(scheduler) == 2
+    overdue = scheduler.pop_newly_overdue(deadline + timedelta(minutes=1))
+    assert [i.item_id for i in overdue] == [tid]
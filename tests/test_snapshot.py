@@ -0,0 +1,80 @@
+import pytest
+from datetime import datetime, timedelta
+
+from task_manager.columnar import ColumnarTaskRepository
+from task_manager.models import Project, Task
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+from task_manager.snapshot import load_projects, load_tasks, save_projects, save_tasks
+from task_manager.sqlite_repositories import SQLiteTaskRepository, connect
+
+
+def make_tasks():
+    base = datetime(2031, 3, 1, 8, 15, 0, 250)
+    return [
+        Task(project_id=1, title="Первая", deadline=base, hours_spent=1.5),
+        Task(project_id=2, title="Second", deadline=base - timedelta(days=2)),
+        Task(project_id=1, title="Третья", deadline=base + timedelta(hours=3), hours_spent=4.0),
+    ]
+
+
+def fields(tasks):
+    return [(t.id, t.project_id, t.title, t.deadline, t.hours_spent) for t in tasks]
+
+
+@pytest.mark.parametrize("source_factory", [InMemoryTaskRepository, ColumnarTaskRepository])
+@pytest.mark.parametrize("target_factory", [
+    lambda: None,
+    InMemoryTaskRepository,
+    lambda: SQLiteTaskRepository(connect()),
+])
+def test_tasks_snapshot_roundtrip(tmp_path, source_factory, target_factory):
+    """
+    Проверяет, что снимок задач восстанавливается без потерь
+    в любой репозиторий, а выборки и выдача ID работают после загрузки.
+    """
+    source = source_factory()
+    source.add_tasks(make_tasks())
+    path = str(tmp_path / "tasks.snap")
+
+    assert save_tasks(source, path) == 3
+    restored = load_tasks(path, target_factory())
+
+    assert fields(restored.iter_tasks()) == fields(source.iter_tasks())
+    assert [t.id for t in restored.list_by_project(1)] == [1, 3]
+    assert [t.id for t in restored.list_overdue(datetime(2031, 3, 1))] == [2]
+    new_id = restored.add_task(Task(project_id=1, title="New", deadline=datetime(2032, 1, 1)))
+    assert new_id == 4
+
+
+def test_projects_snapshot_roundtrip(tmp_path):
+    """
+    Проверяет снимок проектов, включая проект без дедлайна.
+    """
+    source = InMemoryProjectRepository()
+    source.add_project(Project(name="С дедлайном", deadline=datetime(2031, 1, 1)))
+    source.add_project(Project(name="Без дедлайна"))
+    path = str(tmp_path / "projects.snap")
+
+    save_projects(source, path)
+    restored = load_projects(path)
+
+    assert [(p.id, p.name, p.deadline) for p in restored.iter_projects()] == [
+        (1, "С дедлайном", datetime(2031, 1, 1)), (2, "Без дедлайна", None),
+    ]
+    assert restored.add_project(Project(name="Next")) == 3
+
+
+def test_snapshot_rejects_foreign_and_truncated_files(tmp_path):
+    """
+    Проверяет, что чужой или обрезанный файл вызывает ValueError.
+    """
+    source = InMemoryTaskRepository()
+    source.add_tasks(make_tasks())
+    path = tmp_path / "tasks.snap"
+    save_tasks(source, str(path))
+
+    with pytest.raises(ValueError):
+        load_projects(str(path))
+    path.write_bytes(path.read_bytes()[:-10])
+    with pytest.raises(ValueError):
+        load_tasks(str(path))
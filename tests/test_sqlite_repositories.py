@@ -0,0 +1,131 @@
+import pytest
+import sqlite3
+from datetime import datetime, timedelta
+
+from task_manager.models import Project, Task
+from task_manager import sqlite_repositories
+from task_manager.services import TaskService
+from task_manager.sqlite_repositories import (
+    SQLiteProjectRepository,
+    SQLiteTaskRepository,
+    connect,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "tasks.db")
+
+
+def test_sqlite_uses_wal(db_path):
+    """
+    Проверяет, что файловая база открывается в режиме WAL.
+    """
+    connection = connect(db_path)
+    (mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+    assert mode == "wal"
+    connection.close()
+
+
+def test_sqlite_task_service_roundtrip(db_path):
+    """
+    Проверяет работу TaskService поверх SQLite и сохранение данных после переподключения.
+    """
+    connection = connect(db_path)
+    project_repo = SQLiteProjectRepository(connection)
+    task_repo = SQLiteTaskRepository(connection)
+    service = TaskService(task_repo, project_repo)
+
+    deadline = datetime.now() + timedelta(days=1)
+    pid = project_repo.add_project(Project(name="Stored", deadline=deadline))
+    tid = service.create_task(pid, "Persist", deadline)
+    service.track_time(tid, 1.5)
+    assert service.track_time(tid, 2.0) == 3.5
+    connection.close()
+
+    connection = connect(db_path)
+    task_repo = SQLiteTaskRepository(connection)
+    project_repo = SQLiteProjectRepository(connection)
+    stored = task_repo.get_task(tid)
+    assert (stored.project_id, stored.title, stored.deadline, stored.hours_spent) == (
+        pid, "Persist", deadline, 3.5
+    )
+    assert project_repo.get_project(pid).deadline == deadline
+    assert project_repo.add_project(Project(name="Next")) == pid + 1
+    connection.close()
+
+
+def test_sqlite_queries_and_batch_insert():
+    """
+    Проверяет пакетную вставку и выборки по проекту и дедлайну.
+    """
+    task_repo = SQLiteTaskRepository(connect())
+    now = datetime(2031, 1, 10)
+    ids = task_repo.add_tasks([
+        Task(project_id=1, title="Late", deadline=now + timedelta(days=1)),
+        Task(project_id=2, title="Early", deadline=now - timedelta(days=2)),
+        Task(project_id=1, title="Middle", deadline=now - timedelta(days=1)),
+    ])
+
+    assert [t.id for t in task_repo.list_by_project(1)] == [ids[0], ids[2]]
+    assert [t.id for t in task_repo.list_overdue(now)] == [ids[1], ids[2]]
+
+    task_repo.clear()
+    assert task_repo.list_by_project(1) == []
+
+
+def test_sqlite_not_found():
+    """
+    Проверяет KeyError для отсутствующих задач и проектов.
+    """
+    connection = connect()
+    task_repo = SQLiteTaskRepository(connection)
+    project_repo = SQLiteProjectRepository(connection)
+    ghost = Task(project_id=1, title="Ghost", deadline=datetime.now())
+    ghost.id = 404
+
+    with pytest.raises(KeyError):
+        task_repo.get_task(404)
+    with pytest.raises(KeyError):
+        task_repo.update_task(ghost)
+    with pytest.raises(KeyError):
+        project_repo.get_project(404)
+
+
+def test_sqlite_repositories_share_connection_lock():
+    """
+    Проверяет, что репозитории одного соединения сериализуются одной
+    блокировкой, а соединение не из connect() отклоняется.
+    """
+    connection = connect()
+    task_repo = SQLiteTaskRepository(connection)
+    project_repo = SQLiteProjectRepository(connection)
+
+    assert task_repo._lock is project_repo._lock
+    assert SQLiteTaskRepository(connect())._lock is not task_repo._lock
+    with pytest.raises(TypeError):
+        SQLiteTaskRepository(sqlite3.connect(":memory:"))
+
+
+def test_sqlite_iteration_reads_pages(monkeypatch):
+    """
+    Проверяет перебор страницами: все записи по порядку, а между
+    страницами соединение свободно для записи.
+    """
+    monkeypatch.setattr(sqlite_repositories, "PAGE_SIZE", 3)
+    connection = connect()
+    task_repo = SQLiteTaskRepository(connection)
+    project_repo = SQLiteProjectRepository(connection)
+    deadline = datetime(2031, 1, 1)
+    ids = task_repo.add_tasks(
+        [Task(project_id=1, title=f"T{i}", deadline=deadline) for i in range(7)]
+    )
+    for i in range(3):
+        project_repo.add_project(Project(name=f"P{i}"))
+
+    tasks = task_repo.iter_tasks()
+    first = next(tasks)
+    project_repo.add_project(Project(name="While iterating"))
+
+    assert [first.id] + [task.id for task in tasks] == ids
+    assert [p.name for p in project_repo.iter_projects()] == ["P0", "P1", "P2", "While iterating"]
@@ -108,3 +108,45 @@ def test_track_time_task_not_found():
     """
     with pytest.raises(ValueError):
         task_manager.track_time(123456, 1.0)
+
+
+def test_create_tasks_batch():
+    """
+    Проверяет пакетное создание задач.
+
+    Ожидается: корректные строки создаются, ошибочные попадают в errors
+    и не прерывают пакет.
+    """
+    project = task_manager.models.Project(name="Bulk")
+    pid = task_manager.project_repo.add_project(project)
+    future = datetime.now() + timedelta(days=1)
+    rows = [
+        (pid, "First", future),
+        (pid, "Past", datetime.now() - timedelta(days=1)),
+        (-1, "NoProject", future),
+        (pid, "", future),
+        (pid, "Second", future),
+    ]
+
+    result = task_manager.create_tasks(rows)
+
+    assert sorted(result.errors) == [1, 2, 3]
+    assert all(isinstance(e, ValueError) for e in result.errors.values())
+    assert result.ids[1:4] == [None, None, None]
+    assert len(result.created_ids) == 2
+    assert task_manager.task_repo.get_task(result.ids[0]).title == "First"
+    assert task_manager.task_repo.get_task(result.ids[4]).title == "Second"
+
+
+def test_create_tasks_malformed_row():
+    """
+    Проверяет, что строка неверной формы или типа фиксируется как ошибка.
+    """
+    project = task_manager.models.Project(name="BulkMalformed")
+    pid = task_manager.project_repo.add_project(project)
+
+    result = task_manager.create_tasks([(pid, "Only two"), (pid, "Bad", "tomorrow")])
+
+    assert result.ids == [None, None]
+    assert isinstance(result.errors[0], ValueError)
+    assert isinstance(result.errors[1], TypeError)
@@ -0,0 +1,139 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from task_manager.models import Project, Task
+from task_manager.repositories import InMemoryProjectRepository, InMemoryTaskRepository
+from task_manager.services import TaskService
+from task_manager.wal import WALProjectRepository, WALTaskRepository, WriteAheadLog
+
+
+def open_service(wal):
+    task_repo = WALTaskRepository(InMemoryTaskRepository(), wal)
+    project_repo = WALProjectRepository(InMemoryProjectRepository(), wal)
+    return task_repo, project_repo, TaskService(task_repo, project_repo)
+
+
+def test_wal_replay_restores_changes(tmp_path):
+    """
+    Проверяет, что после перезапуска журнал восстанавливает проекты,
+    задачи и часы из track_time, а новые ID продолжают старые.
+    """
+    path = str(tmp_path / "repo.wal")
+    deadline = datetime.now() + timedelta(days=1)
+    with WriteAheadLog(path) as wal:
+        task_repo, project_repo, service = open_service(wal)
+        pid = project_repo.add_project(Project(name="Durable"))
+        tid = service.create_task(pid, "Logged", deadline)
+        service.track_time(tid, 2.5)
+        service.track_time(tid, 1.0)
+
+    tasks, projects = InMemoryTaskRepository(), InMemoryProjectRepository()
+    with WriteAheadLog(path) as wal:
+        assert wal.replay(tasks, projects) == 4
+    task = tasks.get_task(tid)
+    assert (task.title, task.deadline, task.hours_spent) == ("Logged", deadline, 3.5)
+    assert projects.get_project(pid).name == "Durable"
+    assert tasks.add_task(Task(project_id=pid, title="Next", deadline=deadline)) == tid + 1
+
+
+def test_wal_rejected_change_not_applied(tmp_path):
+    """
+    Проверяет, что изменение, которое не удалось закодировать или записать
+    в журнал, не попадает и во внутренний репозиторий.
+    """
+    path = str(tmp_path / "repo.wal")
+    deadline = datetime.now() + timedelta(days=1)
+    wal = WriteAheadLog(path)
+    task_repo, project_repo, _ = open_service(wal)
+    tid = task_repo.add_task(Task(project_id=1, title="Kept", deadline=deadline))
+
+    aware = Task(project_id=1, title="Aware", deadline=deadline.astimezone())
+    with pytest.raises(ValueError):
+        task_repo.add_task(aware)
+    with pytest.raises(ValueError):
+        task_repo.add_tasks([Task(project_id=1, title="Ok", deadline=deadline), aware])
+    moved = Task(project_id=1, title="Kept", deadline=deadline.astimezone())
+    moved.id = tid
+    with pytest.raises(ValueError):
+        task_repo.update_task(moved)
+    wal.close()
+    with pytest.raises(ValueError):
+        project_repo.add_project(Project(name="Closed"))
+
+    assert [task.title for task in task_repo.iter_tasks()] == ["Kept"]
+    assert task_repo.get_task(tid).deadline == deadline
+    assert list(project_repo.iter_projects()) == []
+    tasks = InMemoryTaskRepository()
+    with WriteAheadLog(path) as wal:
+        wal.replay(tasks)
+    assert [task.title for task in tasks.iter_tasks()] == ["Kept"]
+
+
+def test_wal_drops_torn_tail(tmp_path):
+    """
+    Проверяет, что оборванная последняя запись отбрасывается,
+    а предыдущие записи восстанавливаются.
+    """
+    path = tmp_path / "repo.wal"
+    with WriteAheadLog(str(path)) as wal:
+        projects = WALProjectRepository(InMemoryProjectRepository(), wal)
+        projects.add_project(Project(name="Kept"))
+        projects.add_project(Project(name="Torn"))
+    path.write_bytes(path.read_bytes()[:-3])
+
+    restored = InMemoryProjectRepository()
+    with WriteAheadLog(str(path)) as wal:
+        assert wal.replay(project_repo=restored) == 1
+        WALProjectRepository(restored, wal).add_project(Project(name="After"))
+    again = InMemoryProjectRepository()
+    with WriteAheadLog(str(path)) as wal:
+        wal.replay(project_repo=again)
+    assert [p.name for p in again.iter_projects()] == ["Kept", "After"]
+
+
+def test_wal_compact_and_recover(tmp_path):
+    """
+    Проверяет сжатие: журнал очищается, а снимок вместе с записями
+    после сжатия и очистками даёт прежнее состояние.
+    """
+    path = str(tmp_path / "repo.wal")
+    snapshots = (str(tmp_path / "tasks.snap"), str(tmp_path / "projects.snap"))
+    deadline = datetime(2031, 1, 1)
+    with WriteAheadLog(path) as wal:
+        task_repo, project_repo, _ = open_service(wal)
+        pid = project_repo.add_project(Project(name="P"))
+        task_repo.add_tasks([Task(project_id=pid, title=f"T{i}", deadline=deadline)
+                             for i in range(3)])
+        wal.compact(task_repo.inner, project_repo.inner, *snapshots)
+        assert list(wal.read_records()) == []
+        task_repo.clear()
+        task_repo.add_task(Task(project_id=pid, title="After clear", deadline=deadline))
+
+    tasks, projects = InMemoryTaskRepository(), InMemoryProjectRepository()
+    with WriteAheadLog(path) as wal:
+        wal.recover(tasks, projects, *snapshots)
+    assert [(t.id, t.title) for t in tasks.iter_tasks()] == [(4, "After clear")]
+    assert [p.name for p in projects.iter_projects()] == ["P"]
+
+
+def test_wal_group_commit_shares_fsync(tmp_path):
+    """
+    Проверяет групповую фиксацию: записи параллельных потоков
+    подтверждаются меньшим числом fsync, чем число записей.
+    """
+    path = str(tmp_path / "repo.wal")
+    with WriteAheadLog(path, sync_interval=0.01) as wal:
+        projects = WALProjectRepository(InMemoryProjectRepository(), wal)
+        threads = [
+            threading.Thread(target=lambda: [projects.add_project(Project(name="x"))
+                                             for _ in range(20)])
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert wal.records == 160
+        assert wal.syncs < wal.records